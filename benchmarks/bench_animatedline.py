@@ -0,0 +1,65 @@
+"""
+Benchmark: live 1 kHz data feed, plot() every frame vs animatedline + drawnow
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matlab.plotting import figure, plot, close, animatedline, addpoints, drawnow
+
+RATE = 1000    # Samples per second
+BLOCK = 10     # Samples delivered per loop iteration
+WINDOW = 5000  # Samples kept on screen
+FRAMES = 300
+
+
+def replot():
+    figure()
+    t = np.empty(0)
+    y = np.empty(0)
+    start = time.perf_counter()
+    for k in range(FRAMES):
+        tk = (k * BLOCK + np.arange(BLOCK)) / RATE
+        t = np.concatenate([t, tk])[-WINDOW:]
+        y = np.concatenate([y, np.sin(tk)])[-WINDOW:]
+        plt.cla()
+        plot(t, y, 'b-')
+        plt.gcf().canvas.draw()
+    elapsed = time.perf_counter() - start
+    close('all')
+    return FRAMES / elapsed
+
+
+def animated(option=None):
+    figure()
+    h = animatedline('b-', maxpoints=WINDOW)
+    frames = 0
+    start = time.perf_counter()
+    for k in range(FRAMES):
+        tk = (k * BLOCK + np.arange(BLOCK)) / RATE
+        addpoints(h, tk, np.sin(tk))
+        drawnow(option)
+        frames += 1
+    drawnow()
+    elapsed = time.perf_counter() - start
+    close('all')
+    return frames / elapsed
+
+
+def main():
+    print(f"Benchmark: {RATE} Hz feed, {BLOCK} samples per iteration, {WINDOW}-sample window")
+    print("=" * 60)
+    print(f"plot() + full redraw each iteration:  {replot():8.1f} iterations/s")
+    print(f"animatedline + drawnow():             {animated():8.1f} iterations/s")
+    print(f"animatedline + drawnow('limitrate'):  {animated('limitrate'):8.1f} iterations/s")
+    print(f"(real time needs {RATE / BLOCK:.0f} iterations/s)")
+
+
+if __name__ == '__main__':
+    main()
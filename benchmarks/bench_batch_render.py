@@ -0,0 +1,55 @@
+"""
+Benchmark: report figures per second, serial figure/plot/savefig vs batchrender
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.plotting import figure, plot, title, xlabel, ylabel, grid, savefig, close, batchrender
+
+N = 200
+
+
+def draw(seed):
+    rng = np.random.default_rng(seed)
+    plot(rng.standard_normal((2000, 3)).cumsum(axis=0))
+    title(f'Run {seed}')
+    xlabel('Step')
+    ylabel('Value')
+    grid('on')
+
+
+def serial(pattern):
+    start = time.perf_counter()
+    for i in range(N):
+        figure()
+        draw(i)
+        savefig(pattern.format(i))
+        close()
+    return N / (time.perf_counter() - start)
+
+
+def batch(pattern, workers):
+    start = time.perf_counter()
+    batchrender(draw, range(N), pattern, workers=workers)
+    return N / (time.perf_counter() - start)
+
+
+def main():
+    print(f"Benchmark: {N} PNG figures (backend: {__import__('matplotlib').get_backend()})")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        pattern = os.path.join(tmp, 'fig_{:04d}.png')
+        print(f"serial figure/plot/savefig:   {serial(pattern):7.1f} figures/s")
+        print(f"batchrender(workers=0):       {batch(pattern, 0):7.1f} figures/s")
+        for workers in sorted({2, os.cpu_count() or 1}):
+            label = f"batchrender(workers={workers}):"
+            print(f"{label:<30}{batch(pattern, workers):7.1f} figures/s (including process start-up)")
+
+
+if __name__ == '__main__':
+    main()
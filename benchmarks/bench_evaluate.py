@@ -0,0 +1,72 @@
+"""
+Benchmark: fused blocked evaluate() vs NumPy operator-by-operator evaluation
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.core import linspace, meshgrid
+from matlab.expression import evaluate
+
+
+def measure(func, repeat=3):
+    # Best of a few untraced runs: tracemalloc slows the per-block Python
+    # work of evaluate() far more than NumPy's few large calls
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def report(label, func):
+    elapsed, peak = measure(func)
+    print(f"  {label:<40} {elapsed:7.3f}s  peak {peak:8.1f} MB")
+
+
+def main():
+    print("Benchmark: time and peak traced memory")
+    print("=" * 60)
+    n = 10_000_000
+    f1, f2 = 50, 120
+    t = np.linspace(0, 1, n)
+    signal = 'sin(2*pi*f1*t) + 0.5*sin(2*pi*f2*t)'
+    variables = {'t': t, 'f1': f1, 'f2': f2}
+    
+    print(f"{signal} (n = {n}):")
+    report("NumPy", lambda: np.sin(2 * np.pi * f1 * t) + 0.5 * np.sin(2 * np.pi * f2 * t))
+    report("evaluate", lambda: evaluate(signal, variables))
+    report(f"evaluate(threads={os.cpu_count()})", lambda: evaluate(signal, variables, threads=None))
+    lazy = dict(variables, t=linspace(0, 1, n, lazy=True))
+    report("evaluate, t = linspace(..., lazy=True)", lambda: evaluate(signal, lazy))
+    out = np.empty(n)
+    report("evaluate(out=...)", lambda: evaluate(signal, variables, out=out))
+    print()
+    
+    m = 3000
+    X, Y = meshgrid(np.linspace(-2, 2, m), np.linspace(-2, 2, m), lazy=True)
+    surface = 'exp(-(X**2 + Y**2)) * cos(3*X) * sin(3*Y)'
+    print(f"{surface} on a lazy {m}x{m} meshgrid:")
+    report("NumPy", lambda: np.exp(-(X**2 + Y**2)) * np.cos(3 * X) * np.sin(3 * Y))
+    report("evaluate", lambda: evaluate(surface, {'X': X, 'Y': Y}))
+    print()
+    
+    A = np.random.rand(m, m)
+    B = np.random.rand(m, m)
+    mask = '(A > 0.25) & (A*B + 1 < 1.5)'
+    print(f"{mask} ({m}x{m}):")
+    report("NumPy", lambda: (A > 0.25) & (A * B + 1 < 1.5))
+    report("evaluate", lambda: evaluate(mask, {'A': A, 'B': B}))
+
+
+if __name__ == '__main__':
+    main()
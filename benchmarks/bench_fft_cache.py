@@ -0,0 +1,30 @@
+"""
+Benchmark: per-call cost of cached window functions
+"""
+
+import sys
+import os
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scipy.signal
+from matlab.signal import hann, hamming, fftcache
+
+
+def per_call(func, number=20000):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    print("Benchmark: microseconds per call")
+    print("=" * 60)
+    for n in (64, 1024, 16384):
+        print(f"n={n:>5}  window: get_window('hann') "
+              f"{per_call(lambda: scipy.signal.get_window('hann', n, fftbins=False)):6.2f}"
+              f"  hann {per_call(lambda: hann(n)):6.2f}"
+              f"  hamming {per_call(lambda: hamming(n)):6.2f}")
+    print(fftcache())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: imagesc/surf/mesh/contour on large meshgrid data vs full-resolution matplotlib
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matlab.plotting import figure, close, imagesc, surf, mesh, contour
+
+
+def grid(n):
+    x = np.linspace(-3, 3, n)
+    X, Y = np.meshgrid(x, x)
+    return X, Y, np.exp(-(X ** 2 + Y ** 2) / 4) * np.sin(3 * X) * np.cos(2 * Y)
+
+
+def timed(draw):
+    figure()
+    start = time.perf_counter()
+    draw()
+    plt.gcf().canvas.draw()
+    elapsed = time.perf_counter() - start
+    close('all')
+    return elapsed
+
+
+def full_surface(X, Y, Z, wireframe=False):
+    ax = plt.gcf().add_subplot(projection='3d')
+    if wireframe:
+        ax.plot_wireframe(X, Y, Z, rstride=1, cstride=1)
+    else:
+        ax.plot_surface(X, Y, Z, rstride=1, cstride=1, cmap='viridis')
+
+
+def main():
+    print("Benchmark: plot + first draw (Agg, 640x480 figure)")
+    print("=" * 60)
+    X, Y, Z = grid(4000)
+    print("4000x4000 grid:")
+    print(f"  imagesc               {timed(lambda: imagesc(Z)):8.2f} s")
+    print(f"  plt.imshow            {timed(lambda: plt.imshow(Z, aspect='auto')):8.2f} s")
+    print(f"  contour               {timed(lambda: contour(X, Y, Z, 10)):8.2f} s")
+    print(f"  plt.contour           {timed(lambda: plt.contour(X, Y, Z, 10)):8.2f} s")
+    print(f"  surf                  {timed(lambda: surf(X, Y, Z)):8.2f} s")
+    print(f"  mesh                  {timed(lambda: mesh(X, Y, Z)):8.2f} s")
+    
+    # Full-resolution 3-D plots of 4000x4000 do not finish in reasonable time
+    X, Y, Z = grid(500)
+    print("500x500 grid, full resolution (rstride=cstride=1):")
+    print(f"  surf                  {timed(lambda: surf(X, Y, Z)):8.2f} s")
+    print(f"  plot_surface          {timed(lambda: full_surface(X, Y, Z)):8.2f} s")
+    print(f"  mesh                  {timed(lambda: mesh(X, Y, Z)):8.2f} s")
+    print(f"  plot_wireframe        {timed(lambda: full_surface(X, Y, Z, True)):8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: MATLAB indexing translated to slices/views vs index-array translation
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.indexing import translate
+
+
+# (MATLAB-style command, the same with every subscript as an index array)
+SCRIPTS = [
+    ("B = A(2:end, :)",
+     "B = A[np.ix_(np.arange(1, A.shape[0]), np.arange(A.shape[1]))]"),
+    ("for k in range(1, 201): s = s + sum(A(:, k))",
+     "for k in range(1, 201): s = s + sum(A[np.ix_(np.arange(A.shape[0]), np.array([k - 1]))])"),
+    ("A(1:2:end, :) = 0",
+     "A[np.ix_(np.arange(0, A.shape[0], 2), np.arange(A.shape[1]))] = 0"),
+    ("for j in range(1, 100000): x(j + 1) = x(j) + 0.001 * v(j)",
+     "for j in range(1, 100000): x[np.array([j])] = x[np.array([j - 1])] + 0.001 * v[np.array([j - 1])]"),
+    ("y = v(v > 0.5)",
+     "y = v[np.flatnonzero(v > 0.5)]"),
+]
+
+
+def run(source, namespace, repeat=3):
+    code = compile(source, '<bench>', 'exec')
+    best = float('inf')
+    for _ in range(repeat):
+        namespace.update(A=np.random.rand(4000, 2000), x=np.zeros(100000),
+                         v=np.random.rand(100000), s=0.0)
+        start = time.perf_counter()
+        exec(code, namespace)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print("Benchmark: translated MATLAB commands (A is 4000 x 2000)")
+    print("=" * 60)
+    namespace = {'np': np, 'sum': np.sum}
+    namespace.update(A=np.random.rand(4000, 2000), x=np.zeros(100000),
+                     v=np.random.rand(100000), s=0.0)
+    for command, naive in SCRIPTS:
+        source = translate(command, namespace)
+        start = time.perf_counter()
+        for _ in range(100):
+            translate(command, namespace)
+        translation = (time.perf_counter() - start) / 100
+        print(command)
+        print(f"  -> {source}")
+        print(f"  translate {translation * 1e6:7.1f}us   run {run(source, namespace):7.4f}s"
+              f"   index arrays {run(naive, namespace):7.4f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: interval search on uniform grids and reuse of precomputed interpolants
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import scipy.interpolate
+from matlab.interpolation import interp1, griddedInterpolant, _GridAxis
+
+
+def timed(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print("Benchmark: interp1 / griddedInterpolant")
+    print("=" * 60)
+    
+    x = np.linspace(0, 1, 1_000_001)
+    v = np.sin(20 * x)
+    xq = np.random.rand(2_000_000)
+    axis = _GridAxis(x)
+    t_search = timed(lambda: np.searchsorted(x, xq, side='right'))
+    t_uniform = timed(lambda: axis.locate(xq))
+    print("Interval search, 1e6-point grid, 2e6 queries:")
+    print(f"  searchsorted {t_search:.3f}s   uniform O(1) {t_uniform:.3f}s")
+    print(f"  interp1 linear {timed(lambda: interp1(x, v, xq)):.3f}s"
+          f"   np.interp {timed(lambda: np.interp(xq, x, v)):.3f}s")
+    print()
+    
+    # Many small query sets onto the same data: set-up once vs per call
+    x = np.linspace(0, 10, 100_000)
+    v = np.sin(x)
+    queries = [np.random.uniform(0, 10, 100) for _ in range(200)]
+    F = griddedInterpolant(x, v, 'spline')
+    t_reuse = timed(lambda: [F(q) for q in queries], repeat=3)
+    t_scipy = timed(lambda: [scipy.interpolate.CubicSpline(x, v)(q) for q in queries], repeat=3)
+    t_interp1 = timed(lambda: [interp1(x, v, q, 'spline') for q in queries], repeat=3)
+    print("Spline, 1e5 samples, 200 query sets of 100 points:")
+    print(f"  griddedInterpolant once {t_reuse:.3f}s   CubicSpline per call {t_scipy:.3f}s"
+          f"   interp1 per call {t_interp1:.3f}s")
+    print()
+    
+    xg = np.linspace(0, 1, 1000)
+    yg = np.linspace(0, 1, 1000)
+    V = np.sin(10 * xg)[:, None] * np.cos(10 * yg)[None, :]
+    qx = np.linspace(0, 1, 2000)
+    qy = np.linspace(0, 1, 2000)
+    F = griddedInterpolant((xg, yg), V)
+    reference = scipy.interpolate.RegularGridInterpolator((xg, yg), V)
+    QX, QY = np.meshgrid(qx, qy, indexing='ij')
+    print("2-D linear, 1000x1000 grid onto 2000x2000 query grid:")
+    print(f"  griddedInterpolant grid vectors {timed(lambda: F((qx, qy)), repeat=3):.3f}s"
+          f"   RegularGridInterpolator {timed(lambda: reference((QX, QY)), repeat=3):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
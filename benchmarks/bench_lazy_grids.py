@@ -0,0 +1,40 @@
+"""
+Benchmark: full vs lazy (broadcast view) meshgrid for grid-evaluated expressions
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.core import meshgrid, gridfun, sin, cos
+
+
+def measure(lazy, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    v = np.linspace(-2, 2, n)
+    X, Y = meshgrid(v, lazy=lazy)
+    grid_bytes = tracemalloc.get_traced_memory()[0]
+    Z = gridfun(sin, X) + gridfun(cos, Y) if lazy else sin(X) + cos(Y)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, grid_bytes, peak, Z.nbytes
+
+
+def main():
+    print("Benchmark: Z = sin(X) + cos(Y) on an n x n meshgrid")
+    print("=" * 60)
+    for n in (2000, 5000, 10000):
+        for lazy in (False, True):
+            elapsed, grid_bytes, peak, result = measure(lazy, n)
+            print(f"n={n:>6} {'lazy' if lazy else 'full':>4}: {elapsed:6.3f}s"
+                  f"  grids {grid_bytes / 2**20:8.1f} MB"
+                  f"  peak {peak / 2**20:8.1f} MB  (result {result / 2**20:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
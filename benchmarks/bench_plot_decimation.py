@@ -0,0 +1,42 @@
+"""
+Benchmark: plot() decimation vs plotting every point
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matlab.plotting import plot
+
+
+def render(plot_func, t, y, filename):
+    start = time.perf_counter()
+    plt.figure()
+    plot_func(t, y, 'b-')
+    plt.savefig(filename)
+    plt.close('all')
+    return time.perf_counter() - start
+
+
+def main():
+    print("Benchmark: plot() of long series (plot + savefig to PNG)")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        png = os.path.join(tmp, 'plot.png')
+        for n in (10 ** 5, 10 ** 6, 10 ** 7):
+            t = np.linspace(0, 1000, n)
+            y = np.sin(t) + 0.1 * np.random.randn(n)
+            full = render(plt.plot, t, y, png)
+            decimated = render(plot, t, y, png)
+            print(f"{n:>10} points: full {full * 1000:9.1f} ms, "
+                  f"decimated {decimated * 1000:9.1f} ms ({full / decimated:5.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
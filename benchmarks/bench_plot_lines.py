@@ -0,0 +1,42 @@
+"""
+Benchmark: plot(x, Y) with many columns, Line2D per column vs LineCollection
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matlab.plotting import plot
+
+
+def render(plot_func, t, Y, filename):
+    start = time.perf_counter()
+    plt.figure()
+    plot_func(t, Y, '-')
+    plt.savefig(filename)
+    plt.close('all')
+    return time.perf_counter() - start
+
+
+def main():
+    print("Benchmark: Monte Carlo fan chart (plot + savefig to PNG)")
+    print("=" * 60)
+    t = np.linspace(0, 1, 250)
+    with tempfile.TemporaryDirectory() as tmp:
+        png = os.path.join(tmp, 'fan.png')
+        for ncols in (10, 1000, 10000):
+            Y = np.random.randn(len(t), ncols).cumsum(axis=0)
+            lines = render(plt.plot, t, Y, png)
+            collection = render(plot, t, Y, png)
+            print(f"{ncols:>6} lines: Line2D {lines * 1000:9.1f} ms, "
+                  f"plot() {collection * 1000:9.1f} ms ({lines / collection:5.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: lazy colon/linspace ranges vs materialized arrays
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.core import colon, linspace
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def report(label, func):
+    elapsed, peak = measure(func)
+    print(f"  {label:<40} {elapsed:7.3f}s  peak {peak:8.1f} MB")
+
+
+def loop(values):
+    total = 0
+    for k in values:
+        total += k
+    return total
+
+
+def main():
+    print("Benchmark: time and peak traced memory")
+    print("=" * 60)
+    n = 10_000_000
+    
+    print(f"for loop over 1:{n // 10}:")
+    report("np.arange", lambda: loop(np.arange(1, n // 10 + 1)))
+    report("colon", lambda: loop(colon(1, n // 10)))
+    report("linspace(..., lazy=True)", lambda: loop(linspace(0, 1, n // 10, lazy=True)))
+    print()
+    
+    print(f"Create, slice every 1000th element, sum (n = {n}):")
+    report("np.linspace", lambda: np.linspace(0, 1, n)[::1000].sum())
+    report("linspace(..., lazy=True)", lambda: linspace(0, 1, n, lazy=True)[::1000].sum())
+    print()
+    
+    print("Scale and offset, then one indexed element:")
+    report("np.linspace", lambda: (2 * np.linspace(0, 1, n) + 1)[n // 2])
+    report("linspace(..., lazy=True)", lambda: (2 * linspace(0, 1, n, lazy=True) + 1)[n // 2])
+    print()
+    
+    print("Materialize for vectorized math (same cost either way):")
+    report("np.sin(np.linspace)", lambda: np.sin(np.linspace(0, 1, n)))
+    report("np.sin(linspace(..., lazy=True))", lambda: np.sin(linspace(0, 1, n, lazy=True)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: memory of repmat/bsxfun/kron vs np.tile and np.kron
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.matrix import repmat, kron, bsxfun
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / 2**20
+
+
+def report(label, func):
+    elapsed, peak = measure(func)
+    print(f"  {label:<44} {elapsed:7.3f}s  peak {peak:8.1f} MB")
+
+
+def main():
+    print("Benchmark: time and peak traced memory")
+    print("=" * 60)
+    
+    row = np.random.rand(5000)
+    print("Repeat a 5000-element row 20000 times:")
+    report("np.tile(row, (20000, 1))", lambda: np.tile(row, (20000, 1)))
+    report("repmat(row, 20000, 1)", lambda: repmat(row, 20000, 1))
+    print()
+    
+    A = np.random.rand(20000, 500)
+    mu = A.mean(axis=0)
+    print("Center the columns of a 20000 x 500 matrix:")
+    report("A - np.tile(mu, (20000, 1))", lambda: A - np.tile(mu, (20000, 1)))
+    report("bsxfun('minus', A, mu)", lambda: bsxfun('minus', A, mu))
+    print()
+    
+    B = np.random.rand(100, 100)
+    C = np.random.rand(60, 60)
+    print("kron of 100 x 100 and 60 x 60:")
+    report("np.kron(B, C)", lambda: np.kron(B, C))
+    report("kron(B, C)", lambda: kron(B, C))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: save/load vs pickle and np.savez
+"""
+
+import sys
+import os
+import time
+import pickle
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.workspace import save, load
+
+
+def timeit(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    workspace = {
+        'A': np.random.rand(4000, 4000),          # 128 MB
+        'B': np.random.rand(2000, 2000).astype(np.float32),
+        'labels': [f"run{i}" for i in range(1000)],
+    }
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        ws_file = os.path.join(tmp, 'session.ws')
+        pkl_file = os.path.join(tmp, 'session.pkl')
+        npz_file = os.path.join(tmp, 'session.npz')
+        arrays = {k: v for k, v in workspace.items() if isinstance(v, np.ndarray)}
+        
+        def pickle_save():
+            with open(pkl_file, 'wb') as f:
+                pickle.dump(workspace, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        def pickle_load():
+            with open(pkl_file, 'rb') as f:
+                return pickle.load(f)
+        
+        def ws_load_touch():
+            ns = {}
+            load(ws_file, variables=ns)
+            return float(ns['A'].sum())
+        
+        results = [
+            ('save()', timeit(lambda: save(ws_file, variables=workspace))),
+            ('pickle.dump', timeit(pickle_save)),
+            ('np.savez', timeit(lambda: np.savez(npz_file, **arrays))),
+            ('load() (lazy)', timeit(lambda: load(ws_file, variables={}))),
+            ('load() + full read of A', timeit(ws_load_touch)),
+            ('pickle.load', timeit(pickle_load)),
+            ('np.load(npz) all arrays', timeit(lambda: dict(np.load(npz_file)))),
+            ('save() -append unchanged', timeit(lambda: save(ws_file, '-append', variables=workspace))),
+        ]
+    
+    print("Benchmark: workspace save/load")
+    print("=" * 60)
+    for name, seconds in results:
+        print(f"{name:<30} {seconds * 1000:10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: simulation loop saving a snapshot each step, savefig vs savefig(background=True)
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from matlab.plotting import figure, plot, title, savefig, waitforsaves, close
+
+STEPS = 60
+
+
+def simulate(state):
+    """Stand-in for one solver step: a few FFT-based diffusion iterations"""
+    k = np.fft.rfftfreq(len(state))
+    for _ in range(20):
+        state = np.fft.irfft(np.fft.rfft(state) * np.exp(-k), len(state))
+        state += 0.01 * np.random.randn(len(state))
+    return state
+
+
+def run(tmp, background):
+    state = np.random.randn(2 ** 16)
+    figure(figsize=(10, 6))
+    start = time.perf_counter()
+    for step in range(STEPS):
+        state = simulate(state)
+        plot(state[::16], 'b-')
+        title(f'Step {step}')
+        savefig(os.path.join(tmp, f'step_{step:03d}.png'), dpi=150, background=background)
+        close()
+        figure(figsize=(10, 6))
+    loop = time.perf_counter() - start
+    waitforsaves()
+    total = time.perf_counter() - start
+    close('all')
+    return loop, total
+
+
+def main():
+    print(f"Benchmark: {STEPS} simulation steps, one 1500x900 PNG per step")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        loop, total = run(tmp, False)
+        print(f"savefig:                   {total:6.2f} s")
+        loop, total = run(tmp, True)
+        print(f"savefig(background=True):  {total:6.2f} s (loop {loop:.2f} s + waitforsaves)")
+
+
+if __name__ == '__main__':
+    main()
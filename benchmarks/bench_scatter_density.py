@@ -0,0 +1,45 @@
+"""
+Benchmark: scatter of millions of points, markers vs density image (time and PDF size)
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matlab.plotting import figure, close, scatter
+
+
+def render(draw, filename):
+    figure()
+    start = time.perf_counter()
+    draw()
+    plt.savefig(filename)
+    elapsed = time.perf_counter() - start
+    close('all')
+    return elapsed, os.path.getsize(filename)
+
+
+def main():
+    print("Benchmark: scatter + savefig to PDF")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, 'scatter.pdf')
+        for n in (10 ** 5, 10 ** 6, 10 ** 7):
+            x = np.random.randn(n)
+            y = 0.5 * x + np.random.randn(n)
+            elapsed, size = render(lambda: scatter(x, y), pdf)
+            print(f"{n:>9} points  scatter:     {elapsed:7.2f} s, {size / 1e6:7.2f} MB")
+            if n <= 10 ** 6:
+                elapsed, size = render(lambda: plt.scatter(x, y), pdf)
+                print(f"{'':>9}         plt.scatter: {elapsed:7.2f} s, {size / 1e6:7.2f} MB")
+        print("(plt.scatter of 10^7 points is skipped; it takes minutes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: conv and filter on million-sample signals
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.signal import conv, conv2, filter
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    n = 10 ** 6
+    x = np.random.randn(n)
+    print(f"Benchmark: conv of {n} samples, direct (np.convolve) vs conv")
+    print("=" * 60)
+    for taps in (16, 256, 1024, 4096):
+        v = np.random.randn(taps)
+        direct = timed(np.convolve, x, v)
+        auto = timed(conv, x, v)
+        print(f"{taps:>5} taps  np.convolve: {direct:7.3f} s   conv: {auto:7.3f} s")
+    
+    print()
+    print("conv2 of a 2000 x 2000 image")
+    print("=" * 60)
+    import scipy.signal
+    A = np.random.randn(2000, 2000)
+    for size in (3, 9, 15):
+        B = np.random.randn(size, size)
+        direct = timed(scipy.signal.convolve2d, A, B)
+        auto = timed(conv2, A, B)
+        print(f"{size:>2} x {size:<2} kernel  convolve2d: {direct:7.3f} s   conv2: {auto:7.3f} s")
+    g = np.random.randn(3)
+    print(f" 3 x 3  separable  conv2(A, outer(g, g)): {timed(conv2, A, np.outer(g, g)):7.3f} s"
+          f"   conv2(g, g, A): {timed(conv2, g, g, A):7.3f} s")
+    
+    print()
+    print(f"filter of {n} samples x 8 channels (columns)")
+    print("=" * 60)
+    X = np.random.randn(n, 8)
+    b, a = [0.0675, 0.1349, 0.0675], [1.0, -1.1430, 0.4128]
+    loop = timed(lambda: [filter(b, a, X[:, k]) for k in range(8)])
+    batched = timed(filter, b, a, X)
+    print(f"IIR, one call per column: {loop:7.3f} s   one call: {batched:7.3f} s")
+    b = np.random.randn(512)
+    print(f"FIR 512 taps  filter: {timed(filter, b, 1, x):7.3f} s"
+          f"   conv(x, b)[:n]: {timed(lambda: conv(x, b)[:n]):7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
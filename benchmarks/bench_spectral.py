@@ -0,0 +1,65 @@
+"""
+Benchmark: spectrogram and pwelch vs a loop over frames (time and peak memory)
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.signal import hamming, spectrogram, pwelch
+
+
+def loop_spectrogram(x, nwin, noverlap, nfft):
+    w = hamming(nwin)
+    step = nwin - noverlap
+    columns = []
+    for start in range(0, len(x) - nwin + 1, step):
+        columns.append(np.fft.rfft(x[start:start + nwin] * w, nfft))
+    return np.array(columns).T
+
+
+def loop_pwelch(x, nwin, noverlap, nfft):
+    w = hamming(nwin)
+    step = nwin - noverlap
+    total, count = 0, 0
+    for start in range(0, len(x) - nwin + 1, step):
+        total = total + np.abs(np.fft.rfft(x[start:start + nwin] * w, nfft)) ** 2
+        count += 1
+    return total / (count * np.sum(w ** 2))
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    n = 10 ** 7
+    x = np.random.randn(n)
+    print(f"Benchmark: {n} samples")
+    print("=" * 60)
+    for nwin, noverlap in ((256, 128), (1024, 768)):
+        nfft = nwin
+        label = f"window {nwin}, overlap {noverlap}"
+        t_loop, m_loop = measure(loop_spectrogram, x, nwin, noverlap, nfft)
+        t_new, m_new = measure(spectrogram, x, nwin, noverlap, nfft)
+        print(f"spectrogram {label}: loop {t_loop:6.2f} s / {m_loop / 1e6:7.1f} MB"
+              f"   spectrogram {t_new:6.2f} s / {m_new / 1e6:7.1f} MB")
+        t_loop, m_loop = measure(loop_pwelch, x, nwin, noverlap, nfft)
+        t_new, m_new = measure(pwelch, x, nwin, noverlap, nfft)
+        print(f"pwelch      {label}: loop {t_loop:6.2f} s / {m_loop / 1e6:7.1f} MB"
+              f"   pwelch      {t_new:6.2f} s / {m_new / 1e6:7.1f} MB")
+    t32, m32 = measure(spectrogram, x.astype(np.float32), 256, 128, 256)
+    print(f"spectrogram of float32 input, window 256: {t32:6.2f} s / {m32 / 1e6:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: spy of large sparse matrices, binned image vs plt.spy markers (time and peak memory)
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import scipy.sparse
+from matlab.plotting import figure, close, spy
+
+
+def random_sparse(n, nnz):
+    rng = np.random.default_rng(0)
+    rows, cols = rng.integers(0, n, nnz), rng.integers(0, n, nnz)
+    return scipy.sparse.coo_matrix((np.ones(nnz), (rows, cols)), shape=(n, n)).tocsr()
+
+
+def render(draw):
+    figure()
+    tracemalloc.start()
+    start = time.perf_counter()
+    draw()
+    plt.gcf().canvas.draw()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    close('all')
+    return elapsed, peak
+
+
+def main():
+    print("Benchmark: spy + draw of an n x n sparse matrix")
+    print("=" * 60)
+    for n, nnz in ((10 ** 6, 10 ** 6), (10 ** 7, 10 ** 7), (10 ** 7, 5 * 10 ** 7)):
+        A = random_sparse(n, nnz)
+        elapsed, peak = render(lambda: spy(A))
+        print(f"n={n:.0e} nnz={nnz:.0e}  spy:     {elapsed:7.2f} s, peak {peak / 1e6:8.1f} MB")
+        if nnz <= 10 ** 6:
+            elapsed, peak = render(lambda: plt.spy(A, markersize=1))
+            print(f"{'':>22}  plt.spy: {elapsed:7.2f} s, peak {peak / 1e6:8.1f} MB")
+    print("(plt.spy of 10^7 nonzeros is skipped; it draws one marker per nonzero)")
+    print("(a dense 10^7 x 10^7 matrix would need 800 TB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: filtering a multi-channel stream in chunks vs one call on the whole signal
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from matlab.signal import StreamingFilter, filter
+
+
+def stream(f, chunks):
+    start = time.perf_counter()
+    for chunk in chunks:
+        f.step(chunk)
+    return time.perf_counter() - start
+
+
+def main():
+    n, channels, chunk = 10 ** 6, 8, 4096
+    X = np.random.randn(n, channels)
+    chunks = [X[i:i + chunk] for i in range(0, n, chunk)]
+    print(f"Benchmark: {n} samples x {channels} channels in chunks of {chunk}")
+    print("=" * 60)
+    
+    b, a = [0.0675, 0.1349, 0.0675], [1.0, -1.1430, 0.4128]
+    start = time.perf_counter()
+    filter(b, a, X)
+    print(f"IIR (2nd order)  one call: {time.perf_counter() - start:7.3f} s"
+          f"   streamed: {stream(StreamingFilter(b, a), chunks):7.3f} s")
+    
+    for taps in (64, 512, 2048):
+        h = np.random.randn(taps) / taps
+        start = time.perf_counter()
+        filter(h, 1, X)
+        one_shot = time.perf_counter() - start
+        direct = stream(StreamingFilter(h), chunks)
+        fft = stream(StreamingFilter(h, method='fft'), chunks)
+        print(f"FIR {taps:>4} taps    one call: {one_shot:7.3f} s   streamed: {direct:7.3f} s"
+              f"   streamed (fft): {fft:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,7 +19,7 @@ signal = sin(2 * 3.14159 * f1 * t) + \
          0.3 * sin(2 * 3.14159 * f3 * t)
 
 # Add noise
-noise = 0.2 * randn(len(signal))
+noise = 0.2 * randn(1, len(signal))[0]
 noisy_signal = signal + noise
 
 # Visualization
@@ -41,11 +41,11 @@ ylabel('Amplitude')
 title('Noisy Signal')
 grid('on')
 
-# FFT (Frequency analysis)
+# FFT (Frequency analysis), zero-padded to a power of 2
 subplot(3, 1, 3)
-N = len(signal)
+N = 2 ** nextpow2(len(noisy_signal))
 freq = linspace(0, fs/2, N//2)
-fft_signal = abs(np.fft.fft(noisy_signal))
+fft_signal = abs(fft(noisy_signal, N))
 plot(freq, fft_signal[:N//2], 'g-', linewidth=1.5)
 xlabel('Frequency (Hz)')
 ylabel('Magnitude')
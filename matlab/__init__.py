@@ -7,12 +7,23 @@ from .core import *
 from .plotting import *
 from .matrix import *
 from .workspace import *
+from .signal import *
+from .interpolation import *
+from .expression import evaluate
 
 __version__ = "0.1.0"
-__all__ = ['zeros', 'ones', 'linspace', 'meshgrid', 'rand', 'randn', 'eye', 'diag',
+__all__ = ['zeros', 'ones', 'linspace', 'colon', 'meshgrid', 'ndgrid', 'gridfun', 'rand', 'randn', 'eye', 'diag',
            'sin', 'cos', 'tan', 'exp', 'log', 'log10', 'sqrt', 'abs', 'floor', 'ceil', 'round',
            'figure', 'plot', 'subplot', 'xlabel', 'ylabel', 'title', 'legend', 'grid', 'show',
-           'xlim', 'ylim', 'clf', 'close', 'savefig',
+           'xlim', 'ylim', 'clf', 'close', 'savefig', 'waitforsaves',
+           'maxfigures', 'figmemory', 'hold', 'ishold', 'imagesc', 'surf', 'mesh', 'contour',
+           'scatter', 'spy',
+           'animatedline', 'addpoints', 'getpoints', 'clearpoints', 'drawnow',
+           'batchrender',
            'size', 'length', 'reshape', 'transpose', 'inv', 'det', 'eig', 'svd', 'norm',
-           'dot', 'cross', 'sum', 'mean', 'std', 'max', 'min',
-           'who', 'whos', 'clear', 'clc']
+           'dot', 'cross', 'repmat', 'kron', 'bsxfun', 'sum', 'mean', 'std', 'max', 'min',
+           'fft', 'ifft', 'fftshift', 'ifftshift', 'nextpow2', 'fftcache', 'conv', 'conv2', 'filter',
+           'StreamingFilter', 'hann', 'hamming', 'buffer', 'spectrogram', 'stft', 'pwelch',
+           'interp1', 'griddedInterpolant', 'evaluate',
+           'who', 'whos', 'clear', 'clc', 'save', 'load', 'matfile', 'membudget', 'Workspace',
+           'snapshot', 'restore', 'undo']
@@ -2,8 +2,11 @@
 MATLAB-style core functions
 """
 
+import itertools
+import operator
+
 import numpy as np
-from typing import Union, Tuple, Optional
+from typing import Any, Callable, Union, Tuple, Optional
 
 
 def zeros(m: int, n: Optional[int] = None) -> np.ndarray:
@@ -58,7 +61,212 @@ def ones(m: int, n: Optional[int] = None) -> np.ndarray:
     return np.ones((m, n))
 
 
-def linspace(start: float, stop: float, num: int = 50) -> np.ndarray:
+class Range(np.lib.mixins.NDArrayOperatorsMixin):
+    """
+    Arithmetic progression stored as (start, step, count)
+    
+    Behaves as a 1-D array in expressions but takes O(1) memory: len(),
+    indexing and slicing compute elements, adding or multiplying by a
+    scalar gives another Range, and for loops produce the values one at a
+    time. Other operations and np.asarray(r, dtype) materialize it.
+    Create with colon() or linspace(..., lazy=True).
+    """
+    
+    def __init__(self, start: float, step: float, count: int, last: Optional[float] = None):
+        self.start = start
+        self.step = step
+        self.count = int(count) if count > 0 else 0
+        # Exact final value (linspace and colon end exactly on stop)
+        self.last = None if not self.count else (
+            start + (self.count - 1) * step if last is None else last)
+    
+    @property
+    def dtype(self) -> np.dtype:
+        return np.result_type(self.start, self.step, self.last if self.count else 0)
+    
+    @property
+    def shape(self) -> Tuple[int]:
+        return (self.count,)
+    
+    @property
+    def size(self) -> int:
+        return self.count
+    
+    ndim = 1
+    
+    @property
+    def T(self) -> 'Range':
+        return self
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _value(self, k: int) -> float:
+        return self.last if k == self.count - 1 else self.start + k * self.step
+    
+    def __iter__(self):
+        if not self.count:
+            return iter(())
+        if self.dtype.kind in 'iu':
+            start, step = int(self.start), int(self.step)
+            return iter(range(start, start + self.count * step, step))
+        # start + k * step, element by element at C speed
+        body = map(operator.add, itertools.repeat(self.start),
+                   map(operator.mul, range(self.count - 1), itertools.repeat(self.step)))
+        return itertools.chain(body, (self.last,))
+    
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            indices = range(*key.indices(self.count))
+            if not len(indices):
+                return Range(self.start, self.step, 0)
+            return Range(self._value(indices[0]), self.step * indices.step, len(indices),
+                         self._value(indices[-1]))
+        if isinstance(key, (int, np.integer)):
+            k = int(key) + self.count if key < 0 else int(key)
+            if not 0 <= k < self.count:
+                raise IndexError(f"index {key} is out of bounds for size {self.count}")
+            return self._value(k)
+        return np.asarray(self)[key]
+    
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        values = np.arange(self.count, dtype=self.dtype)
+        values *= self.step
+        values += self.start
+        if self.count:
+            values[-1] = self.last
+        return values if dtype is None else values.astype(dtype, copy=False)
+    
+    def __array_ufunc__(self, ufunc: np.ufunc, method: str, *inputs, **kwargs) -> Any:
+        if method == '__call__' and not kwargs:
+            result = self._scalar_arithmetic(ufunc, inputs)
+            if result is not None:
+                return result
+        inputs = [np.asarray(x) if isinstance(x, Range) else x for x in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+    
+    def _scalar_arithmetic(self, ufunc: np.ufunc, inputs: tuple) -> Optional['Range']:
+        """r + c, c - r, r * c, r / c, -r, and r1 + r2 of equal length stay lazy"""
+        if ufunc is np.negative:
+            return Range(-self.start, -self.step, self.count, -self.last if self.count else None)
+        if len(inputs) != 2:
+            return None
+        a, b = inputs
+        if ufunc in (np.add, np.subtract) and isinstance(a, Range) and isinstance(b, Range):
+            if len(a) != len(b) or not a.count:
+                return None
+            sign = 1 if ufunc is np.add else -1
+            return Range(a.start + sign * b.start, a.step + sign * b.step, a.count,
+                         a.last + sign * b.last)
+        scalar = b if isinstance(a, Range) else a
+        if not (np.isscalar(scalar) and np.isreal(scalar)) or isinstance(scalar, (str, bool)):
+            return None
+        r = a if isinstance(a, Range) else b
+        last = r.last if r.count else 0
+        if ufunc is np.add:
+            return Range(r.start + scalar, r.step, r.count, last + scalar)
+        if ufunc is np.subtract:
+            if r is a:
+                return Range(r.start - scalar, r.step, r.count, last - scalar)
+            return Range(scalar - r.start, -r.step, r.count, scalar - last)
+        if ufunc is np.multiply:
+            return Range(r.start * scalar, r.step * scalar, r.count, last * scalar)
+        if ufunc is np.true_divide and r is a:
+            return Range(r.start / scalar, r.step / scalar, r.count, last / scalar)
+        return None
+    
+    def _reduce(self, name: str, axis: Any, kwargs: dict) -> Any:
+        kwargs = {key: value for key, value in kwargs.items() if value is not None}
+        if kwargs or axis not in (None, 0, -1) or not self.count:
+            return getattr(np, name)(np.asarray(self), axis=axis, **kwargs)
+        if name == 'sum':
+            return self.count * (self.start + self.last) / 2 if self.dtype.kind == 'f' \
+                else self.count * (self.start + self.last) // 2
+        if name == 'mean':
+            return (self.start + self.last) / 2
+        low, high = sorted((self.start, self.last))
+        return low if name == 'min' else high
+    
+    # O(1) reductions; np.sum(r), np.mean(r), ... call these
+    def sum(self, axis: Any = None, **kwargs) -> Any:
+        return self._reduce('sum', axis, kwargs)
+    
+    def mean(self, axis: Any = None, **kwargs) -> Any:
+        return self._reduce('mean', axis, kwargs)
+    
+    def min(self, axis: Any = None, **kwargs) -> Any:
+        return self._reduce('min', axis, kwargs)
+    
+    def max(self, axis: Any = None, **kwargs) -> Any:
+        return self._reduce('max', axis, kwargs)
+    
+    def astype(self, dtype: Any) -> np.ndarray:
+        return np.asarray(self, dtype=dtype)
+    
+    def copy(self) -> np.ndarray:
+        return np.asarray(self)
+    
+    def tolist(self) -> list:
+        return list(self)
+    
+    def __repr__(self) -> str:
+        return f"Range(start={self.start!r}, step={self.step!r}, count={self.count})"
+    
+    def __str__(self) -> str:
+        if self.count <= 1000:
+            return str(np.asarray(self))
+        return f"[{self[0]} {self[1]} {self[2]} ... {self[-3]} {self[-2]} {self[-1]}]"
+
+
+def colon(start: float, *args: float) -> Range:
+    """
+    Lazy MATLAB colon range start:stop or start:step:stop
+    
+    Parameters:
+    -----------
+    start : float
+        First value
+    *args : float
+        colon(start, stop) with step 1, or colon(start, step, stop)
+    
+    Returns:
+    --------
+    Range
+        Values start, start + step, ... not passing stop; integers when all
+        the arguments are integers (usable as indices), otherwise floats
+    
+    Examples:
+    ---------
+    >>> for k in colon(1, 1000000):  # No array is allocated
+    ...     pass
+    >>> t = colon(0, 0.001, 10)
+    >>> y = sin(2 * np.pi * t)  # Materialized here
+    """
+    if len(args) == 1:
+        step, stop = 1, args[0]
+    elif len(args) == 2:
+        step, stop = args
+    else:
+        raise ValueError("colon expects (start, stop) or (start, step, stop)")
+    # Plain Python numbers, so a span like uint8(1) - uint8(5) cannot wrap around
+    if all(isinstance(v, (int, np.integer)) for v in (start, step, stop)):
+        start, step, stop = int(start), int(step), int(stop)
+        if step == 0 or (stop - start) * step < 0:
+            return Range(start, step, 0)
+        return Range(start, step, (stop - start) // step + 1)
+    start, step, stop = float(start), float(step), float(stop)
+    if step == 0 or (stop - start) / step < 0:
+        return Range(start, step, 0)
+    # Rounding tolerance of a few eps, as in MATLAB: 0:0.1:1 has 11 elements
+    tol = 2 * np.finfo(float).eps * max(abs(start), abs(stop))
+    count = int(np.floor((stop - start) / step + tol / abs(step))) + 1
+    last = start + (count - 1) * step
+    if abs(last - stop) <= tol:
+        last = stop
+    return Range(start, step, count, last)
+
+
+def linspace(start: float, stop: float, num: int = 50, lazy: bool = False) -> Union[np.ndarray, Range]:
     """
     Create an array with evenly spaced values
     
@@ -70,20 +278,46 @@ def linspace(start: float, stop: float, num: int = 50) -> np.ndarray:
         Ending value
     num : int, optional
         Number of values to generate (default: 50)
+    lazy : bool, optional
+        Return a Range that computes the values on demand (O(1) memory),
+        for loop indices or very long axes
     
     Returns:
     --------
-    ndarray
+    ndarray or Range
         Array with evenly spaced values
     
     Examples:
     ---------
     >>> x = linspace(0, 10, 100)
+    >>> t = linspace(0, 1, 10 ** 9, lazy=True)
     """
-    return np.linspace(start, stop, num)
+    if not lazy:
+        return np.linspace(start, stop, num)
+    step = (stop - start) / (num - 1) if num > 1 else 0.0
+    return Range(float(start), float(step), num, float(stop) if num > 1 else float(start))
 
 
-def meshgrid(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+def _grid_arrays(vectors: Tuple[np.ndarray, ...], axes: Tuple[int, ...],
+                 lazy: bool) -> Tuple[np.ndarray, ...]:
+    """Coordinate arrays where vectors[k] varies along dimension axes[k]"""
+    # Private copies, so later changes to the inputs do not move the grid
+    vectors = [np.array(v).ravel() for v in vectors]
+    shape = [0] * len(vectors)
+    for v, axis in zip(vectors, axes):
+        shape[axis] = v.size
+    grids = []
+    for v, axis in zip(vectors, axes):
+        column = [1] * len(shape)
+        column[axis] = v.size
+        # Read-only broadcast views: one vector of memory each, full shape in arithmetic
+        grid = np.broadcast_to(v.reshape(column), tuple(shape))
+        grids.append(grid if lazy else grid.copy())
+    return tuple(grids)
+
+
+def meshgrid(x: np.ndarray, y: Optional[np.ndarray] = None, z: Optional[np.ndarray] = None,
+             lazy: bool = False) -> Tuple[np.ndarray, ...]:
     """
     Create coordinate matrices from coordinate vectors
     
@@ -91,21 +325,67 @@ def meshgrid(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     -----------
     x : ndarray
         x-coordinate vector
-    y : ndarray
-        y-coordinate vector
+    y : ndarray, optional
+        y-coordinate vector (default: x)
+    z : ndarray, optional
+        z-coordinate vector, for 3-D grids
+    lazy : bool, optional
+        Return read-only broadcast views instead of full arrays. They
+        behave as full matrices in expressions but take the memory of the
+        vectors only; evaluate('sin(X) + cos(Y)') or gridfun(sin, X)
+        allocate just the result
     
     Returns:
     --------
     X, Y : ndarray
-        Coordinate matrices
+        Coordinate matrices, size length(y) x length(x) (X, Y, Z with z:
+        length(y) x length(x) x length(z))
     
     Examples:
     ---------
     >>> x = linspace(0, 1, 10)
     >>> y = linspace(0, 1, 10)
     >>> X, Y = meshgrid(x, y)
+    >>> X, Y = meshgrid(linspace(-2, 2, 20000), lazy=True)  # 320 KB instead of 6.4 GB
+    >>> Z = gridfun(sin, X) + gridfun(cos, Y)
+    """
+    if y is None:
+        y = x
+    if z is None:
+        return _grid_arrays((x, y), (1, 0), lazy)
+    return _grid_arrays((x, y, z), (1, 0, 2), lazy)
+
+
+def ndgrid(*vectors: np.ndarray, lazy: bool = False) -> Tuple[np.ndarray, ...]:
+    """
+    Create N-D coordinate arrays from grid vectors
+    
+    Unlike meshgrid, the k-th vector varies along the k-th dimension, so
+    the arrays are length(x1) x length(x2) x ... for any number of vectors.
+    
+    Parameters:
+    -----------
+    *vectors : ndarray
+        Grid vectors x1, x2, ..., xn (one vector: ndgrid(x, x))
+    lazy : bool, optional
+        Return read-only broadcast views instead of full arrays
+    
+    Returns:
+    --------
+    X1, X2, ..., Xn : ndarray
+        Coordinate arrays
+    
+    Examples:
+    ---------
+    >>> X1, X2, X3 = ndgrid(linspace(0, 1, 50), linspace(0, 2, 60), linspace(0, 3, 70))
+    >>> V = X1 ** 2 + X2 * X3
+    >>> X, Y = ndgrid(x, y, lazy=True)
     """
-    return np.meshgrid(x, y)
+    if not vectors:
+        raise ValueError("ndgrid expects at least one grid vector")
+    if len(vectors) == 1:
+        vectors = vectors * 2
+    return _grid_arrays(vectors, tuple(range(len(vectors))), lazy)
 
 
 def rand(m: int, n: Optional[int] = None) -> np.ndarray:
@@ -210,6 +490,45 @@ def diag(v: Union[np.ndarray, list], k: int = 0) -> np.ndarray:
     return np.diag(v, k)
 
 
+def _repeats(x: np.ndarray) -> bool:
+    """Whether x repeats its data along some axis (zero stride over a length > 1)"""
+    return any(stride == 0 and n > 1 for stride, n in zip(x.strides, x.shape))
+
+
+def gridfun(func: Callable, X: np.ndarray) -> np.ndarray:
+    """
+    Apply an elementwise function to a lazy grid, keeping it lazy
+    
+    A broadcast view (meshgrid(..., lazy=True), repmat of a row or column)
+    repeats its values along its zero-stride dimensions, so func is applied
+    to one copy and the result broadcast back: gridfun(sin, X) costs a
+    vector, not a matrix. The result is a read-only broadcast view like X;
+    copy it (np.array) before assigning into it. Other arrays are passed
+    to func unchanged.
+    
+    Parameters:
+    -----------
+    func : callable
+        Elementwise function of one array (sin, exp, np.abs, ...)
+    X : ndarray
+        Broadcast view or array
+    
+    Returns:
+    --------
+    ndarray
+        func(X), as a read-only broadcast view when X repeats its values
+    
+    Examples:
+    ---------
+    >>> X, Y = meshgrid(linspace(-2, 2, 20000), lazy=True)
+    >>> Z = gridfun(sin, X) + gridfun(cos, Y)  # Only Z is full size
+    """
+    if isinstance(X, np.ndarray) and _repeats(X):
+        compact = X[tuple(slice(None) if stride else slice(0, 1) for stride in X.strides)]
+        return np.broadcast_to(func(compact), X.shape)
+    return func(X)
+
+
 # MATLAB-style mathematical functions
 sin = np.sin
 cos = np.cos
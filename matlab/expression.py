@@ -0,0 +1,403 @@
+"""
+Fused evaluation of elementwise expressions
+
+evaluate() compiles an expression over arrays, scalars and the elementwise
+math functions into a short list of ufunc calls, then runs it block by
+block: each block of the result is computed through cache-sized scratch
+buffers and written straight into the output, so no full-size temporary
+is ever allocated.
+"""
+
+import ast
+import functools
+import os
+import sys
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .core import Range, _repeats
+from .workspace import _Deferred, _peek
+
+
+# Elements per block and scratch buffer (128 KB of float64: stays in cache)
+_block_elements = 16384
+
+# Arrays smaller than this are evaluated by NumPy directly in fuse()
+_fuse_min_size = 1 << 16
+
+_FUNCTIONS = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan, 'asin': np.arcsin, 'acos': np.arccos,
+    'atan': np.arctan, 'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'log10': np.log10, 'log2': np.log2, 'sqrt': np.sqrt,
+    'abs': np.abs, 'floor': np.floor, 'ceil': np.ceil, 'fix': np.trunc, 'sign': np.sign,
+    'conj': np.conjugate,
+    'atan2': np.arctan2, 'hypot': np.hypot, 'mod': np.mod, 'rem': np.fmod,
+}
+
+
+
+def _real(z: Any, out: Optional[np.ndarray] = None) -> Any:
+    if out is None:
+        return np.real(z)
+    np.copyto(out, np.real(z))
+    return out
+
+
+def _imag(z: Any, out: Optional[np.ndarray] = None) -> Any:
+    if out is None:
+        return np.imag(z)
+    np.copyto(out, np.imag(z))
+    return out
+
+
+def _angle(z: Any, out: Optional[np.ndarray] = None) -> Any:
+    return np.arctan2(np.imag(z), np.real(z), out=out)
+
+
+# Elementwise functions that are not ufuncs, in the steps' calling convention
+# f(*args, out=None); real and imag are views, so they add no temporaries
+_PARTS = {'real': _real, 'imag': _imag, 'angle': _angle}
+
+_BINARY = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.true_divide,
+    ast.Pow: np.power, ast.Mod: np.remainder, ast.FloorDiv: np.floor_divide,
+    ast.BitAnd: np.bitwise_and, ast.BitOr: np.bitwise_or, ast.BitXor: np.bitwise_xor,
+}
+
+_COMPARE = {
+    ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater, ast.GtE: np.greater_equal,
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+
+_CONSTANTS = {'pi': np.pi, 'inf': np.inf, 'Inf': np.inf, 'nan': np.nan, 'NaN': np.nan,
+              'eps': np.finfo(float).eps}
+
+
+class _Program(NamedTuple):
+    """Compiled expression: inputs by name, then (ufunc, operands, register) steps"""
+    names: Tuple[str, ...]
+    steps: Tuple[Tuple[Any, Tuple[Tuple[str, Any], ...], int], ...]
+    result: Tuple[str, Any]
+
+
+class _Compiler:
+    def __init__(self):
+        self.names: List[str] = []
+        self.steps: List[tuple] = []
+    
+    def emit(self, ufunc: Callable, operands: List[Tuple[str, Any]]) -> Tuple[str, Any]:
+        if all(kind == 'const' for kind, _ in operands):
+            # Constant folding: 2 * pi * 50 is one number
+            return ('const', ufunc(*(value for _, value in operands)))
+        self.steps.append((ufunc, tuple(operands), len(self.steps)))
+        return ('reg', len(self.steps) - 1)
+    
+    def visit(self, node: ast.AST) -> Tuple[str, Any]:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, complex)):
+            return ('const', node.value)
+        if isinstance(node, ast.Name):
+            if node.id not in self.names:
+                self.names.append(node.id)
+            return ('input', self.names.index(node.id))
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            return self.emit(_BINARY[type(node.op)], [self.visit(node.left), self.visit(node.right)])
+        if isinstance(node, ast.UnaryOp):
+            operand = self.visit(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            ufunc = {ast.USub: np.negative, ast.Not: np.logical_not,
+                     ast.Invert: np.invert}[type(node.op)]
+            return self.emit(ufunc, [operand])
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            # a < b < c is (a < b) & (b < c)
+            operands = [self.visit(node.left)] + [self.visit(c) for c in node.comparators]
+            result = None
+            for op, left, right in zip(node.ops, operands, operands[1:]):
+                test = self.emit(_COMPARE[type(op)], [left, right])
+                result = test if result is None else self.emit(np.logical_and, [result, test])
+            return result
+        if isinstance(node, ast.BoolOp):
+            ufunc = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self.visit(node.values[0])
+            for value in node.values[1:]:
+                result = self.emit(ufunc, [result, self.visit(value)])
+            return result
+        if isinstance(node, ast.Call) and not node.keywords:
+            if (isinstance(node.func, ast.Name) and node.func.id in _PARTS
+                    and len(node.args) == 1):
+                return self.emit(_PARTS[node.func.id], [self.visit(node.args[0])])
+            ufunc = None
+            if isinstance(node.func, ast.Name):
+                ufunc = _FUNCTIONS.get(node.func.id)
+            elif (isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name)
+                  and node.func.value.id in ('np', 'numpy')):
+                ufunc = getattr(np, node.func.attr, None)
+            if isinstance(ufunc, np.ufunc) and ufunc.nin == len(node.args) and ufunc.nout == 1:
+                return self.emit(ufunc, [self.visit(arg) for arg in node.args])
+        raise ValueError(f"Not an elementwise expression: {ast.unparse(node)}")
+
+
+@functools.lru_cache(maxsize=128)
+def _compile(expression: str) -> _Program:
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {expression}") from e
+    compiler = _Compiler()
+    result = compiler.visit(tree.body)
+    return _Program(tuple(compiler.names), tuple(compiler.steps), result)
+
+
+def _compact(value: np.ndarray) -> np.ndarray:
+    """Drop the repeats of a broadcast view (e.g. a lazy meshgrid) so they are computed once"""
+    if not _repeats(value):
+        return value
+    return value[tuple(slice(None) if stride else slice(0, 1) for stride in value.strides)]
+
+
+class _Block:
+    """Scratch buffers of one worker thread, reused from block to block"""
+    
+    def __init__(self, program: _Program, dtypes: List[np.dtype], fixed: Dict[int, Any]):
+        self.program = program
+        self.dtypes = dtypes
+        self.fixed = fixed
+        self.buffers: Dict[Any, np.ndarray] = {}
+    
+    def buffer(self, key: Any, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        buffer = self.buffers.get(key)
+        if buffer is None or buffer.shape[1:] != shape[1:] or buffer.shape[:1] < shape[:1]:
+            buffer = self.buffers[key] = np.empty(shape, dtype)
+        return buffer[:shape[0]] if shape else buffer
+    
+    def run(self, inputs: List[Any], start: int, stop: int, out: np.ndarray) -> None:
+        """Compute rows start:stop of the (work-shaped) result into out"""
+        values = []
+        for k, value in enumerate(inputs):
+            if isinstance(value, Range):
+                # Generate the range's values for these rows, as Range.__array__ would
+                rows = self.buffer(('range', k), (stop - start,), value.dtype)
+                index = self.buffers.get('index')
+                if index is None or len(index) < len(rows):
+                    index = self.buffers['index'] = np.arange(len(rows))
+                np.add(index[:len(rows)], start, out=rows)
+                rows *= value.step
+                rows += value.start
+                if stop == value.count:
+                    rows[-1] = value.last
+                values.append(rows)
+            elif _blocked(value):
+                values.append(value[start:stop])
+            else:
+                values.append(value)
+        registers = [self.fixed.get(register) for register in range(len(self.program.steps))]
+        last = len(self.program.steps) - 1
+        for ufunc, operands, register in self.program.steps:
+            if register in self.fixed:
+                continue
+            args = [operand if kind == 'const' else values[operand] if kind == 'input'
+                    else registers[operand] for kind, operand in operands]
+            if register == last:
+                ufunc(*args, out=out[start:stop])
+                return
+            shape = np.broadcast_shapes(*(np.shape(arg) for arg in args))
+            registers[register] = self.buffer(register, shape, self.dtypes[register])
+            ufunc(*args, out=registers[register])
+
+
+def _blocked(value: Any) -> bool:
+    """Whether a (work-shaped) input varies from block to block"""
+    return isinstance(value, Range) or (isinstance(value, np.ndarray) and value.ndim > 0
+                                        and value.shape[0] != 1)
+
+
+def _input(name: str, variables: Mapping[str, Any]) -> Any:
+    if name in variables:
+        value = variables[name]
+    elif name in _CONSTANTS:
+        return _CONSTANTS[name]
+    else:
+        raise NameError(f"name '{name}' is not defined")
+    if isinstance(value, Range) or np.isscalar(value):
+        return value
+    value = np.asarray(value)
+    return value[()] if value.ndim == 0 else value
+
+
+def evaluate(expression: str, variables: Optional[Mapping[str, Any]] = None,
+             out: Optional[np.ndarray] = None, threads: Optional[int] = 1) -> np.ndarray:
+    """
+    Evaluate an elementwise expression without full-size temporaries
+    
+    NumPy allocates a full array for every operator in
+    sin(2*pi*f1*t) + 0.5*sin(2*pi*f2*t); evaluate() computes the result
+    in cache-sized blocks instead, so the output is the only large
+    allocation and the intermediates never leave the cache. Lazy ranges
+    (linspace(..., lazy=True), colon) are generated block by block, and
+    lazy meshgrid views are used without expanding them.
+    
+    Parameters:
+    -----------
+    expression : str
+        Arithmetic (+ - * / ** %), comparisons, and/or/not, and the
+        elementwise functions (sin, cos, exp, log, sqrt, abs, ..., np.<ufunc>)
+        of variables and numbers; pi, inf, nan and eps are predefined
+    variables : dict, optional
+        Values of the names (default: the caller's variables)
+    out : ndarray, optional
+        Array to write the result into
+    threads : int, optional
+        Worker threads sharing the blocks (default: 1; None: one per CPU)
+    
+    Returns:
+    --------
+    ndarray
+        The result, as NumPy would compute it
+    
+    Examples:
+    ---------
+    >>> t = linspace(0, 1, 10 ** 7)
+    >>> f1, f2 = 50, 120
+    >>> y = evaluate('sin(2*pi*f1*t) + 0.5*sin(2*pi*f2*t)')
+    >>> evaluate('exp(-x**2) * cos(y)', {'x': X, 'y': Y}, threads=None)
+    """
+    program = _compile(expression)
+    if variables is None:
+        frame = sys._getframe(1)
+        variables = ChainMap(frame.f_locals, frame.f_globals)
+    inputs = [_input(name, variables) for name in program.names]
+    if program.result[0] != 'reg':
+        # A plain name or constant
+        value = program.result[1] if program.result[0] == 'const' else inputs[program.result[1]]
+        value = np.array(value)
+        if out is None:
+            return value
+        out[...] = value
+        return out
+    
+    arrays = [value for value in inputs if isinstance(value, (np.ndarray, Range))]
+    shape = np.broadcast_shapes(*(value.shape for value in arrays))
+    # Probe one element to learn the type of every intermediate
+    probe = [np.ones(1, value.dtype) if isinstance(value, (np.ndarray, Range)) else value
+             for value in inputs]
+    registers = []
+    with np.errstate(all='ignore'):
+        for ufunc, operands, _ in program.steps:
+            registers.append(ufunc(*(operand if kind == 'const' else probe[operand]
+                                     if kind == 'input' else registers[operand]
+                                     for kind, operand in operands)))
+    dtypes = [np.asarray(register).dtype for register in registers]
+    if out is None:
+        out = np.empty(shape, dtypes[-1])
+    elif out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}")
+    
+    # Work shape: one flat axis when every input is contiguous at full size,
+    # otherwise blocks of rows along the first axis
+    if all(isinstance(value, np.ndarray) and value.shape == shape and value.flags.c_contiguous
+           for value in arrays) and out.flags.c_contiguous and len(shape) > 1:
+        inputs = [value.reshape(-1) if isinstance(value, np.ndarray) else value
+                  for value in inputs]
+        work = out.reshape(-1)
+    else:
+        ndim = len(shape)
+        if ndim > 1:
+            # Ranges are only generated block by block along a vector
+            inputs = [np.asarray(value) if isinstance(value, Range) else value
+                      for value in inputs]
+        inputs = [_compact(value)[(np.newaxis,) * (ndim - value.ndim)]
+                  if isinstance(value, np.ndarray) else value for value in inputs]
+        work = out
+    
+    # Steps that no blocked input reaches (scalar factors, the compact row of
+    # a lazy meshgrid) are computed once instead of once per block
+    fixed: Dict[int, Any] = {}
+    for ufunc, operands, register in program.steps:
+        if all(kind == 'const' or (kind == 'input' and not _blocked(inputs[operand]))
+               or (kind == 'reg' and operand in fixed) for kind, operand in operands):
+            fixed[register] = ufunc(*(operand if kind == 'const' else inputs[operand]
+                                      if kind == 'input' else fixed[operand]
+                                      for kind, operand in operands))
+    if len(program.steps) - 1 in fixed:
+        work[...] = fixed[len(program.steps) - 1]
+        return out
+    
+    inner = int(np.prod(work.shape[1:], dtype=np.int64))
+    rows = max(1, _block_elements // max(inner, 1))
+    bounds = [(start, min(start + rows, work.shape[0])) for start in range(0, work.shape[0], rows)]
+    
+    def run_blocks(part: List[Tuple[int, int]]) -> None:
+        block = _Block(program, dtypes, fixed)
+        for start, stop in part:
+            block.run(inputs, start, stop, work)
+    
+    if threads is None:
+        threads = os.cpu_count() or 1
+    if threads <= 1 or len(bounds) < 2:
+        run_blocks(bounds)
+    else:
+        # NumPy releases the GIL inside ufuncs, so contiguous runs of blocks overlap
+        size = -(-len(bounds) // threads)
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for future in [pool.submit(run_blocks, bounds[k:k + size])
+                           for k in range(0, len(bounds), size)]:
+                future.result()
+    return out
+
+
+def fuse(source: str, variables: Mapping[str, Any]) -> str:
+    """
+    Rewrite 'name = expression' (or an expression) to use evaluate() when
+    the expression is elementwise over large arrays; otherwise return the
+    source unchanged. Expressions using and/or/not or chained comparisons
+    are left alone, so fusing never changes what a command does.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return source
+    if len(tree.body) != 1:
+        return source
+    statement = tree.body[0]
+    if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+            and isinstance(statement.targets[0], ast.Name):
+        node = statement.value
+    elif isinstance(statement, ast.Expr):
+        node = statement.value
+    else:
+        return source
+    # Python's and/or/not and chained comparisons are not elementwise (on
+    # arrays they raise); fusing them would change what the command means
+    if any(isinstance(n, ast.BoolOp) or (isinstance(n, ast.UnaryOp) and isinstance(n.op, ast.Not))
+           or (isinstance(n, ast.Compare) and len(n.ops) > 1) for n in ast.walk(node)):
+        return source
+    expression = ast.unparse(node)
+    try:
+        program = _compile(expression)
+    except ValueError:
+        return source
+    if len(program.steps) < 2:
+        return source
+    # Only look at the values: reading a Workspace variable would bring a
+    # spilled array back into memory or load a deferred one
+    sizes = []
+    for name in program.names:
+        value = _peek(variables, name) if name in variables else 0
+        if isinstance(value, _Deferred):
+            info = value.info(name)
+            if info.class_name == 'pickled':
+                return source
+            sizes.append(int(np.prod(info.size, dtype=np.int64)))
+        elif isinstance(value, (np.ndarray, Range)) or np.isscalar(value):
+            sizes.append(np.size(value))
+        else:
+            return source
+    if not sizes or max(sizes) < _fuse_min_size:
+        return source
+    call = f"evaluate({expression!r})"
+    if isinstance(statement, ast.Assign):
+        return f"{statement.targets[0].id} = {call}"
+    return call
@@ -0,0 +1,383 @@
+"""
+MATLAB indexing syntax for the interactive interpreters
+
+translate() rewrites A(i, j), ranges, end and logical masks in a command
+into NumPy subscripts, choosing the cheapest form: constant ranges become
+basic slices (views), constant positions become integers, and only
+subscripts whose value is unknown until run time go through a small
+conversion function. Indexed assignment becomes an in-place write.
+"""
+
+import keyword
+import re
+
+import numpy as np
+from typing import Any, List, MutableMapping, Optional, Tuple, Union
+
+from .core import Range
+from .workspace import _is_sparse
+
+
+# Names of the run-time conversion functions in the command's namespace
+_INDEX = '_mlindex'
+_INDICES = '_mlindices'
+
+_STATEMENTS = ('for', 'while', 'if', 'elif', 'else', 'with', 'def', 'class', 'try',
+               'except', 'finally', 'lambda', 'async', 'match', 'case')
+_OPEN = {'(': ')', '[': ']', '{': '}'}
+_NAME_BEFORE = re.compile(r'(?<![\w.])([A-Za-z_]\w*)\s*$')
+_INTEGER = re.compile(r'^\s*([+-]?\d+)\s*$')
+_END = re.compile(r'^\s*end\s*(?:([+-])\s*(\d+))?\s*$')
+_END_WORD = re.compile(r'\bend\b')
+_LAMBDA = re.compile(r'\blambda\b([^:]*):')
+
+
+def index(value: Any, linear: bool = False) -> Any:
+    """
+    Convert one 1-based MATLAB subscript value to a NumPy index
+    
+    Integer ranges become slices (views); logical masks become the
+    positions of their true elements, which NumPy gathers several times
+    faster than it applies a mask (column-major when linear, to match
+    A.T.flat); numbers are shifted to 0-based after checking they are
+    positive integers.
+    """
+    if type(value) is int:
+        if value < 1:
+            raise IndexError(f"Index {value} must be a positive integer")
+        return value - 1
+    if isinstance(value, slice):
+        return value
+    if isinstance(value, Range):
+        if value.count and value.dtype.kind in 'iu':
+            if value.min() < 1:
+                raise IndexError("Indices must be positive integers")
+            step = int(value.step)
+            stop = int(value.last) - 1 + (1 if step > 0 else -1)
+            return slice(int(value.start) - 1, stop if stop >= 0 else None, step)
+        value = np.asarray(value)
+    subscript = np.asarray(value)
+    if subscript.dtype == bool:
+        if subscript.ndim > 1 and not linear:
+            return subscript
+        return np.flatnonzero(np.ravel(subscript, order='F'))
+    if subscript.dtype.kind == 'f':
+        if not np.all(subscript == np.floor(subscript)):
+            raise IndexError("Indices must be integers")
+        subscript = subscript.astype(np.intp)
+    elif subscript.dtype.kind not in 'iu':
+        raise IndexError(f"Cannot index with {subscript.dtype} values")
+    if subscript.size and subscript.min() < 1:
+        raise IndexError("Indices must be positive integers")
+    return subscript - 1
+
+
+def indices(shape: Tuple[int, ...], *values: Any) -> tuple:
+    """
+    Convert several subscripts; two or more index arrays select the
+    submatrix they span (MATLAB semantics) via np.ix_
+    """
+    converted = [index(value) for value in values]
+    arrays = [k for k, s in enumerate(converted) if isinstance(s, np.ndarray) and s.ndim]
+    if len(arrays) < 2:
+        return tuple(converted)
+    for k, s in enumerate(converted):
+        if isinstance(s, slice):
+            converted[k] = np.arange(*s.indices(shape[k]))
+    vectors = [k for k, s in enumerate(converted) if isinstance(s, np.ndarray) and s.ndim]
+    for k, grid in zip(vectors, np.ix_(*(converted[k] for k in vectors))):
+        converted[k] = grid
+    return tuple(converted)
+
+
+def _split(text: str, separator: str) -> List[str]:
+    """Split at separators outside brackets (strings are already hidden)"""
+    parts, depth, start = [], 0, 0
+    for i, c in enumerate(text):
+        if c in _OPEN:
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif c == separator and depth == 0:
+            if separator == ':' and text[i + 1:i + 2] == '=':
+                continue  # Walrus operator
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _closing(text: str, start: int) -> int:
+    """Index of the bracket closing the one at start, or -1"""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] in _OPEN:
+            depth += 1
+        elif text[i] in ')]}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def _is_range(part: str) -> bool:
+    return len(_split(part, ':')) in (2, 3) and 'lambda' not in part
+
+
+def _to_colon(part: str) -> str:
+    """a:b or a:s:b (outside indexing) -> a lazy colon() range"""
+    return f"colon({', '.join(p.strip() for p in _split(part, ':'))})"
+
+
+def _position(text: str) -> Optional[Tuple[str, int]]:
+    """Constant position: ('abs', k) for k, ('end', offset) for end+offset"""
+    match = _INTEGER.match(text)
+    if match:
+        return ('abs', int(match.group(1)))
+    match = _END.match(text)
+    if match:
+        offset = int(match.group(2) or 0)
+        return ('end', -offset if match.group(1) == '-' else offset)
+    return None
+
+
+def _static(text: str) -> Optional[Union[int, slice]]:
+    """
+    The NumPy index for a constant subscript (positions, end, ranges of
+    them with an integer step), or None if it depends on run-time values
+    """
+    parts = _split(text, ':')
+    if len(parts) == 1:
+        if not text.strip():
+            return None
+        position = _position(text)
+        if position is None:
+            return None
+        kind, k = position
+        if kind == 'abs' and k < 1:
+            raise IndexError(f"Index {k} must be a positive integer")
+        if kind == 'end' and k > 0:
+            return None  # Past the end: let NumPy raise
+        return k - 1
+    if len(parts) == 2 and not parts[0].strip() and not parts[1].strip():
+        return slice(None)
+    if len(parts) not in (2, 3):
+        return None
+    first, last = _position(parts[0]), _position(parts[-1])
+    step = int(parts[1]) if len(parts) == 3 and _INTEGER.match(parts[1]) else (
+        1 if len(parts) == 2 else None)
+    if first is None or last is None or not step:
+        return None
+    start = first[1] - 1
+    if first[0] == 'abs' and first[1] < 1 or first[0] == 'end' and first[1] > 0:
+        return None
+    if last[0] == 'end' and last[1] > 0:
+        return None
+    if step > 0:
+        stop = last[1] if last[0] == 'abs' else (last[1] or None)
+    else:
+        stop = last[1] - 2
+        if last[0] == 'abs' and stop < 0:
+            stop = None
+    return slice(start, stop, None if step == 1 else step)
+
+
+def _slice_text(s: Union[int, slice]) -> str:
+    if isinstance(s, int):
+        return str(s)
+    step = s.step or 1
+    start = None if s.start == (0 if step > 0 else -1) else s.start
+    text = ':'.join('' if v is None else str(v) for v in (start, s.stop))
+    return text if s.step is None else f"{text}:{s.step}"
+
+
+def _dynamic(arg: str, size: str) -> str:
+    """Run-time subscript expression: end is the dimension size, a:b is a colon() range"""
+    text = _END_WORD.sub(size, arg)
+    return _to_colon(text) if _is_range(text) else text
+
+
+def _subscripts(name: str, value: Any, args: List[str], target: bool) -> str:
+    """NumPy indexing of name for MATLAB subscripts args (already translated)"""
+    ndim = len(getattr(value, 'shape', ()))
+    if len(args) == 1:
+        if ndim <= 1 or isinstance(value, Range):
+            layout, size = 'vector', f"{name}.shape[0]"
+        elif _is_sparse(value):
+            raise IndexError("Linear indexing of sparse matrices is not supported")
+        elif ndim == 2 and value.shape[0] == 1:
+            layout, size = 'row', f"{name}.size"
+        elif ndim == 2 and value.shape[1] == 1:
+            layout, size = 'column', f"{name}.size"
+        else:
+            layout, size = 'linear', f"{name}.size"
+        arg = args[0]
+        static = _static(arg)
+        if layout == 'linear':
+            if static == slice(None):
+                # A(:) is a column in column-major order
+                return f"{name}.T.flat[:]" if target else f"{name}.reshape(-1, 1, order='F')"
+            if static is not None:
+                return f"{name}.T.flat[{_slice_text(static)}]"
+            return f"{name}.T.flat[{_INDEX}({_dynamic(arg, size)}, linear=True)]"
+        if static is not None:
+            text = _slice_text(static)
+        else:
+            text = f"{_INDEX}({_dynamic(arg, size)})"
+        if layout == 'row':
+            return f"{name}[{':' if isinstance(static, slice) else '0'}, {text}]"
+        if layout == 'column':
+            return f"{name}[{text}, {':' if isinstance(static, slice) else '0'}]"
+        return f"{name}[{text}]"
+    
+    statics = [_static(arg) for arg in args]
+    dynamic = [arg for arg, s in zip(args, statics) if s is None]
+    sizes = [f"{name}.shape[{k}]" for k in range(len(args))]
+    if len(dynamic) < 2:
+        subscripts = [_slice_text(s) if s is not None else f"{_INDEX}({_dynamic(arg, size)})"
+                      for arg, s, size in zip(args, statics, sizes)]
+        return f"{name}[{', '.join(subscripts)}]"
+    # Several run-time subscripts may all be arrays: let indices() build the grid
+    subscripts = [_dynamic(arg, size) if s is None else repr(s) if isinstance(s, slice)
+                  else str(s + 1) if s >= 0 else f"{size} - {-s - 1}"
+                  for arg, s, size in zip(args, statics, sizes)]
+    return f"{name}[{_INDICES}({name}.shape, {', '.join(subscripts)})]"
+
+
+def _lambda_names(text: str) -> frozenset:
+    """Parameters of the lambdas whose bodies are still open at the end of text"""
+    depth, top = 0, []
+    for c in text:
+        if c in _OPEN:
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif depth == 0:
+            top.append(c)
+    top = ''.join(top)
+    names = set()
+    for match in _LAMBDA.finditer(top):
+        # A lambda body ends at a comma of its own bracket level
+        if ',' in _LAMBDA.sub('', top[match.end():]):
+            continue
+        for param in match.group(1).split(','):
+            param = param.split('=')[0].strip().lstrip('*')
+            if param:
+                names.add(param)
+    return frozenset(names)
+
+
+def _translate(text: str, namespace: MutableMapping[str, Any], ranges: bool,
+               target: bool = False, bound: frozenset = frozenset()) -> str:
+    """
+    Rewrite indexing (and, with ranges, colon ranges in call arguments) in
+    text; names in bound are lambda parameters, not workspace variables
+    """
+    out = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c not in _OPEN:
+            out.append(c)
+            i += 1
+            continue
+        close = _closing(text, i)
+        if close < 0:
+            out.append(text[i:])
+            break
+        inner = text[i + 1:close]
+        before = ''.join(out)
+        match = _NAME_BEFORE.search(before) if c == '(' else None
+        name = match.group(1) if match else None
+        scope = bound | _lambda_names(before) if 'lambda' in before else bound
+        value = None
+        if name and not keyword.iskeyword(name) and name not in scope:
+            value = namespace.get(name, None)
+        if (isinstance(value, (np.ndarray, Range)) or _is_sparse(value)) and not callable(value):
+            args = [_translate(arg, namespace, True, bound=scope).strip()
+                    for arg in _split(inner, ',')]
+            out = [before[:match.start(1)], _subscripts(name, value, args, target)]
+        elif c == '(':
+            # Call or grouping: a:b arguments are ranges
+            args = [_translate(arg, namespace, True, bound=scope) for arg in _split(inner, ',')]
+            if ranges:
+                args = [_to_colon(arg) if _is_range(arg) else arg for arg in args]
+            out.append('(' + ','.join(args) + ')')
+        else:
+            out.append(c + _translate(inner, namespace, False, bound=scope) + _OPEN[c])
+        i = close + 1
+    return ''.join(out)
+
+
+def _assignment(command: str) -> Optional[int]:
+    """Position of the top-level '=' of an assignment, or None"""
+    depth = 0
+    for i, c in enumerate(command):
+        if c in _OPEN:
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif c == '=' and depth == 0:
+            before, after = command[i - 1:i], command[i + 1:i + 2]
+            if after == '=' or before and before in '=<>!':
+                continue  # Comparison
+            if before and before in '+-*/%&|^@:':
+                return None  # Augmented assignment
+            return i
+    return None
+
+
+def translate(command: str, namespace: MutableMapping[str, Any]) -> str:
+    """
+    Translate MATLAB indexing in one command into NumPy indexing
+    
+    A name followed by parentheses is indexing when the namespace holds an
+    array (or range) under that name: A(i, j) -> A[i-1, j-1], with ':',
+    end, ranges (a:b, a:s:b) and logical masks. Ranges of constants become
+    slices, so A(2:end, :) is a view; A(idx) with an index array or mask is
+    converted at run time. One subscript on a matrix is a column-major
+    linear index, as in MATLAB. A range outside indexing (x = 0:0.1:1, or
+    an argument f(1:n)) becomes a lazy colon() range. Strings must already
+    be hidden.
+    
+    Parameters:
+    -----------
+    command : str
+        One line of input
+    namespace : dict
+        Variables the command runs with; the run-time conversion functions
+        are added to it under private names
+    
+    Returns:
+    --------
+    str
+        Python source
+    
+    Examples:
+    ---------
+    >>> translate("B = A(2:end, 1)", {'A': A})
+    'B = A[1:, 0]'
+    >>> translate("A(A > 0.5) = 0", {'A': A})
+    'A.T.flat[_mlindex(A > 0.5, linear=True)] = 0'
+    """
+    if not any(c in command for c in '(:'):
+        return command
+    command = command.replace('~=', '!=')
+    namespace.setdefault(_INDEX, index)
+    namespace.setdefault(_INDICES, indices)
+    
+    first = command.split(None, 1)[0] if command.strip() else ''
+    first = re.match(r'\w*', first).group(0)
+    if first in _STATEMENTS:
+        # Compound statement: its colons are Python's
+        return _translate(command, namespace, False)
+    
+    split = _assignment(command)
+    if split is None:
+        expression = _translate(command, namespace, True)
+        return _to_colon(expression) if _is_range(expression) else expression
+    target = _translate(command[:split], namespace, False, target=True)
+    value = _translate(command[split + 1:], namespace, True)
+    if _is_range(value):
+        value = ' ' + _to_colon(value)
+    return f"{target}={value}"
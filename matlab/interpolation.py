@@ -0,0 +1,379 @@
+"""
+MATLAB-style interpolation functions
+"""
+
+import itertools
+
+import numpy as np
+import scipy.interpolate
+from typing import Any, List, Optional, Sequence, Union
+
+
+_METHODS_1D = ('linear', 'nearest', 'previous', 'next', 'pchip', 'spline')
+_METHODS_ND = ('linear', 'nearest')
+
+
+class _GridAxis:
+    """
+    Sorted grid vector with a fast interval search
+    
+    Uniform grids (e.g. from linspace) locate queries arithmetically in
+    O(1) each, with a one-step correction so the result is exactly what
+    searchsorted would give; other grids use searchsorted.
+    """
+    
+    def __init__(self, x: np.ndarray):
+        self.x = x
+        n = len(x)
+        self.h = (x[-1] - x[0]) / (n - 1)
+        # Each point within a fraction of a step of x[0] + k*h keeps floor()
+        # within one interval of the answer. Testing the steps instead would
+        # let small per-step errors add up along a long grid.
+        ideal = x[0] + np.arange(n) * self.h
+        self.uniform = bool(np.all(np.abs(x - ideal) <= 0.25 * abs(self.h)))
+    
+    def locate(self, q: np.ndarray) -> np.ndarray:
+        """Index i of the interval [x[i], x[i+1]] holding each query, clipped to the ends"""
+        x = self.x
+        last = len(x) - 2
+        if self.uniform:
+            with np.errstate(invalid='ignore'):
+                f = np.floor((q - x[0]) / self.h)
+            i = np.clip(np.nan_to_num(f, nan=0.0), 0, last).astype(np.intp)
+            i -= (q < x[i]) & (i > 0)
+            i += (q >= x[i + 1]) & (i < last)
+            return i
+        return np.clip(np.searchsorted(x, q, side='right') - 1, 0, last)
+
+
+def _grid_vector(x: Any, name: str) -> np.ndarray:
+    x = np.asarray(x, dtype=float).ravel()
+    if x.size < 2:
+        raise ValueError(f"{name} needs at least 2 grid points per dimension")
+    return x
+
+
+class GriddedInterpolant:
+    """
+    Interpolant on a rectilinear grid, prepared once for repeated queries
+    
+    The grid search structure and the piecewise polynomial coefficients
+    (pchip and spline) are computed when the interpolant is created or
+    its values are replaced; each query then only locates the points and
+    evaluates. Create with griddedInterpolant().
+    
+    Attributes:
+    -----------
+    grid : list of ndarray
+        Grid vectors, increasing
+    values : ndarray
+        Sample values (setting them recomputes the coefficients)
+    method : str
+        'linear', 'nearest', 'previous', 'next', 'pchip' or 'spline'
+        (N-D grids: 'linear' or 'nearest')
+    extrapolation : str or float
+        'none' (NaN outside the grid), a fill value, or a method name to
+        extrapolate with the interpolation formula of the end cells
+    """
+    
+    def __init__(self, grid: Sequence[np.ndarray], values: Any, method: str = 'linear',
+                 extrapolation: Optional[Union[str, float]] = None):
+        if method not in _METHODS_1D:
+            raise ValueError(f"method must be one of {_METHODS_1D}")
+        if len(grid) > 1 and method not in _METHODS_ND:
+            raise ValueError(f"N-D grids support the methods {_METHODS_ND}")
+        if isinstance(extrapolation, str) and extrapolation not in ('none', method):
+            raise ValueError("extrapolation must be 'none', the method, or a fill value")
+        self.method = method
+        self.extrapolation = method if extrapolation is None else extrapolation
+        self._axes = [_GridAxis(x) for x in grid]
+        self.values = values
+    
+    @property
+    def grid(self) -> List[np.ndarray]:
+        return [axis.x for axis in self._axes]
+    
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+    
+    @values.setter
+    def values(self, values: Any) -> None:
+        values = np.asarray(values)
+        if values.dtype.kind not in 'fc':
+            values = values.astype(float)
+        shape = tuple(len(axis.x) for axis in self._axes)
+        # 1-D grids accept several value sets (columns)
+        if values.shape[:len(shape)] != shape or (len(shape) > 1 and values.ndim != len(shape)):
+            raise ValueError(f"values must have shape {shape}")
+        self._values = values
+        self._coefficients = None
+        if self.method in ('pchip', 'spline'):
+            x = self._axes[0].x
+            if self.method == 'pchip':
+                poly = scipy.interpolate.PchipInterpolator(x, values, axis=0)
+            else:
+                poly = scipy.interpolate.CubicSpline(x, values, axis=0, bc_type='not-a-knot')
+            self._coefficients = poly.c
+        elif self.method == 'linear' and len(shape) == 1:
+            x = self._axes[0].x
+            dx = np.diff(x).reshape((-1,) + (1,) * (values.ndim - 1))
+            self._coefficients = np.stack([np.diff(values, axis=0) / dx, values[:-1]])
+    
+    def __repr__(self) -> str:
+        shape = 'x'.join(str(len(axis.x)) for axis in self._axes)
+        return f"<GriddedInterpolant: {shape} grid, method '{self.method}'>"
+    
+    def __call__(self, *queries) -> np.ndarray:
+        """
+        Evaluate at query points
+    
+        F(xq) on 1-D grids; F(xq1, ..., xqn) with arrays of one shape;
+        F(Xq) with one point per row of an m x n matrix; F((xg1, ..., xgn))
+        with grid vectors, for the full grid they span.
+        """
+        d = len(self._axes)
+        if len(queries) == 1 and d > 1:
+            q = queries[0]
+            if isinstance(q, (tuple, list)) and len(q) == d and all(np.ndim(v) == 1 for v in q):
+                # Grid vectors: open grids that broadcast, so only the result is full size
+                queries = [np.asarray(v, dtype=float).reshape((-1,) + (1,) * (d - 1 - k))
+                           for k, v in enumerate(q)]
+            else:
+                q = np.asarray(q, dtype=float)
+                if q.ndim != 2 or q.shape[1] != d:
+                    raise ValueError(f"Query points must be an m x {d} matrix")
+                queries = list(q.T)
+        if len(queries) != d:
+            raise ValueError(f"Expected {d} query coordinate arrays")
+        return self._evaluate([np.asarray(q, dtype=float) for q in queries])
+    
+    def _evaluate(self, queries: List[np.ndarray]) -> np.ndarray:
+        index = [axis.locate(q) for axis, q in zip(self._axes, queries)]
+        if len(self._axes) == 1:
+            result = self._evaluate_1d(queries[0], index[0])
+        elif self.method == 'nearest':
+            nearest = tuple(i + (q - axis.x[i] >= axis.x[i + 1] - q)
+                            for axis, q, i in zip(self._axes, queries, index))
+            result = self._values[nearest]
+        else:
+            # Multilinear: weighted sum over the 2^n corners of each cell
+            weights = [(q - axis.x[i]) / (axis.x[i + 1] - axis.x[i])
+                       for axis, q, i in zip(self._axes, queries, index)]
+            result = 0
+            for corner in itertools.product((0, 1), repeat=len(self._axes)):
+                w = 1
+                for c, t in zip(corner, weights):
+                    w = w * (t if c else 1 - t)
+                result = result + w * self._values[tuple(i + c for i, c in zip(index, corner))]
+        result = np.asarray(result)
+    
+        # Outside the grid: fill value, unless extrapolating; NaN queries give NaN
+        outside = False
+        if self.extrapolation != self.method:
+            for axis, q in zip(self._axes, queries):
+                outside = outside | (q < axis.x[0]) | (q > axis.x[-1])
+        missing = False
+        for q in queries:
+            missing = missing | np.isnan(q)
+        if np.any(outside) or np.any(missing):
+            fill = np.nan if self.extrapolation == 'none' else self.extrapolation
+            result = np.array(result, dtype=np.result_type(result, fill, float))
+            result[np.broadcast_to(outside, result.shape[:np.ndim(outside)])] = fill
+            result[np.broadcast_to(missing, result.shape[:np.ndim(missing)])] = np.nan
+        return result
+    
+    def _evaluate_1d(self, q: np.ndarray, i: np.ndarray) -> np.ndarray:
+        x = self._axes[0].x
+        v = self._values
+        if self.method == 'nearest':
+            return v[i + (q - x[i] >= x[i + 1] - q)]
+        if self.method == 'previous':
+            return v[i + (q >= x[i + 1])]
+        if self.method == 'next':
+            return v[i + (q > x[i])]
+        # Piecewise polynomial, highest power first (Horner's rule)
+        c = self._coefficients
+        dx = (q - x[i]).reshape(q.shape + (1,) * (v.ndim - 1))
+        result = c[0][i]
+        for k in range(1, len(c)):
+            result = result * dx + c[k][i]
+        return result
+
+
+def _parse_grid(args: list) -> tuple:
+    """Grid vectors and values from griddedInterpolant's positional arguments"""
+    if len(args) == 1:
+        V = np.asarray(args[0])
+        return [np.arange(1.0, n + 1) for n in V.shape], V
+    if len(args) == 2 and isinstance(args[0], (tuple, list)) and np.ndim(args[0][0]) == 1:
+        return [_grid_vector(x, 'griddedInterpolant') for x in args[0]], np.asarray(args[1])
+    V = np.asarray(args[-1])
+    coords = [np.asarray(x) for x in args[:-1]]
+    d = len(coords)
+    if d == 1:
+        return [_grid_vector(coords[0], 'griddedInterpolant')], V
+    if V.ndim != d:
+        raise ValueError(f"Expected a {d}-D array of values")
+    if all(x.ndim == 1 for x in coords):
+        return coords, V
+    
+    # Full coordinate arrays (ndgrid or meshgrid layout): each varies along one axis
+    grid, order = [], []
+    for x in coords:
+        if x.shape != V.shape:
+            raise ValueError("Coordinate arrays must have the shape of the values")
+        for axis in range(d):
+            line = np.moveaxis(x, axis, 0)[(slice(None),) + (0,) * (d - 1)]
+            if line[0] != line[-1] or V.shape[axis] == 1:
+                grid.append(np.array(line, dtype=float))
+                order.append(axis)
+                break
+        else:
+            raise ValueError("Coordinate arrays must vary along one dimension")
+    if sorted(order) != list(range(d)):
+        raise ValueError("Coordinate arrays must vary along different dimensions")
+    return grid, np.transpose(V, order)
+
+
+def _sorted_grid(grid: List[np.ndarray], V: np.ndarray, allow_unsorted: bool) -> tuple:
+    """Make each grid vector increasing, reordering the values to match"""
+    result = []
+    for axis, x in enumerate(grid):
+        x = np.asarray(x, dtype=float)
+        steps = np.diff(x)
+        if np.all(steps < 0):
+            x = x[::-1]
+            V = np.flip(V, axis=axis)
+        elif not np.all(steps > 0):
+            if not allow_unsorted:
+                raise ValueError("Grid vectors must be strictly monotonic")
+            order = np.argsort(x, kind='stable')
+            x = x[order]
+            V = np.take(V, order, axis=axis)
+            if np.any(np.diff(x) == 0):
+                raise ValueError("Sample points must be distinct")
+        result.append(x)
+    return result, V
+
+
+def griddedInterpolant(*args, method: Optional[str] = None,
+                       extrapolation: Optional[Union[str, float]] = None) -> GriddedInterpolant:
+    """
+    Create an interpolant on a gridded data set
+    
+    All the set-up (grid search structure, spline/pchip coefficients) is
+    done here once, so evaluating many query sets is cheap.
+    
+    Parameters:
+    -----------
+    *args :
+        griddedInterpolant(V) - grid 1..size(V, k) in each dimension
+        griddedInterpolant(x, v) - 1-D; v may have several columns
+        griddedInterpolant(X1, X2, ..., V) - grid vectors, or full
+        coordinate arrays from ndgrid or meshgrid (lazy ones too)
+        griddedInterpolant((x1, x2, ...), V) - grid vectors
+        griddedInterpolant(..., method, extrapolation)
+    method : str, optional
+        'linear' (default), 'nearest', 'previous', 'next', 'pchip',
+        'spline' (N-D: 'linear' or 'nearest')
+    extrapolation : str or float, optional
+        Default: extrapolate with the method; 'none' for NaN, or a value
+    
+    Returns:
+    --------
+    GriddedInterpolant
+        Callable interpolant: F(xq), F(xq1, xq2, ...), F(Xq), F((xg1, xg2, ...))
+    
+    Examples:
+    ---------
+    >>> F = griddedInterpolant(x, v, 'spline')
+    >>> y1 = F(xq1)
+    >>> y2 = F(xq2)  # No set-up repeated
+    >>> X, Y = ndgrid(x, y)
+    >>> F = griddedInterpolant(X, Y, sin(X) * cos(Y))
+    >>> Z = F((xq, yq))  # On the grid spanned by xq and yq
+    """
+    args = list(args)
+    strings = []
+    while args and isinstance(args[-1], str):
+        strings.insert(0, args.pop())
+    if strings:
+        method = strings[0] if method is None else method
+    if len(strings) > 1:
+        extrapolation = strings[1] if extrapolation is None else extrapolation
+    if not args:
+        raise ValueError("griddedInterpolant expects sample values")
+    grid, V = _parse_grid(args)
+    grid, V = _sorted_grid(grid, V, allow_unsorted=False)
+    return GriddedInterpolant(grid, V, method or 'linear', extrapolation)
+
+
+def interp1(*args, extrapolation: Optional[Union[str, float]] = None) -> np.ndarray:
+    """
+    1-D interpolation
+    
+    Interval search uses an O(1) arithmetic lookup when x is uniformly
+    spaced (e.g. from linspace) and a binary search otherwise; all the
+    columns of v are interpolated with one search. To interpolate many
+    query sets onto the same data, create a griddedInterpolant once.
+    
+    Parameters:
+    -----------
+    *args :
+        interp1(x, v, xq) - sample points x, values v (vector, or a
+        column per data set), query points xq
+        interp1(v, xq) - sample points 1..len(v)
+        interp1(..., method) - 'linear' (default), 'nearest', 'previous',
+        'next', 'pchip', 'spline'
+        interp1(..., method, 'extrap') or interp1(..., method, value)
+    extrapolation : str or float, optional
+        'extrap' or a fill value for queries outside x (default: NaN for
+        linear, nearest, previous and next; extrapolate for pchip and spline)
+    
+    Returns:
+    --------
+    ndarray
+        Interpolated values, shaped like xq (a row per query for matrix v)
+    
+    Examples:
+    ---------
+    >>> vq = interp1(x, v, xq)
+    >>> vq = interp1(x, v, xq, 'spline')
+    >>> vq = interp1(x, v, xq, 'linear', 'extrap')
+    >>> vq = interp1(x, v, xq, 'nearest', 0)
+    """
+    # Arrays first, then the method and the extrapolation
+    split = next((k for k, arg in enumerate(args) if isinstance(arg, str)), len(args))
+    args, options = list(args[:split]), list(args[split:])
+    if len(options) > 2:
+        raise ValueError("interp1 expects a method and an extrapolation option at most")
+    method = options[0] if options else 'linear'
+    if len(options) == 2:
+        extrapolation = options[1]
+    if len(args) == 2:
+        v, xq = args
+        v = np.asarray(v)
+        x = np.arange(1.0, (v.shape[0] if v.ndim > 1 else v.size) + 1)
+    elif len(args) == 3:
+        x, v, xq = args
+        v = np.asarray(v)
+    else:
+        raise ValueError("interp1 expects (x, v, xq) or (v, xq), then optional method")
+    if method not in _METHODS_1D:
+        raise ValueError(f"method must be one of {_METHODS_1D}")
+    
+    x = _grid_vector(x, 'interp1')
+    # Vectors interpolate as vectors; matrices column by column
+    if v.ndim == 2 and 1 in v.shape and v.size == x.size:
+        v = v.ravel()
+    if v.shape[0] != x.size:
+        raise ValueError("v must have one value (or row) per sample point")
+    [x], v = _sorted_grid([x], v, allow_unsorted=True)
+    
+    if extrapolation is None:
+        extrapolation = method if method in ('pchip', 'spline') else 'none'
+    elif extrapolation == 'extrap':
+        extrapolation = method
+    F = GriddedInterpolant([x], v, method, extrapolation)
+    return F(xq)
@@ -3,7 +3,9 @@ MATLAB-style matrix operation functions
 """
 
 import numpy as np
-from typing import Union, Tuple
+from typing import Any, Callable, Union, Tuple
+
+from .workspace import _is_sparse
 
 
 def size(A: np.ndarray, dim: Union[int, None] = None) -> Union[Tuple[int, ...], int]:
@@ -273,6 +275,149 @@ def cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     return np.cross(a, b)
 
 
+def _as_matrix(A: Any) -> np.ndarray:
+    """At least 2-D, with vectors as rows (MATLAB has no 1-D arrays)"""
+    return np.atleast_2d(np.asarray(A))
+
+
+def repmat(A: np.ndarray, *reps: Union[int, Tuple[int, ...]]) -> np.ndarray:
+    """
+    Repeat copies of an array
+    
+    Repeating along singleton dimensions (a row down, a column across, a
+    scalar anywhere) returns a read-only broadcast view holding one copy
+    of A; other dimensions are tiled. The interpreters turn the view into a
+    full array when a command writes into it.
+    
+    Parameters:
+    -----------
+    A : ndarray
+        Array to repeat (vectors count as rows)
+    *reps : int or sequence of int
+        repmat(A, n) - n x n tiling; repmat(A, m, n, ...) or
+        repmat(A, [m, n, ...]) - copies along each dimension
+    
+    Returns:
+    --------
+    ndarray
+        Array of size size(A) .* reps
+    
+    Examples:
+    ---------
+    >>> R = repmat(np.array([1, 2, 3]), 1000, 1)  # View: 1000 x 3, 24 bytes of data
+    >>> T = repmat(eye(2), 2, 3)  # 4 x 6
+    >>> Z = repmat(0, 3, 4)
+    """
+    if len(reps) == 1:
+        reps = tuple(np.ravel(reps[0]))
+        if len(reps) == 1:
+            reps = reps * 2
+    reps = tuple(int(r) for r in reps)
+    if len(reps) < 2 or any(r < 0 for r in reps):
+        raise ValueError("repmat expects non-negative repetition counts")
+    A = _as_matrix(A)
+    ndim = A.ndim if A.ndim > len(reps) else len(reps)
+    A = A.reshape(A.shape + (1,) * (ndim - A.ndim))
+    reps = reps + (1,) * (ndim - len(reps))
+    shape = tuple(n * r for n, r in zip(A.shape, reps))
+    
+    # Tile the non-singleton dimensions; broadcast the singleton ones
+    tiles = tuple(1 if n == 1 else r for n, r in zip(A.shape, reps))
+    if tiles != reps:
+        base = np.tile(A, tiles) if tiles != (1,) * ndim else A.copy()
+        return np.broadcast_to(base, shape)
+    return np.tile(A, reps)
+
+
+def kron(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Kronecker tensor product
+    
+    The products are written straight into the result, which is the only
+    allocation; sparse inputs give a sparse result instead of a dense one.
+    
+    Parameters:
+    -----------
+    A, B : ndarray or sparse matrix
+        Matrices (vectors count as rows)
+    
+    Returns:
+    --------
+    ndarray or sparse matrix
+        Block matrix [A[0,0]*B, A[0,1]*B, ...; ...] of size size(A) .* size(B)
+    
+    Examples:
+    ---------
+    >>> K = kron(eye(3), np.array([[1, 2], [3, 4]]))  # 6 x 6 block diagonal
+    """
+    if _is_sparse(A) or _is_sparse(B):
+        import scipy.sparse
+        return scipy.sparse.kron(A, B, format='csr')
+    A, B = _as_matrix(A), _as_matrix(B)
+    if A.ndim != 2 or B.ndim != 2:
+        return np.kron(A, B)
+    (p, q), (r, s) = A.shape, B.shape
+    result = np.multiply(A[:, None, :, None], B[None, :, None, :])
+    return result.reshape(p * r, q * s)
+
+
+# bsxfun function names (MATLAB function handles) and their numpy versions
+_BSXFUN_FUNCTIONS = {
+    'plus': np.add, 'minus': np.subtract, 'times': np.multiply,
+    'rdivide': np.divide, 'ldivide': lambda a, b: np.divide(b, a), 'power': np.power,
+    'max': np.maximum, 'min': np.minimum, 'rem': np.fmod, 'mod': np.mod,
+    'atan2': np.arctan2, 'hypot': np.hypot,
+    'eq': np.equal, 'ne': np.not_equal, 'lt': np.less, 'le': np.less_equal,
+    'gt': np.greater, 'ge': np.greater_equal,
+    'and': np.logical_and, 'or': np.logical_or, 'xor': np.logical_xor,
+}
+
+
+def bsxfun(fun: Union[str, Callable], A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Apply an element-wise binary operation with implicit expansion
+    
+    Singleton dimensions of A and B expand to match the other array by
+    broadcasting, so neither operand is replicated in memory (unlike
+    fun(repmat(A, ...), repmat(B, ...))). As in MATLAB, missing trailing
+    dimensions count as 1 and vectors count as rows.
+    
+    Parameters:
+    -----------
+    fun : str or callable
+        'plus', 'minus', 'times', 'rdivide', 'ldivide', 'power', 'max',
+        'min', 'rem', 'mod', 'atan2', 'hypot', 'eq', 'ne', 'lt', 'le',
+        'gt', 'ge', 'and', 'or', 'xor', or a function of two arrays that
+        broadcasts (np.add, lambda a, b: a * b + 1, ...)
+    A, B : ndarray
+        Operands; each dimension must match or be 1 in one of them
+    
+    Returns:
+    --------
+    ndarray
+        fun applied element by element over the expanded size
+    
+    Examples:
+    ---------
+    >>> A = rand(1000, 50)
+    >>> C = bsxfun('minus', A, mean(A, 0))  # Center the columns
+    >>> D = bsxfun(lambda a, b: (a - b) ** 2, x.T, y)  # Pairwise squared distances
+    """
+    if isinstance(fun, str):
+        if fun not in _BSXFUN_FUNCTIONS:
+            raise ValueError(f"Unknown bsxfun function '{fun}'")
+        fun = _BSXFUN_FUNCTIONS[fun]
+    A, B = _as_matrix(A), _as_matrix(B)
+    ndim = A.ndim if A.ndim > B.ndim else B.ndim
+    A = A.reshape(A.shape + (1,) * (ndim - A.ndim))
+    B = B.reshape(B.shape + (1,) * (ndim - B.ndim))
+    for a, b in zip(A.shape, B.shape):
+        if a != b and a != 1 and b != 1:
+            raise ValueError(f"Non-singleton dimensions of the inputs must match: "
+                             f"{A.shape} and {B.shape}")
+    return fun(A, B)
+
+
 def sum(A: np.ndarray, axis: Union[int, None] = None) -> Union[float, np.ndarray]:
     """
     Calculate sum
@@ -2,25 +2,126 @@
 MATLAB-style plotting functions
 """
 
+import atexit
+import io
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import warnings
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib.image
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LinearSegmentedColormap, LogNorm, Normalize, to_rgba
 from matplotlib.legend import Legend
-from typing import Optional, Union, List
+from matplotlib.ticker import MaxNLocator
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Union, List, Tuple
 
+from .workspace import _format_bytes, _is_sparse
 
-# Global figure counter
-_figure_counter = 0
 
+# figure() closes the least recently used figures beyond this many
+_max_open_figures = 20
 
-def figure(num: Optional[int] = None, figsize: Optional[tuple] = None) -> plt.Figure:
+# Figure numbers in the order figure() last made them current, most recent last
+_figure_order = OrderedDict()
+
+# Axes with hold off: plot() replaces their contents
+_hold_off_axes = weakref.WeakSet()
+
+# Lines with more points than this are decimated to the axes' pixel width
+_decimate_min_points = 20000
+
+# Matrices with at least this many columns are drawn as one LineCollection
+_collection_min_lines = 100
+
+# Decimated lines -> their full (x, y) data; x is None for plot(y)
+_decimated_lines = weakref.WeakKeyDictionary()
+
+# Axes callback registries that already re-decimate on xlim_changed
+_decimation_registries = weakref.WeakSet()
+
+_LINESTYLES = ('--', '-.', '-', ':')
+_MARKERS = set('.,ov^<>1234sp*hH+xDd|_P8X')
+
+
+class FigureInfo(NamedTuple):
+    """Memory information about one open figure"""
+    number: int
+    axes: int
+    artists: int
+    data_bytes: int
+    canvas_bytes: int
+
+
+class FigureMemory(list):
+    """Result of figmemory(): a list of FigureInfo records"""
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(info.data_bytes + info.canvas_bytes for info in self)
+    
+    def __str__(self) -> str:
+        lines = [f"{'Figure':>6} {'Axes':>5} {'Artists':>8} {'Data':>12} {'Canvas':>12}",
+                 "-" * 47]
+        for info in self:
+            lines.append(f"{info.number:>6} {info.axes:>5} {info.artists:>8} "
+                         f"{_format_bytes(info.data_bytes):>12} {_format_bytes(info.canvas_bytes):>12}")
+        lines.append("")
+        lines.append(f"Total: {len(self)} figures (limit {_max_open_figures}), "
+                     f"{_format_bytes(self.total_bytes)}")
+        return "\n".join(lines)
+    
+    def __repr__(self) -> str:
+        return f"<FigureMemory: {len(self)} figures, {_format_bytes(self.total_bytes)}>"
+
+
+def _figures_by_use() -> List[int]:
+    """Open figure numbers, least recently used first"""
+    open_nums = plt.get_fignums()
+    for num in [num for num in _figure_order if num not in open_nums]:
+        del _figure_order[num]
+    # Figures opened by pyplot directly count as older than ours, but the
+    # current figure is the most recently used whoever made it current
+    for num in open_nums:
+        if num not in _figure_order:
+            _figure_order[num] = None
+            _figure_order.move_to_end(num, last=False)
+    if open_nums:
+        _figure_order.move_to_end(plt.gcf().number)
+    return list(_figure_order)
+
+
+def _close_lru_figures(keep: int) -> None:
+    """Close least recently used figures until at most keep remain open"""
+    nums = _figures_by_use()
+    for num in nums[:max(len(nums) - max(keep, 0), 0)]:
+        plt.close(num)
+        del _figure_order[num]
+
+
+def figure(num: Optional[int] = None, figsize: Optional[tuple] = None,
+           clear: bool = False) -> plt.Figure:
     """
-    Create a new figure window
+    Create a new figure window or make an existing one current
+    
+    New figures get the lowest unused number, as in MATLAB. Opening more
+    than maxfigures() figures closes the least recently used ones, so
+    loops calling figure() do not leak figures.
     
     Parameters:
     -----------
     num : int, optional
-        figure number
+        figure number; an open figure with this number is reused
     figsize : tuple, optional
         figure size (width, height)
+    clear : bool, optional
+        Clear a reused figure (default: False)
     
     Returns:
     --------
@@ -31,20 +132,384 @@ def figure(num: Optional[int] = None, figsize: Optional[tuple] = None) -> plt.Fi
     ---------
     >>> figure()
     >>> figure(1)
+    >>> figure(1, clear=True)
     >>> figure(figsize=(10, 6))
     """
-    global _figure_counter
+    open_nums = plt.get_fignums()
     if num is None:
-        _figure_counter += 1
-        num = _figure_counter
+        num = next(n for n in range(1, len(open_nums) + 2) if n not in open_nums)
+    if num not in open_nums:
+        _close_lru_figures(_max_open_figures - 1)
+    
+    fig = plt.figure(num, figsize=figsize, clear=clear)
+    _figures_by_use()
+    _figure_order.move_to_end(fig.number)
+    if figsize is not None and tuple(fig.get_size_inches()) != tuple(figsize):
+        fig.set_size_inches(figsize)
+    return fig
+
+
+def maxfigures(limit: Optional[float] = None) -> float:
+    """
+    Get or set the maximum number of open figures
+    
+    Parameters:
+    -----------
+    limit : int, optional
+        New limit (float('inf') for no limit); figures beyond it are
+        closed, least recently used first
     
-    return plt.figure(num, figsize=figsize)
+    Returns:
+    --------
+    int
+        The limit in effect
+    
+    Examples:
+    ---------
+    >>> maxfigures()
+    20
+    >>> maxfigures(5)
+    """
+    global _max_open_figures
+    if limit is not None:
+        if limit < 1:
+            raise ValueError("The figure limit must be at least 1")
+        _max_open_figures = limit
+        _close_lru_figures(limit)
+    return _max_open_figures
+
+
+def _artist_bytes(artist: Any) -> int:
+    """Bytes of array data held by an artist"""
+    arrays = []
+    if isinstance(artist, plt.Line2D):
+        arrays += [artist.get_xdata(orig=True), artist.get_ydata(orig=True),
+                   getattr(artist, '_xy', None)]
+        arrays += list(_decimated_lines.get(artist, ()))
+    elif hasattr(artist, 'get_paths') and hasattr(artist, 'get_offsets'):
+        arrays += [path.vertices for path in artist.get_paths()]
+        arrays += [artist.get_offsets(), artist.get_array()]
+    elif hasattr(artist, 'get_array'):
+        arrays.append(artist.get_array())
+    return int(np.sum([a.nbytes for a in arrays if isinstance(a, np.ndarray)]))
+
+
+def _open_figures() -> List[Tuple[int, plt.Figure]]:
+    """(number, figure) of the open figures, leaving the current figure current"""
+    nums = plt.get_fignums()
+    if not nums:
+        return []
+    current = plt.gcf()
+    figures = [(num, plt.figure(num)) for num in nums]
+    plt.figure(current)
+    return figures
+
+
+def figmemory(verbose: bool = True) -> FigureMemory:
+    """
+    Report the memory held by open figures
+    
+    Data bytes count the arrays of lines, collections and images (with the
+    full data kept for decimated and animated lines); canvas bytes count
+    the rendered pixel buffer and cached blitting backgrounds.
+    
+    Parameters:
+    -----------
+    verbose : bool, optional
+        Print the table (default: True)
+    
+    Returns:
+    --------
+    FigureMemory
+        List of FigureInfo records with a total_bytes property
+    
+    Examples:
+    ---------
+    >>> figmemory()
+    >>> info = figmemory(verbose=False)
+    >>> info.total_bytes
+    """
+    info = FigureMemory()
+    for num, fig in _open_figures():
+        artists = data = canvas = 0
+        for ax in fig.axes:
+            for artist in ax.get_children():
+                artists += 1
+                data += _artist_bytes(artist)
+            data += sum(h._buffer.nbytes for h in _animated_lines.get(ax, ()))
+            if ax in _blit_backgrounds:
+                width, height = ax.bbox.size
+                canvas += int(width) * int(height) * 4
+        renderer = getattr(fig.canvas, 'renderer', None)
+        if renderer is not None:
+            canvas += int(renderer.width) * int(renderer.height) * 4
+        info.append(FigureInfo(num, len(fig.axes), artists, data, canvas))
+    if verbose:
+        if info:
+            print(info)
+        else:
+            print("No open figures.")
+    return info
+
 
+def _split_plot_args(args: tuple) -> List[list]:
+    """Split plot() arguments into [x, y, fmt] groups (x/fmt may be None)"""
+    groups = []
+    i = 0
+    while i < len(args):
+        if i + 1 < len(args) and not isinstance(args[i + 1], str):
+            x, y = args[i], args[i + 1]
+            i += 2
+        else:
+            x, y = None, args[i]
+            i += 1
+        fmt = None
+        if i < len(args) and isinstance(args[i], str):
+            fmt = args[i]
+            i += 1
+        groups.append([x, y, fmt])
+    return groups
 
-def plot(*args, **kwargs) -> List[plt.Line2D]:
+
+def _parse_format(fmt: Optional[str]) -> Tuple[Optional[str], Optional[str], Any]:
+    """
+    (linestyle, marker, color) of a MATLAB format string such as 'r--' or
+    'ko', following plot()'s rules: an unspecified linestyle or marker is
+    'None' unless neither is given
+    """
+    if not fmt:
+        return None, None, None
+    if fmt not in ('0', '1'):
+        try:
+            return None, None, to_rgba(fmt)
+        except ValueError:
+            pass
+    linestyle = marker = color = None
+    i = 0
+    while i < len(fmt):
+        style = next((s for s in _LINESTYLES if fmt.startswith(s, i)), None)
+        if style is not None:
+            linestyle = style
+            i += len(style)
+        elif fmt[i] in _MARKERS:
+            marker = fmt[i]
+            i += 1
+        elif fmt[i] == 'C' and fmt[i + 1:i + 2].isdigit():
+            j = i + 1
+            while j < len(fmt) and fmt[j].isdigit():
+                j += 1
+            color = to_rgba(fmt[i:j])
+            i = j
+        elif fmt[i] in 'bgrcmykw':
+            color = fmt[i]
+            i += 1
+        else:
+            raise ValueError(f"{fmt!r} is not a valid format string")
+    if linestyle is None and marker is None:
+        linestyle = plt.rcParams['lines.linestyle']
+    return linestyle or 'None', marker or 'None', color
+
+
+def _next_colors(ax: plt.Axes, n: int = 1) -> list:
+    """
+    The next n colors of the axes' color cycle, advancing it as n plotted
+    lines would (through a temporary empty line, with public API only)
+    """
+    def advance() -> Any:
+        probe = ax.plot([], [])[0]
+        color = probe.get_color()
+        probe.remove()
+        return color
+    
+    first = advance()
+    cycle = plt.rcParams['axes.prop_cycle'].by_key().get('color', [])
+    if n == 1 or first not in cycle:
+        return [first] + [advance() for _ in range(n - 1)]
+    start = cycle.index(first)
+    colors = [cycle[(start + k) % len(cycle)] for k in range(n)]
+    for _ in range((n - 1) % len(cycle)):
+        advance()
+    return colors
+
+
+def _has_markers(fmt: Optional[str], kwargs: dict) -> bool:
+    if kwargs.get('marker') not in (None, '', 'None', ' '):
+        return True
+    if fmt is None:
+        return False
+    for style in _LINESTYLES:
+        fmt = fmt.replace(style, '')
+    return bool(_MARKERS & set(fmt))
+
+
+def _minmax_indices(x: Optional[np.ndarray], y: np.ndarray, lo: float, hi: float,
+                    nbins: int) -> np.ndarray:
+    """
+    Indices of the points needed to draw y over [lo, hi] at nbins pixels
+    
+    For each pixel column this keeps the first, last, minimum and maximum
+    sample, which rasterizes identically to the full line. One sample past
+    each edge is kept so the line runs off the axes correctly.
+    """
+    n = len(y)
+    if x is None:
+        start = int(np.clip(np.floor(lo), 0, n))
+        stop = int(np.clip(np.ceil(hi) + 1, 0, n))
+    else:
+        start = int(np.searchsorted(x, lo, 'left'))
+        stop = int(np.searchsorted(x, hi, 'right'))
+    start, stop = max(start - 1, 0), min(stop + 1, n)
+    if stop - start <= 4 * nbins:
+        return np.arange(start, stop)
+    
+    segment = y[start:stop]
+    if x is None:
+        edges = np.linspace(0, stop - start, nbins + 1).astype(np.intp)
+    else:
+        edges = np.searchsorted(x[start:stop], np.linspace(x[start], x[stop - 1], nbins + 1))
+    edges[-1] = stop - start
+    bounds = np.unique(edges)
+    
+    # Work through the bins a chunk at a time to bound temporary memory
+    picks = []
+    b = 0
+    while b < len(bounds) - 1:
+        e = int(np.searchsorted(bounds, bounds[b] + (1 << 20), 'right')) - 1
+        e = min(max(e, b + 1), len(bounds) - 1)
+        offset = bounds[b]
+        chunk = segment[offset:bounds[e]]
+        starts = bounds[b:e] - offset
+        counts = np.diff(bounds[b:e + 1])
+        columns = [starts, starts + counts - 1]
+        for reduce in (np.fmin, np.fmax):
+            extreme = np.repeat(reduce.reduceat(chunk, starts), counts)
+            hits = np.flatnonzero(chunk == extreme)
+            if len(hits) == 0:
+                continue
+            first = hits[np.minimum(np.searchsorted(hits, starts), len(hits) - 1)]
+            # Bins that are all NaN have no hit of their own
+            columns.append(np.where((first >= starts) & (first < starts + counts), first, starts))
+        picks.append(np.stack(columns, axis=1).ravel() + offset)
+        b = e
+    return np.unique(np.concatenate(picks)) + start
+
+
+def _decimate(line: plt.Line2D, scale: float = 1.0) -> None:
+    """Re-decimate a line from its full data for the current view"""
+    x, y = _decimated_lines[line]
+    ax = line.axes
+    lo, hi = sorted(ax.get_xlim())
+    nbins = max(int(ax.get_window_extent().width * scale), 1)
+    idx = _minmax_indices(x, y, lo, hi, nbins)
+    line.set_data(idx if x is None else x[idx], y[idx])
+
+
+def _on_xlim_changed(ax: plt.Axes) -> None:
+    for line in list(ax.get_lines()):
+        if line in _decimated_lines:
+            _decimate(line)
+
+
+def _plot_group(ax: plt.Axes, x: Any, y: Any, fmt: Optional[str],
+                decimate: Optional[bool], density: Optional[bool], kwargs: dict) -> list:
+    """Plot one x, y, fmt group, decimating, batching or binning it when worthwhile"""
+    data = ([] if x is None else [x]) + [y] + ([fmt] if fmt else [])
+    if _has_markers(fmt, kwargs):
+        kwargs = dict(kwargs)
+        cmap = kwargs.pop('cmap', None)
+        n = np.size(y)
+        linestyle, marker, color = _parse_format(fmt)
+        linestyle = kwargs.get('linestyle', kwargs.get('ls', linestyle))
+        marker = kwargs.get('marker', marker)
+        if (density is not False and np.ndim(y) == 1 and marker in ('.', ',')
+                and linestyle in ('None', 'none', '', ' ')
+                and n > (0 if density else _density_min_points)):
+            x = np.arange(n) if x is None else x
+            color = kwargs.pop('color', kwargs.pop('c', color)) or _next_colors(ax)[0]
+            if cmap is None:
+                # Shades of the marker color, fading out where points are sparse
+                cmap = LinearSegmentedColormap.from_list(
+                    'density', [to_rgba(color, 0.3), to_rgba(color, 1.0)])
+            for key in ('marker', 'markersize', 'ms', 'markerfacecolor', 'mfc',
+                        'markeredgecolor', 'mec', 'linestyle', 'ls'):
+                kwargs.pop(key, None)
+            return [_density_image(ax, x, y, None, cmap, None, kwargs)]
+        if n >= _rasterize_min_points:
+            kwargs.setdefault('rasterized', True)
+        return ax.plot(*data, **kwargs)
+    
+    y = np.asarray(y)
+    if y.ndim == 2 and y.shape[1] >= _collection_min_lines and y.dtype.kind in 'biuf':
+        return [_line_collection(ax, x, y, fmt, kwargs)]
+    
+    if (decimate is False or y.ndim != 1 or y.dtype.kind not in 'biuf'
+            or len(y) <= (0 if decimate else _decimate_min_points)):
+        return ax.plot(*data, **kwargs)
+    if x is not None:
+        x = np.asarray(x)
+        if x.shape != y.shape or x.dtype.kind not in 'biuf' or np.any(x[1:] < x[:-1]):
+            return ax.plot(*data, **kwargs)
+    
+    nbins = max(int(ax.get_window_extent().width), 1)
+    idx = _minmax_indices(x, y, 0 if x is None else x[0],
+                          len(y) - 1 if x is None else x[-1], nbins)
+    lines = ax.plot(idx if x is None else x[idx], y[idx], *([fmt] if fmt else []), **kwargs)
+    _decimated_lines[lines[0]] = (x, y)
+    if ax.callbacks not in _decimation_registries:
+        ax.callbacks.connect('xlim_changed', _on_xlim_changed)
+        _decimation_registries.add(ax.callbacks)
+    return lines
+
+
+def _line_collection(ax: plt.Axes, x: Any, Y: np.ndarray, fmt: Optional[str],
+                     kwargs: dict) -> LineCollection:
+    """Draw the columns of Y as a single LineCollection"""
+    nrows, ncols = Y.shape
+    segments = np.empty((ncols, nrows, 2))
+    if x is None:
+        segments[:, :, 0] = np.arange(nrows)
+    else:
+        x = np.asarray(x)
+        segments[:, :, 0] = x.T if x.ndim == 2 else x
+    segments[:, :, 1] = Y.T
+    
+    kwargs = dict(kwargs)
+    linestyle, _, color = _parse_format(fmt)
+    color = kwargs.pop('color', kwargs.pop('c', color))
+    if color is None:
+        # One color per column, continuing the axes' color cycle like lines do
+        color = _next_colors(ax, ncols)
+    linestyle = kwargs.pop('linestyle', kwargs.pop('ls', linestyle))
+    collection = LineCollection(segments, colors=color,
+                                linestyles=linestyle or plt.rcParams['lines.linestyle'],
+                                linewidths=kwargs.pop('linewidth', kwargs.pop(
+                                    'lw', plt.rcParams['lines.linewidth'])),
+                                **kwargs)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    return collection
+
+
+def plot(*args, decimate: Optional[bool] = None, density: Optional[bool] = None,
+         **kwargs) -> List[plt.Line2D]:
     """
     Plot line graph
     
+    Very long lines (more than 20000 points, with increasing x and no
+    markers) are decimated to the axes' pixel width: each pixel column
+    keeps its first, last, minimum and maximum sample, so the rendering is
+    visually identical. Zooming or panning re-decimates from the full data.
+    
+    A matrix y with 100 or more columns is drawn as a single LineCollection
+    with one color per column instead of one Line2D per column; it appears
+    as one legend entry.
+    
+    Point plots of more than 100000 points (plot(x, y, '.') or ',') are
+    drawn as a density image: points are counted per pixel and shown in
+    shades of the marker color, with the axis limits the markers would
+    have had. Smaller marker plots of 10000 points or more are rasterized
+    when saved to vector formats.
+    
     Parameters:
     -----------
     *args : 
@@ -52,12 +517,18 @@ def plot(*args, **kwargs) -> List[plt.Line2D]:
         plot(y)
         plot(x, y)
         plot(x, y, 'style')
+    decimate : bool, optional
+        Force (True) or disable (False) decimation of long lines
+    density : bool, optional
+        Force (True) or disable (False) density rendering of marker plots
     **kwargs : 
-        Additional plot options (linewidth, color, label, etc.)
+        Additional plot options (linewidth, color, label, etc.; cmap for
+        density images)
     
     Returns:
     --------
-    list of Line2D
+    list of Line2D (or LineCollection for wide matrices, AxesImage for
+    density images)
         Created line objects
     
     Examples:
@@ -66,8 +537,768 @@ def plot(*args, **kwargs) -> List[plt.Line2D]:
     >>> plot(x, y)
     >>> plot(x, y, 'r-')
     >>> plot(x, y, 'b--', linewidth=2)
+    >>> plot(t, signal, decimate=False)
+    >>> plot(t, paths, 'b-', label='Monte Carlo')  # paths: 1000 columns
+    >>> plot(x, y, 'k.')  # 10 million points: density image
+    """
+    ax = plt.gca()
+    if ax in _hold_off_axes:
+        _replace_children(ax)
+    if 'data' in kwargs:
+        return plt.plot(*args, **kwargs)
+    
+    artists = []
+    for x, y, fmt in _split_plot_args(args):
+        artists.extend(_plot_group(ax, x, y, fmt, decimate, density, kwargs))
+    return artists
+
+
+def _block_mean(Z: Any, fy: int, fx: int) -> np.ndarray:
+    """Average fy x fx blocks of a 2-D array (edge blocks may be smaller), ignoring NaNs"""
+    Z = np.asarray(Z, dtype=float)
+    if fy == 1 and fx == 1:
+        return Z
+    shape = Z.shape
+    weights = np.isfinite(Z)
+    if weights.all():
+        weights = None
+    else:
+        Z = np.where(weights, Z, 0.0)
+        weights = weights.astype(float)
+    for axis, f in ((0, fy), (1, fx)):
+        if f > 1:
+            starts = np.arange(0, shape[axis], f)
+            Z = np.add.reduceat(Z, starts, axis=axis)
+            if weights is not None:
+                weights = np.add.reduceat(weights, starts, axis=axis)
+    if weights is None:
+        rows = np.diff(np.append(np.arange(0, shape[0], fy), shape[0]))
+        cols = np.diff(np.append(np.arange(0, shape[1], fx), shape[1]))
+        weights = np.outer(rows, cols)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return Z / weights
+
+
+def _grid_factors(shape: tuple, ax: plt.Axes, density: float = 1.0) -> Tuple[int, int]:
+    """Block sizes that reduce a grid to about density points per axes pixel"""
+    width, height = ax.get_window_extent().size
+    fy = max(int(np.ceil(shape[0] / max(height * density, 1))), 1)
+    fx = max(int(np.ceil(shape[1] / max(width * density, 1))), 1)
+    return fy, fx
+
+
+def _grid_args(args: tuple, name: str) -> Tuple[Any, Any, np.ndarray, list]:
+    """Split (Z, ...) or (X, Y, Z, ...) arguments into X, Y, Z and the rest"""
+    arrays = []
+    rest = list(args)
+    while rest and len(arrays) < 3 and np.ndim(rest[0]) >= 1 and not isinstance(rest[0], str):
+        if len(arrays) == 1 and np.ndim(rest[0]) < 2 and np.ndim(arrays[0]) == 2:
+            break  # Z followed by levels
+        arrays.append(rest.pop(0))
+    if len(arrays) == 1:
+        Z = np.asarray(arrays[0])
+        X, Y = None, None
+    elif len(arrays) == 3:
+        X, Y, Z = arrays[0], arrays[1], np.asarray(arrays[2])
+    else:
+        raise ValueError(f"{name} expects Z or X, Y, Z")
+    if Z.ndim != 2:
+        raise ValueError(f"{name} expects a 2-D Z")
+    return X, Y, Z, rest
+
+
+def _reduce_grid(X: Any, Y: Any, Z: np.ndarray, fy: int, fx: int) -> Tuple[np.ndarray, ...]:
+    """Block-average Z and its coordinates (vectors or meshgrid matrices)"""
+    m, n = Z.shape
+    if X is None:
+        X, Y = np.arange(1, n + 1), np.arange(1, m + 1)
+    X, Y = np.asarray(X, dtype=float), np.asarray(Y, dtype=float)
+    if X.ndim == 1:
+        X = _block_mean(X[np.newaxis, :], 1, fx)[0]
+    else:
+        X = _block_mean(X, fy, fx)
+    if Y.ndim == 1:
+        Y = _block_mean(Y[:, np.newaxis], fy, 1)[:, 0]
+    else:
+        Y = _block_mean(Y, fy, fx)
+    return X, Y, _block_mean(Z, fy, fx)
+
+
+# Downsampled images -> (full data, cell edges x0, x1, y0, y1)
+_downsampled_images = weakref.WeakKeyDictionary()
+
+# Axes callback registries that already re-sample images on zoom
+_image_registries = weakref.WeakSet()
+
+
+def _resample_image(image: Any) -> None:
+    """Re-sample a downsampled image from its full data for the current view"""
+    C, (x0, x1, y0, y1) = _downsampled_images[image]
+    ax = image.axes
+    m, n = C.shape
+    dx, dy = (x1 - x0) / n, (y1 - y0) / m
+    
+    # Visible cell range, one cell of margin on each side
+    xlo, xhi = sorted(ax.get_xlim())
+    ylo, yhi = sorted(ax.get_ylim())
+    j0 = int(np.clip(np.floor((xlo - x0) / dx) - 1, 0, n - 1))
+    j1 = int(np.clip(np.ceil((xhi - x0) / dx) + 1, j0 + 1, n))
+    i0 = int(np.clip(np.floor((ylo - y0) / dy) - 1, 0, m - 1))
+    i1 = int(np.clip(np.ceil((yhi - y0) / dy) + 1, i0 + 1, m))
+    fy, fx = _grid_factors((i1 - i0, j1 - j0), ax)
+    image.set_data(_block_mean(C[i0:i1, j0:j1], fy, fx))
+    
+    # Rows run downwards, as in MATLAB
+    _set_partial_extent(image, (x0 + j0 * dx, x0 + j1 * dx, y0 + i1 * dy, y0 + i0 * dy))
+    image.sticky_edges.x[:] = sorted((x0, x1))
+    image.sticky_edges.y[:] = sorted((y0, y1))
+
+
+def _set_partial_extent(image: Any, extent: tuple) -> None:
+    """
+    Move an image that shows only part of its data
+    
+    set_extent would otherwise autoscale the axes to that part (and so
+    trigger the limit callbacks again).
+    """
+    ax = image.axes
+    auto = ax.get_autoscalex_on(), ax.get_autoscaley_on()
+    ax.set_autoscale_on(False)
+    try:
+        image.set_extent(extent)
+    finally:
+        ax.set_autoscalex_on(auto[0])
+        ax.set_autoscaley_on(auto[1])
+
+
+def _on_lim_changed(ax: plt.Axes) -> None:
+    for image in list(ax.get_images()):
+        if image in _downsampled_images:
+            _resample_image(image)
+        elif image in _density_images:
+            _rebin_density(image)
+        elif image in _spy_images:
+            _rebin_spy(image)
+
+
+def _connect_image_callbacks(ax: plt.Axes) -> None:
+    if ax.callbacks not in _image_registries:
+        ax.callbacks.connect('xlim_changed', _on_lim_changed)
+        ax.callbacks.connect('ylim_changed', _on_lim_changed)
+        _image_registries.add(ax.callbacks)
+
+
+def imagesc(*args, downsample: bool = True, **kwargs) -> Any:
+    """
+    Display a matrix as a scaled-color image
+    
+    The matrix is drawn as a single image whose colors span the data range
+    (or clims). Matrices larger than the axes are block-averaged to the
+    display resolution; zooming re-samples from the full data. Rows run
+    downwards and the axes fill the available space, as in MATLAB.
+    
+    Parameters:
+    -----------
+    *args : 
+        imagesc(C)
+        imagesc(x, y, C) - x, y give the centers of the first and last
+        columns/rows (only their ends are used)
+        imagesc(..., clims) - (cmin, cmax) color limits
+    downsample : bool, optional
+        Block-average large matrices to the axes' pixel size (default: True)
+    **kwargs : 
+        Additional imshow options (cmap, interpolation, etc.)
+    
+    Returns:
+    --------
+    AxesImage
+        The image artist
+    
+    Examples:
+    ---------
+    >>> imagesc(C)
+    >>> imagesc(x, y, C, (0, 1))
+    >>> imagesc(C, cmap='gray')
+    """
+    args = list(args)
+    clims = None
+    if len(args) in (2, 4) and np.ndim(args[-1]) == 1 and len(args[-1]) == 2:
+        clims = tuple(args.pop())
+    if len(args) == 1:
+        C = np.asarray(args[0])
+        m, n = C.shape
+        x, y = (1, n), (1, m)
+    elif len(args) == 3:
+        C = np.asarray(args[2])
+        m, n = C.shape
+        x, y = np.ravel(args[0]), np.ravel(args[1])
+        x, y = (x[0], x[-1]), (y[0], y[-1])
+    else:
+        raise ValueError("imagesc expects C, (x, y, C) and optional clims")
+    if C.ndim != 2:
+        raise ValueError("imagesc expects a 2-D matrix")
+    
+    # Cell edges around the given centers
+    dx = (x[1] - x[0]) / (n - 1) if n > 1 else 1.0
+    dy = (y[1] - y[0]) / (m - 1) if m > 1 else 1.0
+    edges = (x[0] - dx / 2, x[1] + dx / 2, y[0] - dy / 2, y[1] + dy / 2)
+    numeric = C.dtype.kind in 'biuf'
+    if clims is None and numeric and C.size:
+        # From the full data, so downsampling does not change the colors
+        clims = (np.nanmin(C), np.nanmax(C))
+    vmin, vmax = clims if clims is not None else (None, None)
+    
+    ax = plt.gca()
+    if ax in _hold_off_axes:
+        _replace_children(ax)
+    fy, fx = _grid_factors(C.shape, ax) if downsample and numeric else (1, 1)
+    kwargs.setdefault('aspect', 'auto')
+    kwargs.setdefault('interpolation', 'nearest')
+    image = ax.imshow(_block_mean(C, fy, fx) if fy > 1 or fx > 1 else C,
+                      extent=(edges[0], edges[1], edges[3], edges[2]),
+                      vmin=vmin, vmax=vmax, origin='upper', **kwargs)
+    
+    if fy > 1 or fx > 1:
+        _downsampled_images[image] = (C, edges)
+        _connect_image_callbacks(ax)
+    return image
+
+
+# Marker plots with more points than this are drawn as density images
+_density_min_points = 100000
+
+# Marker layers with at least this many points are rasterized in vector files
+_rasterize_min_points = 10000
+
+# Density images -> (x, y, c, data bounds) they bin; c is None for counts
+_density_images = weakref.WeakKeyDictionary()
+
+
+def _bin_density(x: np.ndarray, y: np.ndarray, c: Optional[np.ndarray], bounds: tuple,
+                 shape: Tuple[int, int]) -> np.ma.MaskedArray:
+    """
+    Count points (or average c) per bin of a shape grid over bounds
+    
+    Empty bins are masked so they stay transparent.
+    """
+    x0, x1, y0, y1 = bounds
+    ny, nx = shape
+    sx = nx / (x1 - x0) if x1 > x0 else 0.0
+    sy = ny / (y1 - y0) if y1 > y0 else 0.0
+    counts = np.zeros(nx * ny)
+    sums = np.zeros(nx * ny) if c is not None else None
+    
+    # Work through the points a chunk at a time to bound temporary memory
+    step = 1 << 20
+    for start in range(0, len(x), step):
+        xs, ys = x[start:start + step], y[start:start + step]
+        inside = (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+        cs = None if c is None else c[start:start + step]
+        if not inside.all():
+            xs, ys = xs[inside], ys[inside]
+            cs = None if cs is None else cs[inside]
+        ix = np.minimum(((xs - x0) * sx).astype(np.intp), nx - 1)
+        iy = np.minimum(((ys - y0) * sy).astype(np.intp), ny - 1)
+        flat = iy * nx + ix
+        counts += np.bincount(flat, minlength=nx * ny)
+        if sums is not None:
+            sums += np.bincount(flat, weights=cs, minlength=nx * ny)
+    
+    if sums is None:
+        return np.ma.masked_equal(counts.reshape(ny, nx), 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.ma.masked_invalid((sums / counts).reshape(ny, nx))
+
+
+def _density_image(ax: plt.Axes, x: Any, y: Any, c: Optional[Any], cmap: Any,
+                   norm: Any, kwargs: dict) -> Any:
+    """Draw points as an image of per-pixel counts (or mean c values)"""
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    if c is not None:
+        c = np.asarray(c, dtype=float).ravel()
+    bounds = (np.nanmin(x), np.nanmax(x), np.nanmin(y), np.nanmax(y))
+    width, height = ax.get_window_extent().size
+    data = _bin_density(x, y, c, bounds, (max(int(height), 1), max(int(width), 1)))
+    if norm is None:
+        # Counts span decades; mean values keep the color range of all points
+        norm = LogNorm(vmin=1) if c is None else Normalize(np.nanmin(c), np.nanmax(c))
+    
+    kwargs.setdefault('interpolation', 'nearest')
+    image = ax.imshow(data, extent=bounds, origin='lower', aspect='auto', cmap=cmap,
+                      norm=norm, **kwargs)
+    
+    # Markers have no sticky edges: autoscale with the usual margins so the
+    # limits match what the markers would have produced
+    image.sticky_edges.x[:] = []
+    image.sticky_edges.y[:] = []
+    ax.autoscale_view()
+    _density_images[image] = (x, y, c, bounds)
+    _connect_image_callbacks(ax)
+    return image
+
+
+def _rebin_density(image: Any) -> None:
+    """Re-bin a density image for the visible part of its data"""
+    x, y, c, (x0, x1, y0, y1) = _density_images[image]
+    ax = image.axes
+    xlo, xhi = sorted(ax.get_xlim())
+    ylo, yhi = sorted(ax.get_ylim())
+    bounds = (max(x0, xlo), min(x1, xhi), max(y0, ylo), min(y1, yhi))
+    if bounds[0] > bounds[1] or bounds[2] > bounds[3]:
+        return
+    width, height = ax.get_window_extent().size
+    image.set_data(_bin_density(x, y, c, bounds, (max(int(height), 1), max(int(width), 1))))
+    _set_partial_extent(image, bounds)
+    image.sticky_edges.x[:] = []
+    image.sticky_edges.y[:] = []
+
+
+def scatter(x: Any, y: Any, *args, density: Optional[bool] = None, **kwargs) -> Any:
+    """
+    Scatter plot
+    
+    More than 100000 points are drawn as a density image instead of
+    markers: points are counted per pixel (or, with per-point colors c,
+    their c values are averaged per pixel) and mapped through the
+    colormap. The axis limits are those the markers would have had.
+    Marker layers of 10000 points or more are rasterized when saved to
+    vector formats (PDF, SVG, EPS).
+    
+    Parameters:
+    -----------
+    x, y : array
+        Point coordinates
+    *args : 
+        scatter(x, y, sz) - marker size(s) in points^2
+        scatter(x, y, sz, c) - color or per-point values mapped by cmap
+        scatter(..., 'filled') - accepted for MATLAB compatibility
+        scatter(..., marker) - marker symbol ('o', 's', '^', etc.)
+    density : bool, optional
+        Force (True) or disable (False) density rendering
+    **kwargs : 
+        Additional scatter options (cmap, norm, alpha, label, etc.)
+    
+    Returns:
+    --------
+    PathCollection or AxesImage
+        The markers, or the density image
+    
+    Examples:
+    ---------
+    >>> scatter(x, y)
+    >>> scatter(x, y, 10, z, cmap='jet')
+    >>> scatter(x, y, 20, 'r', 'filled')
+    >>> scatter(xs, ys, cmap='magma')  # 10 million points: density image
+    """
+    # A string right after sz is a color; other strings are options
+    values = []
+    for i, arg in enumerate(args):
+        if isinstance(arg, str) and not (i == 1 and not isinstance(args[0], str)):
+            if arg.lower() != 'filled':
+                kwargs['marker'] = arg
+        else:
+            values.append(arg)
+    sz = values[0] if len(values) > 0 else kwargs.pop('s', None)
+    c = values[1] if len(values) > 1 else kwargs.pop('c', None)
+    
+    ax = plt.gca()
+    if ax in _hold_off_axes:
+        _replace_children(ax)
+    n = np.size(x)
+    if density is not False and n > (0 if density else _density_min_points):
+        per_point = c is not None and not isinstance(c, str) and np.size(c) == n
+        for key in ('marker', 'linewidths', 'edgecolors', 'facecolors'):
+            kwargs.pop(key, None)
+        cmap = kwargs.pop('cmap', plt.rcParams['image.cmap'])
+        return _density_image(ax, x, y, c if per_point else None, cmap,
+                              kwargs.pop('norm', None), kwargs)
+    
+    if n >= _rasterize_min_points:
+        kwargs.setdefault('rasterized', True)
+    return ax.scatter(x, y, s=sz, c=c, **kwargs)
+
+
+# spy images, mapped to the matrix they show
+_spy_images = weakref.WeakKeyDictionary()
+
+
+def _nonzero_chunks(A: Any, rows: Tuple[int, int], cols: Tuple[int, int],
+                    step: int = 1 << 20) -> Iterable[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (row, col) indices of the nonzeros of A within rows x cols
+    
+    A is a dense array or a CSR, CSC or COO matrix. About step entries are
+    handled at a time, so temporary memory stays bounded.
+    """
+    r0, r1 = rows
+    c0, c1 = cols
+    if _is_sparse(A) and A.format == 'coo':
+        for start in range(0, A.nnz, step):
+            i, j = A.row[start:start + step], A.col[start:start + step]
+            keep = (A.data[start:start + step] != 0) & (i >= r0) & (i < r1) & (j >= c0) & (j < c1)
+            yield i[keep], j[keep]
+    elif _is_sparse(A):
+        # Compressed rows (CSR) or columns (CSC): only the visible ones are read
+        csr = A.format == 'csr'
+        (k, stop), (lo, hi) = ((r0, r1), (c0, c1)) if csr else ((c0, c1), (r0, r1))
+        indptr = A.indptr
+        while k < stop:
+            end = int(np.searchsorted(indptr, indptr[k] + step, side='right')) - 1
+            end = min(max(end, k + 1), stop)
+            major = np.repeat(np.arange(k, end), np.diff(indptr[k:end + 1]))
+            minor = A.indices[indptr[k]:indptr[end]]
+            keep = (A.data[indptr[k]:indptr[end]] != 0) & (minor >= lo) & (minor < hi)
+            major, minor = major[keep], minor[keep]
+            yield (major, minor) if csr else (minor, major)
+            k = end
+    else:
+        rows_per_chunk = max(step // max(c1 - c0, 1), 1)
+        for start in range(r0, r1, rows_per_chunk):
+            i, j = np.nonzero(A[start:min(start + rows_per_chunk, r1), c0:c1])
+            yield i + start, j + c0
+
+
+def _bin_nonzeros(A: Any, rows: Tuple[int, int], cols: Tuple[int, int],
+                  shape: Tuple[int, int]) -> np.ma.MaskedArray:
+    """Count the nonzeros of A within rows x cols per bin of a shape grid"""
+    (r0, r1), (c0, c1) = rows, cols
+    ny, nx = shape
+    counts = np.zeros(ny * nx)
+    for i, j in _nonzero_chunks(A, rows, cols):
+        iy = (i - r0).astype(np.int64) * ny // (r1 - r0)
+        ix = (j - c0).astype(np.int64) * nx // (c1 - c0)
+        counts += np.bincount(iy * nx + ix, minlength=ny * nx)
+    return np.ma.masked_equal(counts.reshape(ny, nx), 0)
+
+
+def _spy_bins(ax: plt.Axes, rows: Tuple[int, int], cols: Tuple[int, int]) -> Tuple[int, int]:
+    width, height = ax.get_window_extent().size
+    return (max(min(rows[1] - rows[0], int(height)), 1),
+            max(min(cols[1] - cols[0], int(width)), 1))
+
+
+def _rebin_spy(image: Any) -> None:
+    """Re-bin a spy image for the visible rows and columns"""
+    A = _spy_images[image]
+    m, n = A.shape
+    ax = image.axes
+    
+    # Entry (i, j) covers [j + 0.5, j + 1.5] x [i + 0.5, i + 1.5]
+    xlo, xhi = sorted(ax.get_xlim())
+    ylo, yhi = sorted(ax.get_ylim())
+    c0 = int(np.clip(np.floor(xlo - 0.5), 0, n - 1))
+    c1 = int(np.clip(np.ceil(xhi - 0.5), c0 + 1, n))
+    r0 = int(np.clip(np.floor(ylo - 0.5), 0, m - 1))
+    r1 = int(np.clip(np.ceil(yhi - 0.5), r0 + 1, m))
+    image.set_data(_bin_nonzeros(A, (r0, r1), (c0, c1), _spy_bins(ax, (r0, r1), (c0, c1))))
+    _set_partial_extent(image, (c0 + 0.5, c1 + 0.5, r1 + 0.5, r0 + 0.5))
+    image.sticky_edges.x[:] = []
+    image.sticky_edges.y[:] = []
+
+
+def spy(A: Any, *args, density: Optional[bool] = None, **kwargs) -> Any:
+    """
+    Plot the sparsity pattern of a matrix
+    
+    Works from the nonzero coordinates of sparse matrices (scipy.sparse)
+    and from dense arrays a block of rows at a time, so the matrix is never
+    densified. Above 100000 nonzeros the pattern is drawn as an image of
+    nonzero counts per pixel, re-binned from the matrix on zoom; only the
+    visible rows are read for CSR matrices (columns for CSC).
+    
+    Parameters:
+    -----------
+    A : array or sparse matrix
+        Matrix whose nonzeros are shown
+    *args : 
+        spy(A, fmt) - marker style and color (default '.')
+        spy(A, fmt, markersize) or spy(A, markersize)
+    density : bool, optional
+        Force (True) or disable (False) the binned image
+    **kwargs : 
+        Additional plot (markers) or imshow (image) options
+    
+    Returns:
+    --------
+    Line2D or AxesImage
+        The markers, or the binned image
+    
+    Examples:
+    ---------
+    >>> spy(A)
+    >>> spy(A, 'r.', 2)
+    >>> spy(scipy.sparse.random(10**7, 10**7, density=1e-7))  # image of pixel bins
+    """
+    fmt = '.'
+    for arg in args:
+        if isinstance(arg, str):
+            fmt = arg
+        else:
+            kwargs['markersize'] = arg
+    if _is_sparse(A):
+        if A.format not in ('csr', 'csc', 'coo'):
+            A = A.tocsr()
+        nnz = int(np.count_nonzero(A.data))
+    else:
+        A = np.asarray(A)
+        if A.ndim != 2:
+            raise ValueError("spy expects a 2-D matrix")
+        nnz = int(np.count_nonzero(A))
+    m, n = A.shape
+    
+    ax = plt.gca()
+    if ax in _hold_off_axes:
+        _replace_children(ax)
+    if density is not False and nnz > (0 if density else _density_min_points):
+        color = kwargs.pop('color', _parse_format(fmt)[2]) or _next_colors(ax)[0]
+        cmap = kwargs.pop('cmap', None) or LinearSegmentedColormap.from_list(
+            'density', [to_rgba(color, 0.3), to_rgba(color, 1.0)])
+        kwargs.pop('markersize', None)
+        kwargs.setdefault('interpolation', 'nearest')
+        rows, cols = (0, m), (0, n)
+        artist = ax.imshow(_bin_nonzeros(A, rows, cols, _spy_bins(ax, rows, cols)),
+                           extent=(0.5, n + 0.5, m + 0.5, 0.5), origin='upper', cmap=cmap,
+                           norm=kwargs.pop('norm', LogNorm(vmin=1)), **kwargs)
+        artist.sticky_edges.x[:] = []
+        artist.sticky_edges.y[:] = []
+    else:
+        chunks = list(_nonzero_chunks(A, (0, m), (0, n)))
+        i = np.concatenate([i for i, _ in chunks]) if chunks else np.zeros(0)
+        j = np.concatenate([j for _, j in chunks]) if chunks else np.zeros(0)
+        artist = ax.plot(j + 1, i + 1, fmt, **kwargs)[0]
+    
+    # MATLAB layout: rows run downwards, square cells, one cell of margin
+    ax.set_aspect('equal')
+    ax.set_xlim(0, n + 1)
+    ax.set_ylim(m + 1, 0)
+    ax.set_xlabel(f'nz = {nnz}')
+    if isinstance(artist, matplotlib.image.AxesImage):
+        # Registered after setting the limits, so the first view is binned once
+        _spy_images[artist] = A
+        _connect_image_callbacks(ax)
+    return artist
+
+
+def _axes3d() -> plt.Axes:
+    """Current axes, replaced by 3-D axes in the same place if needed"""
+    ax = plt.gca()
+    if ax.name == '3d':
+        if ax in _hold_off_axes:
+            _replace_children(ax)
+        return ax
+    fig = ax.figure
+    spec = ax.get_subplotspec()
+    hold_off = ax in _hold_off_axes
+    ax.remove()
+    if spec is not None:
+        ax = fig.add_subplot(spec, projection='3d')
+    else:
+        ax = fig.add_axes(ax.get_position(), projection='3d')
+    if hold_off:
+        _hold_off_axes.add(ax)
+    return ax
+
+
+# Surfaces are reduced to about one grid point per this many axes pixels
+_surface_pixels_per_point = 4
+
+
+def surf(*args, downsample: bool = True, **kwargs) -> Any:
+    """
+    3-D shaded surface plot
+    
+    Grids larger than the display resolution (about one point per 4
+    pixels of the axes) are block-averaged before drawing, so a 4000x4000
+    meshgrid renders as quickly as a small one. Current 2-D axes are
+    replaced by 3-D axes in the same position.
+    
+    Parameters:
+    -----------
+    *args : 
+        surf(Z)
+        surf(X, Y, Z) - X, Y vectors or meshgrid matrices
+    downsample : bool, optional
+        Block-average large grids (default: True)
+    **kwargs : 
+        Additional plot_surface options (cmap, edgecolor, etc.)
+    
+    Returns:
+    --------
+    Poly3DCollection
+        The surface
+    
+    Examples:
+    ---------
+    >>> X, Y = meshgrid(linspace(-2, 2, 4000), linspace(-2, 2, 4000))
+    >>> surf(X, Y, exp(-X**2 - Y**2))
+    >>> surf(Z, cmap='coolwarm')
+    """
+    return _surface('surf', args, downsample, kwargs)
+
+
+def mesh(*args, downsample: bool = True, **kwargs) -> Any:
+    """
+    3-D wireframe mesh plot
+    
+    Large grids are block-averaged to the display resolution like surf().
+    
+    Parameters:
+    -----------
+    *args : 
+        mesh(Z)
+        mesh(X, Y, Z) - X, Y vectors or meshgrid matrices
+    downsample : bool, optional
+        Block-average large grids (default: True)
+    **kwargs : 
+        Additional plot_wireframe options (color, linewidth, etc.)
+    
+    Returns:
+    --------
+    Line3DCollection
+        The wireframe
+    
+    Examples:
+    ---------
+    >>> mesh(X, Y, Z)
+    >>> mesh(Z, color='k')
+    """
+    return _surface('mesh', args, downsample, kwargs)
+
+
+def _surface(kind: str, args: tuple, downsample: bool, kwargs: dict) -> Any:
+    X, Y, Z, rest = _grid_args(args, kind)
+    if rest:
+        raise ValueError(f"{kind} expects Z or X, Y, Z")
+    ax = _axes3d()
+    fy, fx = (_grid_factors(Z.shape, ax, 1 / _surface_pixels_per_point)
+              if downsample else (1, 1))
+    X, Y, Z = _reduce_grid(X, Y, Z, fy, fx)
+    if X.ndim == 1:
+        X, Y = np.meshgrid(X, Y)
+    if kind == 'mesh':
+        kwargs.setdefault('color', _next_colors(ax)[0])
+        return ax.plot_wireframe(X, Y, Z, rstride=1, cstride=1, **kwargs)
+    kwargs.setdefault('cmap', plt.rcParams['image.cmap'])
+    return ax.plot_surface(X, Y, Z, rstride=1, cstride=1, **kwargs)
+
+
+def contour(*args, downsample: bool = True, **kwargs) -> Any:
+    """
+    Contour plot
+    
+    Levels are chosen from the full data; grids larger than the axes are
+    block-averaged to the display resolution before the contour lines are
+    traced.
+    
+    Parameters:
+    -----------
+    *args : 
+        contour(Z)
+        contour(X, Y, Z)
+        contour(..., n) - n levels
+        contour(..., levels) - explicit levels
+    downsample : bool, optional
+        Block-average large grids (default: True)
+    **kwargs : 
+        Additional contour options (colors, cmap, linewidths, etc.)
+    
+    Returns:
+    --------
+    ContourSet
+        The contour lines
+    
+    Examples:
+    ---------
+    >>> contour(Z)
+    >>> contour(X, Y, Z, 20)
+    >>> contour(X, Y, Z, [0, 0.5, 1], colors='k')
     """
-    return plt.plot(*args, **kwargs)
+    X, Y, Z, rest = _grid_args(args, 'contour')
+    if len(rest) > 1:
+        raise ValueError("contour expects Z or X, Y, Z and optional levels")
+    levels = rest[0] if rest else kwargs.pop('levels', None)
+    if levels is None or np.ndim(levels) == 0:
+        # Choose the levels as matplotlib would, but from the full data
+        finite = Z[np.isfinite(Z)]
+        if finite.size:
+            lo, hi = finite.min(), finite.max()
+            ticks = MaxNLocator((7 if levels is None else int(levels)) + 1).tick_values(lo, hi)
+            under = np.flatnonzero(ticks < lo)
+            over = np.flatnonzero(ticks > hi)
+            i0 = under[-1] if len(under) else 0
+            i1 = over[0] + 1 if len(over) else len(ticks)
+            levels = ticks[i0:i1] if i1 - i0 >= 3 else ticks
+    
+    ax = plt.gca()
+    if ax in _hold_off_axes:
+        _replace_children(ax)
+    fy, fx = _grid_factors(Z.shape, ax) if downsample else (1, 1)
+    X, Y, Z = _reduce_grid(X, Y, Z, fy, fx)
+    return ax.contour(X, Y, Z, levels, **kwargs)
+
+
+def _replace_children(ax: plt.Axes) -> None:
+    """Remove an axes' plotted data before a plot with hold off, keeping the axes"""
+    for artist in [*ax.lines, *ax.collections, *ax.images, *ax.patches, *ax.texts]:
+        artist.remove()
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+    ax.set_prop_cycle(None)
+    ax.relim()
+    ax.set_autoscale_on(True)
+
+
+def hold(state: Optional[Union[bool, str]] = None) -> None:
+    """
+    Keep (hold on) or replace (hold off) the current axes' plots
+    
+    With hold off the next plot() removes the axes' lines, collections,
+    images and text and restarts the color cycle, but keeps the axes with
+    its labels and title. Axes start with hold on, the behaviour plot()
+    has always had in this library.
+    
+    Parameters:
+    -----------
+    state : bool or str, optional
+        True, 'on' - Add new plots to the axes
+        False, 'off' - New plots replace the old ones
+        Omitted - Toggle
+    
+    Examples:
+    ---------
+    >>> hold('off')
+    >>> plot(x, y1)
+    >>> plot(x, y2)  # Replaces y1
+    >>> hold('on')
+    """
+    ax = plt.gca()
+    if state is None:
+        state = not ishold()
+    elif isinstance(state, str):
+        state = state.lower() in ('on', 'all')
+    if state:
+        _hold_off_axes.discard(ax)
+    else:
+        _hold_off_axes.add(ax)
+
+
+def ishold() -> bool:
+    """
+    Check whether hold is on for the current axes
+    
+    Returns:
+    --------
+    bool
+        True if new plots are added to the current axes
+    
+    Examples:
+    ---------
+    >>> hold('off')
+    >>> ishold()
+    False
+    """
+    return plt.gca() not in _hold_off_axes
 
 
 def subplot(m: int, n: int, p: int) -> plt.Axes:
@@ -294,20 +1525,648 @@ def close(num: Optional[Union[int, str]] = None) -> None:
         plt.close(num)
 
 
-def savefig(filename: str, **kwargs) -> None:
+def savefig(filename: str, background: bool = False, **kwargs) -> None:
     """
     Save figure to file
     
+    With background=True the figure is rendered now but image encoding
+    (PNG compression etc.) and the disk write happen on a background
+    thread, so the caller can keep computing. At most 8 saves are queued;
+    further calls wait for a free slot. Call waitforsaves() before using
+    the files. An error in a background save is raised by the next
+    savefig() or waitforsaves() call.
+    
     Parameters:
     -----------
     filename : str
         Filename to save
+    background : bool, optional
+        Encode and write the file on a background thread (default: False)
     **kwargs : 
-        Additional options (dpi, format 등)
+        Additional options (dpi, format, etc.)
     
     Examples:
     ---------
     >>> savefig('plot.png')
     >>> savefig('plot.pdf', dpi=300)
+    >>> for k in range(steps):
+    ...     update(state)
+    ...     savefig(f'frame_{k:04d}.png', background=True)
+    >>> waitforsaves()
+    """
+    if background:
+        _raise_save_error()
+    _save_figure(plt.gcf(), filename, kwargs, background)
+
+
+def _save_figure(fig: plt.Figure, filename: str, kwargs: dict, background: bool = False) -> None:
+    """savefig() for a given figure"""
+    # Decimated lines need more pixel columns when saving at a higher dpi
+    dpi = kwargs.get('dpi', plt.rcParams['savefig.dpi'])
+    scale = 1.0 if dpi == 'figure' else dpi / fig.dpi
+    lines = [line for ax in fig.axes for line in ax.get_lines() if line in _decimated_lines]
+    for line in lines:
+        _decimate(line, scale)
+    
+    # Animated lines are skipped by normal draws; include them in the file
+    animated = [h for ax in fig.axes for h in _animated_lines.get(ax, ())]
+    for h in animated:
+        if h.dirty:
+            h.update_artist()
+        h.line.set_animated(False)
+    try:
+        if background:
+            job = _snapshot_figure(fig, filename, kwargs)
+        else:
+            fig.savefig(filename, **kwargs)
+    finally:
+        for h in animated:
+            h.line.set_animated(True)
+    
+    # As plt.savefig does for figures on screen; this redraw also
+    # re-captures the blit backgrounds
+    if animated or fig.canvas.required_interactive_framework:
+        fig.canvas.draw_idle()
+    if scale != 1.0:
+        for line in lines:
+            _decimate(line)
+    if background:
+        _start_save_worker()
+        _save_queue.put(job)
+
+
+# Formats encoded from an RGBA snapshot on the background thread; other
+# formats are rendered to memory and only written in the background
+_RASTER_FORMATS = {'png', 'jpg', 'jpeg', 'tif', 'tiff', 'webp'}
+
+# Background savefig: bounded job queue, its worker thread, and errors
+# waiting to be raised by savefig()/waitforsaves()
+_save_queue_size = 8
+_save_queue = None
+_save_thread = None
+_save_errors = []
+
+
+class _RGBACapture(io.BytesIO):
+    """File object receiving the rendered Agg buffer from savefig(format='rgba')"""
+    
+    def write(self, data) -> int:
+        self.image = np.array(data)
+        return self.image.nbytes
+
+
+def _snapshot_figure(fig: plt.Figure, filename: str, kwargs: dict) -> Callable[[], None]:
+    """Render fig now and return a job that encodes and writes the file"""
+    kwargs = dict(kwargs)
+    fmt = kwargs.pop('format', None)
+    if fmt is None:
+        ext = os.path.splitext(os.fspath(filename))[1]
+        fmt = ext[1:] if ext else plt.rcParams['savefig.format']
+    fmt = fmt.lower()
+    
+    if fmt not in _RASTER_FORMATS:
+        data = io.BytesIO()
+        fig.savefig(data, format=fmt, **kwargs)
+        
+        def write() -> None:
+            with open(filename, 'wb') as f:
+                f.write(data.getbuffer())
+        return write
+    
+    metadata = kwargs.pop('metadata', None)
+    pil_kwargs = kwargs.pop('pil_kwargs', None)
+    capture = _RGBACapture()
+    fig.savefig(capture, format='rgba', **kwargs)
+    dpi = kwargs.get('dpi', plt.rcParams['savefig.dpi'])
+    image = capture.image
+    
+    def encode() -> None:
+        # The same call FigureCanvasAgg makes when printing png/jpg/tiff/webp
+        matplotlib.image.imsave(filename, image, format=fmt,
+                                dpi=fig.dpi if dpi == 'figure' else dpi,
+                                metadata=metadata, pil_kwargs=pil_kwargs)
+    return encode
+
+
+def _save_worker() -> None:
+    while True:
+        job = _save_queue.get()
+        try:
+            job()
+        except Exception as e:
+            _save_errors.append(e)
+        finally:
+            _save_queue.task_done()
+
+
+def _start_save_worker() -> None:
+    global _save_queue, _save_thread
+    if _save_thread is None:
+        _save_queue = queue.Queue(_save_queue_size)
+        _save_thread = threading.Thread(target=_save_worker, name='savefig-writer', daemon=True)
+        _save_thread.start()
+        atexit.register(_finish_saves)
+
+
+def _raise_save_error() -> None:
+    if _save_errors:
+        error = _save_errors[0]
+        _save_errors.clear()
+        raise error
+
+
+def _finish_saves() -> None:
+    """Exit handler: let queued files be written before the process ends"""
+    _save_queue.join()
+    if _save_errors:
+        more = len(_save_errors) - 1
+        warnings.warn(f"background savefig failed: {_save_errors[0]!r}"
+                      + (f" ({more} more failed)" if more else ""), RuntimeWarning)
+        _save_errors.clear()
+
+
+def waitforsaves() -> None:
+    """
+    Wait until all background savefig() calls have written their files
+    
+    If any of them failed, the first error is raised (the others are
+    discarded).
+    
+    Examples:
+    ---------
+    >>> savefig('result.png', background=True)
+    >>> waitforsaves()
+    """
+    if _save_queue is not None:
+        _save_queue.join()
+    _raise_save_error()
+
+
+def _init_render_worker() -> None:
+    """Process pool initializer: render off-screen whatever backend the parent uses"""
+    plt.switch_backend('Agg')
+
+
+def _render_job(func: Callable, job: Any, filename: str, kwargs: dict,
+                offscreen: bool = False) -> str:
+    existing = set(plt.get_fignums())
+    if offscreen:
+        # An Agg canvas registered with pyplot: func's plot()/title() calls
+        # draw into it, while the session backend and its figures stay as is
+        from matplotlib.backend_bases import FigureManagerBase
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        fig = Figure()
+        FigureManagerBase(FigureCanvasAgg(fig), max(existing, default=0) + 1)
+        plt.figure(fig)
+    else:
+        plt.figure()
+    try:
+        if isinstance(job, dict):
+            func(**job)
+        elif isinstance(job, tuple):
+            func(*job)
+        else:
+            func(job)
+        _save_figure(plt.gcf(), filename, kwargs)
+    finally:
+        for num in set(plt.get_fignums()) - existing:
+            plt.close(num)
+    return filename
+
+
+def _render_chunk(func: Callable, jobs: list, kwargs: dict,
+                  offscreen: bool = False) -> List[str]:
+    return [_render_job(func, job, filename, kwargs, offscreen) for job, filename in jobs]
+
+
+def batchrender(func: Callable, jobs: Iterable, filenames: Union[str, Iterable[str]],
+                workers: Optional[int] = None, **kwargs) -> List[str]:
     """
-    plt.savefig(filename, **kwargs)
+    Render many independent figures in parallel and save them
+    
+    Each job runs in a worker process with the non-interactive Agg backend:
+    a new figure is created, func(job) draws into it with the usual
+    figure/plot/xlabel functions, and the figure is saved with savefig().
+    
+    Workers are started with 'spawn', so func is pickled by reference: it
+    must be a module-level function the workers can import, not a lambda or
+    a closure defined at the prompt, and it does not see session variables;
+    pass the data it needs through jobs. A script calling batchrender must
+    guard it with ``if __name__ == '__main__':`` because every worker
+    re-imports the main module. workers=0 renders in this process and
+    accepts any callable.
+    
+    Parameters:
+    -----------
+    func : callable
+        Function drawing one figure; called as func(*job) for a tuple,
+        func(**job) for a dict and func(job) otherwise
+    jobs : iterable
+        Arguments for each figure
+    filenames : str or iterable of str
+        Output files, or a pattern formatted with the job index
+        ('report_{:04d}.png')
+    workers : int, optional
+        Number of processes (default: CPU count); 0 renders serially in
+        this process on off-screen Agg canvases, leaving the session's
+        backend and figures untouched
+    **kwargs : 
+        savefig options (dpi, format, etc.)
+    
+    Returns:
+    --------
+    list of str
+        Written filenames, in job order
+    
+    Examples:
+    ---------
+    In a script (reports.py):
+    
+    >>> def draw(run, data):
+    ...     plot(data)
+    ...     title(f'Run {run}')
+    >>> if __name__ == '__main__':
+    ...     jobs = [(run, results[run]) for run in range(1000)]
+    ...     batchrender(draw, jobs, 'run_{:04d}.png')
+    ...     batchrender(draw, jobs, names, workers=8, dpi=150)
+    
+    At the prompt, closures work in-process:
+    
+    >>> batchrender(lambda run: plot(results[run]), range(10), 'run_{}.png', workers=0)
+    """
+    jobs = list(jobs)
+    if isinstance(filenames, str):
+        filenames = [filenames.format(i) for i in range(len(jobs))]
+    else:
+        filenames = list(filenames)
+    if len(filenames) != len(jobs):
+        raise ValueError(f"Got {len(jobs)} jobs but {len(filenames)} filenames")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    
+    if workers <= 0:
+        with plt.ioff():
+            return _render_chunk(func, list(zip(jobs, filenames)), kwargs, offscreen=True)
+    
+    # Chunks amortize the pickling of func and the kwargs over several jobs;
+    # spawned workers do not inherit the parent's GUI state
+    chunksize = max(1, len(jobs) // (workers * 4))
+    pairs = list(zip(jobs, filenames))
+    chunks = [pairs[i:i + chunksize] for i in range(0, len(pairs), chunksize)]
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_render_worker) as pool:
+        results = pool.map(_render_chunk, [func] * len(chunks), chunks,
+                           [kwargs] * len(chunks))
+        return [filename for chunk in results for filename in chunk]
+
+
+# Animated lines by axes, for drawnow(); the figure draw_event re-captures
+# their blitting background
+_animated_lines = weakref.WeakKeyDictionary()
+
+# Axes -> (background, view limits, bbox) captured after the last full draw
+_blit_backgrounds = weakref.WeakKeyDictionary()
+
+# Canvas callback registries that already re-capture backgrounds on draw
+_blit_registries = weakref.WeakSet()
+
+# drawnow('limitrate') redraws at most this many times per second
+_drawnow_max_fps = 20.0
+_last_drawnow = 0.0
+
+
+class AnimatedLine:
+    """
+    Line for streaming data, created by animatedline()
+    
+    Points are appended to a ring buffer holding the newest maxpoints
+    samples. Each sample is written twice, at i and i + capacity, so the
+    buffered points are always one contiguous view and drawing never has to
+    reassemble the ring. The Line2D is only updated by drawnow(), which
+    blits the line over a cached background of the axes.
+    """
+    
+    def __init__(self, line: plt.Line2D, maxpoints: int):
+        self.line = line
+        self.maxpoints = int(maxpoints)
+        self._buffer = np.empty((2, 0))
+        self._capacity = 0
+        self._count = 0  # Total points ever added
+        self._new_bounds = None  # (xmin, xmax, ymin, ymax) added since the last drawnow
+        self.dirty = False
+    
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+    
+    def _reserve(self, needed: int) -> None:
+        """Grow the buffer until it holds maxpoints; the ring never wraps before that"""
+        if needed <= self._capacity or self._capacity == self.maxpoints:
+            return
+        capacity = min(max(needed, 2 * self._capacity, 1024), self.maxpoints)
+        n = self._count
+        buffer = np.empty((2, 2 * capacity))
+        buffer[:, :n] = self._buffer[:, :n]
+        buffer[:, capacity:capacity + n] = self._buffer[:, :n]
+        self._buffer, self._capacity = buffer, capacity
+    
+    def add(self, x: Any, y: Any) -> None:
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if x.shape != y.shape:
+            raise ValueError("x and y must have the same number of points")
+        if len(x) == 0:
+            return
+        
+        bounds = (np.nanmin(x), np.nanmax(x), np.nanmin(y), np.nanmax(y))
+        if self._new_bounds is not None:
+            old = self._new_bounds
+            bounds = (min(old[0], bounds[0]), max(old[1], bounds[1]),
+                      min(old[2], bounds[2]), max(old[3], bounds[3]))
+        self._new_bounds = bounds
+        
+        # Only the newest maxpoints points can survive
+        self._reserve(self._count + len(x))
+        skipped = max(len(x) - self.maxpoints, 0)
+        x, y = x[skipped:], y[skipped:]
+        self._count += skipped
+        
+        capacity = self._capacity
+        positions = (self._count + np.arange(len(x))) % capacity
+        for offset in (0, capacity):
+            self._buffer[0, positions + offset] = x
+            self._buffer[1, positions + offset] = y
+        self._count += len(x)
+        self.dirty = True
+    
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Buffered points, oldest first, as views into the ring buffer"""
+        n = len(self)
+        start = (self._count - n) % self._capacity if self._capacity else 0
+        return self._buffer[0, start:start + n], self._buffer[1, start:start + n]
+    
+    def clear(self) -> None:
+        self._count = 0
+        self._new_bounds = None
+        self.dirty = True
+    
+    def update_artist(self) -> None:
+        """Copy the buffered points into the Line2D without marking the figure stale"""
+        callback = self.line.stale_callback
+        self.line.stale_callback = None
+        try:
+            self.line.set_data(*self.points())
+        finally:
+            self.line.stale_callback = callback
+        self.dirty = False
+    
+    def __repr__(self) -> str:
+        return f"AnimatedLine({len(self)} points, maxpoints={self.maxpoints})"
+
+
+def animatedline(*args, maxpoints: int = 1000000, **kwargs) -> AnimatedLine:
+    """
+    Create a line for streaming data
+    
+    Add points with addpoints() and show them with drawnow(). Only the
+    changed lines are redrawn (blitted over a cached background), so
+    plotting inside a loop does not recreate artists or redraw the figure.
+    
+    Parameters:
+    -----------
+    *args : 
+        Optional initial data and style string
+        animatedline()
+        animatedline(x, y)
+        animatedline('r-')
+    maxpoints : int, optional
+        Maximum number of points kept; older points are discarded
+        (default: 1000000)
+    **kwargs : 
+        Additional line options (color, linewidth, label, etc.)
+    
+    Returns:
+    --------
+    AnimatedLine
+        Handle for addpoints(), getpoints() and clearpoints()
+    
+    Examples:
+    ---------
+    >>> h = animatedline('b-', maxpoints=5000)
+    >>> for k in range(10000):
+    ...     addpoints(h, k / 1000, sensor.read())
+    ...     drawnow('limitrate')
+    >>> drawnow()
+    """
+    fmt = [a for a in args if isinstance(a, str)]
+    data = [a for a in args if not isinstance(a, str)]
+    if maxpoints < 1:
+        raise ValueError("maxpoints must be positive")
+    
+    ax = plt.gca()
+    line = ax.plot([], [], *fmt, animated=True, **kwargs)[0]
+    handle = AnimatedLine(line, maxpoints)
+    _animated_lines.setdefault(ax, []).append(handle)
+    if data:
+        handle.add(*data)
+    return handle
+
+
+def addpoints(h: AnimatedLine, x: Any, y: Any) -> None:
+    """
+    Add points to an animated line
+    
+    The points are buffered; call drawnow() to display them.
+    
+    Parameters:
+    -----------
+    h : AnimatedLine
+        Line created by animatedline()
+    x, y : scalar or array
+        New points
+    
+    Examples:
+    ---------
+    >>> h = animatedline()
+    >>> addpoints(h, t, value)
+    >>> addpoints(h, t_block, samples)  # Many points at once
+    """
+    h.add(x, y)
+
+
+def getpoints(h: AnimatedLine) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the points of an animated line
+    
+    Parameters:
+    -----------
+    h : AnimatedLine
+        Line created by animatedline()
+    
+    Returns:
+    --------
+    tuple
+        (x, y) arrays, oldest point first
+    
+    Examples:
+    ---------
+    >>> x, y = getpoints(h)
+    """
+    x, y = h.points()
+    return x.copy(), y.copy()
+
+
+def clearpoints(h: AnimatedLine) -> None:
+    """
+    Remove all points from an animated line
+    
+    Parameters:
+    -----------
+    h : AnimatedLine
+        Line created by animatedline()
+    
+    Examples:
+    ---------
+    >>> clearpoints(h)
+    >>> drawnow()
+    """
+    h.clear()
+
+
+def _grow_limits(ax: plt.Axes, handles: List[AnimatedLine]) -> bool:
+    """
+    Expand autoscaled limits that no longer contain the new points
+    
+    Limits are refit to the data plus a quarter of its span on the side
+    that overflowed, so streaming data does not force a full redraw every
+    frame. Returns True if the limits changed.
+    """
+    bounds = [h._new_bounds for h in handles if h._new_bounds is not None]
+    for h in handles:
+        h._new_bounds = None
+    if not bounds:
+        return False
+    if ax not in _blit_backgrounds:
+        # First frame: fit the data like plot() does
+        ax.relim()
+        ax.autoscale_view()
+        return True
+    
+    overflow = {}
+    for axis, lo, hi in (('x', 0, 1), ('y', 2, 3)):
+        if not getattr(ax, f'get_autoscale{axis}_on')():
+            continue
+        left, right = sorted(getattr(ax, f'get_{axis}lim')())
+        low = min(b[lo] for b in bounds) < left
+        high = max(b[hi] for b in bounds) > right
+        if low or high:
+            overflow[axis] = (low, high)
+    if not overflow:
+        return False
+    
+    ax.relim()
+    for axis, (low, high) in overflow.items():
+        lo, hi = getattr(ax.dataLim, f'interval{axis}')
+        pad = (hi - lo) * 0.25 or 1.0
+        getattr(ax, f'set_{axis}lim')(lo - pad if low else lo, hi + pad if high else hi,
+                                      auto=True)
+    return True
+
+
+def _capture_backgrounds(event) -> None:
+    """draw_event callback: cache each axes' background, then draw its animated lines"""
+    canvas = event.canvas
+    if canvas.is_saving():
+        return
+    for ax in canvas.figure.axes:
+        handles = _animated_lines.get(ax)
+        if not handles:
+            continue
+        _blit_backgrounds[ax] = (canvas.copy_from_bbox(ax.bbox),
+                                 tuple(ax.viewLim.bounds), tuple(ax.bbox.bounds))
+        for h in handles:
+            if h.dirty:
+                h.update_artist()
+            ax.draw_artist(h.line)
+
+
+def drawnow(option: Optional[str] = None, maxfps: Optional[float] = None) -> None:
+    """
+    Update figures and process pending events
+    
+    Animated lines are blitted: only axes with new points are redrawn, over
+    a background cached at the last full draw. A full redraw happens only
+    when something else in the figure changed or an axis limit had to grow.
+    
+    Parameters:
+    -----------
+    option : str, optional
+        'limitrate' - Skip the update if the previous one was less than
+        1/maxfps seconds ago; call drawnow() after the loop to show the
+        final points
+    maxfps : float, optional
+        Frame rate cap for 'limitrate' (default: 20)
+    
+    Examples:
+    ---------
+    >>> drawnow()
+    >>> drawnow('limitrate')
+    >>> drawnow('limitrate', maxfps=60)
+    """
+    global _last_drawnow
+    if option is not None and option.lower() != 'limitrate':
+        raise ValueError(f"Unknown drawnow option: {option}")
+    now = time.perf_counter()
+    if option is not None:
+        if now - _last_drawnow < 1.0 / (maxfps or _drawnow_max_fps):
+            return
+    _last_drawnow = now
+    
+    for _, fig in _open_figures():
+        canvas = fig.canvas
+        axes = []
+        for ax in fig.axes:
+            # Drop lines removed from the axes (cla, line.remove())
+            handles = [h for h in _animated_lines.get(ax, ()) if h.line.axes is ax]
+            if handles:
+                _animated_lines[ax] = handles
+                axes.append(ax)
+            else:
+                _animated_lines.pop(ax, None)
+        if not axes:
+            if fig.stale:
+                canvas.draw_idle()
+            canvas.flush_events()
+            continue
+        
+        if canvas.callbacks not in _blit_registries:
+            canvas.mpl_connect('draw_event', _capture_backgrounds)
+            _blit_registries.add(canvas.callbacks)
+        
+        # Anything else that changed in the figure needs a full redraw
+        full = fig.stale or not canvas.supports_blit
+        dirty = []
+        for ax in axes:
+            handles = _animated_lines[ax]
+            if not any(h.dirty for h in handles):
+                continue
+            dirty.append(ax)
+            for h in handles:
+                if h.dirty:
+                    h.update_artist()
+            cached = _blit_backgrounds.get(ax)
+            if (_grow_limits(ax, handles) or cached is None
+                    or cached[1] != tuple(ax.viewLim.bounds)
+                    or cached[2] != tuple(ax.bbox.bounds)):
+                full = True
+        
+        if full:
+            canvas.draw()
+        else:
+            for ax in dirty:
+                canvas.restore_region(_blit_backgrounds[ax][0])
+                for h in _animated_lines[ax]:
+                    ax.draw_artist(h.line)
+                canvas.blit(ax.bbox)
+        canvas.flush_events()
@@ -0,0 +1,270 @@
+"""
+Out-of-process figure rendering for the interactive interpreters
+
+A render server is a separate local process that owns the figures and the
+GUI event loop. The interpreter replaces the plotting functions with
+proxies that serialize each call and return immediately, so show() never
+blocks the prompt and heavy redraws run on another core. Large array
+arguments travel through shared memory rather than the pipe.
+"""
+
+import atexit
+import multiprocessing
+import os
+import pickle
+import traceback
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python < 3.8: everything goes through the pipe
+    resource_tracker = shared_memory = None
+
+
+# Array buffers at least this large are sent through shared memory
+_SHARED_MIN_BYTES = 64 * 1024
+
+# Functions whose result the caller needs; they wait for the server
+_QUERY_FUNCTIONS = {'xlim', 'ylim', 'ishold', 'maxfigures', 'figmemory', 'getpoints',
+                    'waitforsaves'}
+
+# Functions returning objects used in later calls (addpoints(h, ...))
+_HANDLE_FUNCTIONS = {'animatedline'}
+
+# Functions that stay in the interpreter process
+_LOCAL_FUNCTIONS = {'batchrender'}
+
+# Server-side handles kept for later calls, oldest dropped first
+_MAX_HANDLES = 1000
+
+
+class RemoteHandle:
+    """Stand-in for an object living in the render server (e.g. an animated line)"""
+
+    def __init__(self, call_id: int, name: str):
+        self.call_id = call_id
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"<{self.name} in render server>"
+
+
+def _pack(obj: Any) -> Tuple[bytes, List[Tuple[str, int]]]:
+    """
+    Pickle obj, moving large array buffers into shared memory blocks
+
+    Returns the pickle and the (name, size) of each block, in the order
+    pickle.loads expects the out-of-band buffers.
+    """
+    segments = []
+
+    def to_shared(buffer: pickle.PickleBuffer) -> bool:
+        view = buffer.raw()
+        if shared_memory is None or view.nbytes < _SHARED_MIN_BYTES:
+            return True  # Serialize in-band
+        block = shared_memory.SharedMemory(create=True, size=view.nbytes)
+        segments.append((block.name, view.nbytes))
+        try:
+            block.buf[:view.nbytes] = view
+        finally:
+            block.close()
+        _untrack(block.name)
+        return False
+
+    try:
+        data = pickle.dumps(obj, protocol=5, buffer_callback=to_shared)
+    except BaseException:
+        # Blocks made before the failure would never reach the server
+        _free_segments(segments)
+        raise
+    return data, segments
+
+
+def _untrack(name: str) -> None:
+    """Keep this process's resource tracker from unlinking a block the server now owns"""
+    # Only POSIX blocks are tracked, under their path: the name with a leading slash
+    if resource_tracker is None or os.name == 'nt':
+        return
+    try:
+        resource_tracker.unregister('/' + name, 'shared_memory')
+    except OSError:
+        # The tracker is gone; at worst it reports the block as leaked
+        # after the server has already unlinked it
+        pass
+
+
+def _unpack(data: bytes, segments: List[Tuple[str, int]]) -> Any:
+    """Inverse of _pack; copies the shared blocks into private memory and frees them"""
+    buffers = []
+    for name, size in segments:
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            buffers.append(bytearray(block.buf[:size]))
+        finally:
+            block.close()
+            block.unlink()
+    return pickle.loads(data, buffers=buffers)
+
+
+def _free_segments(segments: List[Tuple[str, int]]) -> None:
+    for name, _ in segments:
+        try:
+            block = shared_memory.SharedMemory(name=name)
+            block.close()
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _resolve(obj: Any, handles: Dict[int, Any]) -> Any:
+    if isinstance(obj, RemoteHandle):
+        return handles[obj.call_id]
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_resolve(item, handles) for item in obj)
+    if isinstance(obj, dict):
+        return {key: _resolve(value, handles) for key, value in obj.items()}
+    return obj
+
+
+def _serve(conn: Any) -> None:
+    """Render server main loop: run plotting calls and keep the GUI responsive"""
+    import matplotlib.pyplot as plt
+    from . import plotting
+
+    # Figures appear and redraw as in MATLAB, without show()
+    plt.ion()
+    handles = OrderedDict()
+    while True:
+        if not conn.poll(0 if plt.get_fignums() else 0.5):
+            if plt.get_fignums():
+                plt.pause(0.02)
+            continue
+        try:
+            message = conn.recv_bytes()
+        except (EOFError, OSError):
+            break
+        call_id, name, data, segments, reply = pickle.loads(message)
+        if name is None:
+            break
+        try:
+            args, kwargs = _resolve(_unpack(data, segments), handles)
+            if name == 'show':
+                result = plt.show(block=False)
+            else:
+                result = getattr(plotting, name)(*args, **kwargs)
+            if name in _HANDLE_FUNCTIONS:
+                handles[call_id] = result
+                while len(handles) > _MAX_HANDLES:
+                    handles.popitem(last=False)
+            if reply:
+                conn.send_bytes(pickle.dumps((call_id, True, result)))
+        except Exception as e:
+            try:
+                error = pickle.dumps((call_id, False, e))
+            except Exception:
+                error = pickle.dumps((call_id, False, RuntimeError(
+                    ''.join(traceback.format_exception_only(type(e), e)).strip())))
+            conn.send_bytes(error)
+    plt.close('all')
+
+
+class RenderClient:
+    """
+    Connection to a render server process
+
+    Examples:
+    ---------
+    >>> client = RenderClient()
+    >>> namespace.update(client.functions())  # plot, figure, show, ... now remote
+    >>> client.close()
+    """
+
+    def __init__(self):
+        context = multiprocessing.get_context('spawn')
+        self._conn, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child,), daemon=True,
+                                        name='matlab-render-server')
+        self._process.start()
+        child.close()
+        self._next_id = 0
+        atexit.register(self.close)
+
+    @property
+    def alive(self) -> bool:
+        return self._process.is_alive()
+
+    def _report_errors(self, wait_for: Optional[int] = None) -> Any:
+        """Print errors of earlier calls; with wait_for, return that call's result"""
+        while wait_for is not None or self._conn.poll():
+            try:
+                call_id, ok, result = pickle.loads(self._conn.recv_bytes())
+            except (EOFError, OSError):
+                raise RuntimeError("The render server has exited") from None
+            if call_id == wait_for:
+                if not ok:
+                    raise result
+                return result
+            if not ok:
+                print(f"Error (render server): {result}")
+        return None
+
+    def call(self, name: str, args: tuple = (), kwargs: Optional[dict] = None,
+             wait: bool = False) -> Any:
+        """Send one plotting call; wait=True returns its result"""
+        if not self.alive:
+            raise RuntimeError("The render server has exited")
+        self._report_errors()
+        self._next_id += 1
+        data, segments = _pack((args, kwargs or {}))
+        try:
+            self._conn.send_bytes(pickle.dumps((self._next_id, name, data, segments, wait)))
+        except Exception:
+            _free_segments(segments)
+            raise
+        if wait:
+            return self._report_errors(wait_for=self._next_id)
+        if name in _HANDLE_FUNCTIONS:
+            return RemoteHandle(self._next_id, name)
+        return None
+
+    def _proxy(self, name: str, func: Callable) -> Callable:
+        wait = name in _QUERY_FUNCTIONS
+
+        def proxy(*args, **kwargs):
+            if name == 'figmemory':
+                # Print here; the server's output would interleave with the prompt
+                verbose = kwargs.pop('verbose', True)
+                info = self.call(name, args, dict(kwargs, verbose=False), wait=True)
+                if verbose:
+                    print(info if info else "No open figures.")
+                return info
+            return self.call(name, args, kwargs, wait=wait)
+
+        proxy.__name__ = name
+        proxy.__doc__ = func.__doc__
+        return proxy
+
+    def functions(self) -> Dict[str, Callable]:
+        """Proxies for the public plotting functions, by name"""
+        from . import plotting, __all__
+        proxies = {}
+        for name in __all__:
+            func = getattr(plotting, name, None)
+            if (callable(func) and getattr(func, '__module__', None) == plotting.__name__
+                    and name not in _LOCAL_FUNCTIONS):
+                proxies[name] = self._proxy(name, func)
+        return proxies
+
+    def close(self) -> None:
+        """Stop the server, closing its figures"""
+        if self._process.is_alive():
+            try:
+                self._conn.send_bytes(pickle.dumps((0, None, b'', [], False)))
+            except (OSError, ValueError):
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._conn.close()
+        atexit.unregister(self.close)
@@ -0,0 +1,918 @@
+"""
+MATLAB-style signal processing functions
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import scipy.fft
+import scipy.signal
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Tuple, Union
+
+
+# Convolutions whose shorter input has at least this many samples use FFT
+# overlap-add instead of the direct sum
+_conv_fft_min_length = 500
+
+# conv2 kernels with at least this many elements use FFT overlap-add
+_conv2_fft_min_size = 25
+
+_CONV_SHAPES = ('full', 'same', 'valid')
+
+
+def _first_dim(X: np.ndarray) -> int:
+    """First non-singleton dimension, which MATLAB functions operate along by default"""
+    for axis, n in enumerate(X.shape):
+        if n != 1:
+            return axis
+    return 0
+
+
+def nextpow2(n: Union[int, float]) -> int:
+    """
+    Exponent of the next power of 2
+    
+    Parameters:
+    -----------
+    n : int or float
+        Value
+    
+    Returns:
+    --------
+    int
+        Smallest p with 2**p >= abs(n)
+    
+    Examples:
+    ---------
+    >>> nextpow2(1000)  # 10
+    >>> Y = fft(x, 2 ** nextpow2(len(x)))  # Zero-pad to a power of 2
+    """
+    n = abs(n)
+    if n <= 1:
+        return 0
+    p = int(np.ceil(np.log2(n)))
+    # Guard against rounding in log2 near exact powers of 2
+    while 2 ** p < n:
+        p += 1
+    while p > 0 and 2 ** (p - 1) >= n:
+        p -= 1
+    return p
+
+
+class _LRUCache:
+    """Bounded mapping that drops the least recently used entry, with hit counts"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Any, build: Callable[[], Any]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        entry = self._entries[key] = build()
+        self.resize(self.maxsize)
+        return entry
+    
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._entries) > maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+# Window vectors per (name, length, sflag)
+_windows = _LRUCache(64)
+
+
+class FFTCacheInfo(NamedTuple):
+    """Statistics of the window cache (see fftcache)"""
+    window_hits: int
+    window_misses: int
+    windows: int
+    maxsize: int
+
+
+def fftcache(option: Optional[Union[int, str]] = None) -> FFTCacheInfo:
+    """
+    Statistics and size of the window cache
+    
+    Window functions (hann, hamming) remember their vectors, so repeated
+    calls with the same length return the same read-only array instead of
+    recomputing it. The least recently used windows beyond the cache size
+    are dropped. fft and ifft call scipy.fft directly, which keeps its own
+    twiddle factors per length.
+    
+    Parameters:
+    -----------
+    option : int or str, optional
+        New number of windows to keep, or 'clear' to empty the cache and
+        reset the statistics
+    
+    Returns:
+    --------
+    FFTCacheInfo
+        Hits, misses and entries of the cache, and its size limit
+    
+    Examples:
+    ---------
+    >>> fftcache()
+    >>> fftcache(256)
+    >>> fftcache('clear')
+    """
+    if isinstance(option, str):
+        if option != 'clear':
+            raise ValueError("option must be a cache size or 'clear'")
+        _windows.clear()
+    elif option is not None:
+        if option < 0:
+            raise ValueError("The cache size must be non-negative")
+        _windows.resize(int(option))
+    return FFTCacheInfo(_windows.hits, _windows.misses, len(_windows), _windows.maxsize)
+
+
+def fft(X: Any, n: Optional[int] = None, axis: Optional[int] = None) -> np.ndarray:
+    """
+    Discrete Fourier transform
+    
+    Parameters:
+    -----------
+    X : array
+        Input array
+    n : int, optional
+        Transform length; X is zero-padded or truncated to n samples
+        (e.g. 2 ** nextpow2(len(x)) for a fast power-of-2 length)
+    axis : int, optional
+        Axis to transform (default: first non-singleton dimension, i.e.
+        the columns of a matrix)
+    
+    Returns:
+    --------
+    ndarray
+        Complex spectrum (complex64 for single precision input)
+    
+    Examples:
+    ---------
+    >>> Y = fft(x)
+    >>> Y = fft(x, 2 ** nextpow2(len(x)))
+    >>> Y = fft(A, axis=1)  # Each row
+    """
+    X = np.asarray(X)
+    return scipy.fft.fft(X, n=n, axis=_first_dim(X) if axis is None else axis)
+
+
+def ifft(Y: Any, n: Optional[int] = None, axis: Optional[int] = None,
+         symmetric: bool = False) -> np.ndarray:
+    """
+    Inverse discrete Fourier transform
+    
+    Parameters:
+    -----------
+    Y : array
+        Spectrum
+    n : int, optional
+        Transform length (zero-pads or truncates Y)
+    axis : int, optional
+        Axis to transform (default: first non-singleton dimension)
+    symmetric : bool, optional
+        Treat Y as conjugate symmetric and return a real signal, like
+        MATLAB's ifft(Y, 'symmetric') (default: False)
+    
+    Returns:
+    --------
+    ndarray
+        Signal
+    
+    Examples:
+    ---------
+    >>> x = ifft(fft(x))
+    >>> x = ifft(Y, symmetric=True)  # Real signal
+    """
+    Y = np.asarray(Y)
+    axis = _first_dim(Y) if axis is None else axis
+    if symmetric:
+        # Only the non-negative frequencies are needed
+        n = Y.shape[axis] if n is None else n
+        half = np.take(Y, np.arange(min(n // 2 + 1, Y.shape[axis])), axis=axis)
+        return scipy.fft.irfft(half, n=n, axis=axis)
+    return scipy.fft.ifft(Y, n=n, axis=axis)
+
+
+def fftshift(X: Any, axis: Optional[int] = None) -> np.ndarray:
+    """
+    Shift the zero-frequency component to the center of the spectrum
+    
+    Parameters:
+    -----------
+    X : array
+        Spectrum
+    axis : int, optional
+        Axis to shift (default: all axes)
+    
+    Returns:
+    --------
+    ndarray
+        Shifted spectrum
+    
+    Examples:
+    ---------
+    >>> Y = fftshift(fft(x))
+    >>> f = (np.arange(n) - n // 2) * fs / n  # Matching frequencies
+    """
+    return scipy.fft.fftshift(X, axes=axis)
+
+
+def ifftshift(X: Any, axis: Optional[int] = None) -> np.ndarray:
+    """
+    Inverse of fftshift
+    
+    Parameters:
+    -----------
+    X : array
+        Shifted spectrum
+    axis : int, optional
+        Axis to shift (default: all axes)
+    
+    Returns:
+    --------
+    ndarray
+        Spectrum with the zero-frequency component first
+    
+    Examples:
+    ---------
+    >>> Y = ifftshift(fftshift(Y))
+    """
+    return scipy.fft.ifftshift(X, axes=axis)
+
+
+def _conv_slice(full_length: int, length_u: int, length_v: int, shape: str) -> slice:
+    """Part of a full convolution kept by MATLAB's 'same' and 'valid' shapes"""
+    if shape == 'same':
+        start = length_v // 2
+        return slice(start, start + length_u)
+    if shape == 'valid':
+        return slice(length_v - 1, max(length_u, length_v - 1))
+    return slice(0, full_length)
+
+
+def conv(u: Any, v: Any, shape: str = 'full') -> np.ndarray:
+    """
+    Convolution of two vectors (polynomial multiplication)
+    
+    Short kernels use the direct sum; when both vectors have 500 samples
+    or more, FFT overlap-add is used instead, which is much faster for
+    long kernels (e.g. 1 million samples with a 4096-tap kernel).
+    
+    Parameters:
+    -----------
+    u, v : array
+        Vectors
+    shape : str, optional
+        'full' (default), 'same' (central part, length of u) or 'valid'
+        (parts computed without zero-padded edges)
+    
+    Returns:
+    --------
+    ndarray
+        Convolution
+    
+    Examples:
+    ---------
+    >>> w = conv([1, 2], [1, 3])  # [1, 5, 6]
+    >>> y = conv(x, ones(1, 5) / 5, 'same')  # Moving average
+    """
+    if shape not in _CONV_SHAPES:
+        raise ValueError(f"shape must be one of {_CONV_SHAPES}")
+    u = np.ravel(u)
+    v = np.ravel(v)
+    if u.size == 0 or v.size == 0:
+        return np.zeros(0, dtype=np.result_type(u, v, 1.0))
+    if min(u.size, v.size) >= _conv_fft_min_length:
+        w = scipy.signal.oaconvolve(u, v)
+    else:
+        w = np.convolve(u, v)
+    return w[_conv_slice(w.size, u.size, v.size, shape)]
+
+
+def conv2(*args, shape: Optional[str] = None) -> np.ndarray:
+    """
+    Two-dimensional convolution
+    
+    Kernels with 25 elements or more (5 x 5) use FFT overlap-add; smaller
+    kernels use the direct sum. With two vectors and a matrix, a small
+    separable kernel is applied along the columns and then the rows, which
+    takes fewer operations than the direct sum with its outer product.
+    
+    Parameters:
+    -----------
+    *args : 
+        conv2(A, B) - A convolved with B
+        conv2(u, v, A) - columns of A convolved with u, then rows with v
+        conv2(..., shape) - 'full' (default), 'same' or 'valid'
+    shape : str, optional
+        Output shape, as a keyword
+    
+    Returns:
+    --------
+    ndarray
+        Convolution
+    
+    Examples:
+    ---------
+    >>> C = conv2(A, ones(3, 3) / 9, 'same')  # 3 x 3 box blur
+    >>> C = conv2(g, g, A, 'same')  # Separable Gaussian blur
+    """
+    args = list(args)
+    if args and isinstance(args[-1], str):
+        shape = args.pop()
+    shape = shape or 'full'
+    if shape not in _CONV_SHAPES:
+        raise ValueError(f"shape must be one of {_CONV_SHAPES}")
+    if len(args) == 3:
+        u, v, A = np.ravel(args[0]), np.ravel(args[1]), np.asarray(args[2])
+        B_shape = (u.size, v.size)
+        if u.size * v.size >= _conv2_fft_min_size:
+            # FFT cost hardly depends on the kernel size: one pass beats two
+            kernels = ((np.outer(u, v), u.size * v.size),)
+        else:
+            kernels = ((u[:, None], 0), (v[None, :], 0))
+    elif len(args) == 2:
+        A, B = np.asarray(args[0]), np.asarray(args[1])
+        B_shape = B.shape
+        kernels = ((B, B.size),)
+    else:
+        raise ValueError("conv2 expects (A, B) or (u, v, A) and an optional shape")
+    if A.ndim != 2 or len(B_shape) != 2:
+        raise ValueError("conv2 expects 2-D inputs")
+    
+    C = A
+    for kernel, size in kernels:
+        if size >= _conv2_fft_min_size and C.size >= _conv2_fft_min_size:
+            C = scipy.signal.oaconvolve(C, kernel)
+        else:
+            C = scipy.signal.convolve2d(C, kernel)
+    rows = _conv_slice(C.shape[0], A.shape[0], B_shape[0], shape)
+    cols = _conv_slice(C.shape[1], A.shape[1], B_shape[1], shape)
+    return C[rows, cols]
+
+
+def filter(b: Any, a: Any, x: Any, zi: Any = None,
+           axis: Optional[int] = None) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    1-D digital filter (direct form II transposed)
+    
+    y(n) = (b(1)*x(n) + ... + b(nb+1)*x(n-nb) - a(2)*y(n-1) - ... - a(na+1)*y(n-na)) / a(1)
+    
+    A matrix is filtered along each column in a single compiled pass over
+    the data. For long FIR filters (a = 1, hundreds of taps or more),
+    conv(x, b) is much faster.
+    
+    Parameters:
+    -----------
+    b : array
+        Numerator coefficients
+    a : array or float
+        Denominator coefficients (a(1) must be nonzero)
+    x : array
+        Input signal
+    zi : array, optional
+        Initial conditions, max(len(a), len(b)) - 1 values per channel
+        ([] for zeros). When given, the final conditions are returned too,
+        as in MATLAB's [y, zf] = filter(b, a, x, zi)
+    axis : int, optional
+        Axis to filter along (default: first non-singleton dimension, i.e.
+        the columns of a matrix)
+    
+    Returns:
+    --------
+    ndarray, or (ndarray, ndarray) when zi is given
+        Filtered signal, the shape of x, and the final conditions
+    
+    Examples:
+    ---------
+    >>> y = filter(ones(1, 5) / 5, 1, x)  # Moving average
+    >>> y = filter(1, [1, -0.9], x)  # First-order low-pass
+    >>> Y = filter(b, a, X)  # Each column of X
+    >>> y1, z = filter(b, a, x1, [])  # Filter in pieces, carrying the state
+    >>> y2, z = filter(b, a, x2, z)
+    """
+    b, a = _filter_coefficients(b, a)
+    x = np.asarray(x)
+    axis = _first_dim(x) if axis is None else axis
+    y, zf = _lfilter(b, a, x, axis, _initial_conditions(b, a, x, [] if zi is None else zi, axis))
+    return y if zi is None else (y, zf)
+
+
+def _filter_coefficients(b: Any, a: Any) -> Tuple[np.ndarray, np.ndarray]:
+    b = np.atleast_1d(np.asarray(b)).ravel()
+    a = np.atleast_1d(np.asarray(a)).ravel()
+    if a.size == 0 or a[0] == 0:
+        raise ValueError("The first denominator coefficient a(1) must be nonzero")
+    return b, a
+
+
+def _lfilter(b: np.ndarray, a: np.ndarray, x: np.ndarray, axis: int,
+             zi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    lfilter through the direct form II transposed recursion for every
+    filter, so the output does not depend on how the signal is split into
+    pieces (lfilter convolves FIR kernels, and a chunked convolution sums
+    in a different order; a zero a(2) keeps the recursion)
+    """
+    if a.size == 1 and b.size > 1:
+        a = np.append(a, 0)
+    return scipy.signal.lfilter(b, a, x, axis=axis, zi=zi)
+
+
+def _initial_conditions(b: np.ndarray, a: np.ndarray, x: np.ndarray, zi: Any,
+                        axis: int) -> np.ndarray:
+    """Filter state in lfilter's layout: x's shape with max(na, nb) - 1 along axis"""
+    shape = list(x.shape)
+    shape[axis] = max(a.size, b.size) - 1
+    zi = np.asarray(zi)
+    if zi.size == 0:
+        return np.zeros(shape, dtype=np.result_type(b, a, x, 1.0))
+    if zi.size != np.prod(shape):
+        raise ValueError(f"zi must hold {shape[axis]} values per channel")
+    return zi.reshape(shape)
+
+
+class StreamingFilter:
+    """
+    Filter for signals that arrive in chunks
+    
+    The filter state (and, for FFT filtering, the overlap of the last
+    block) is carried from one chunk to the next, so each chunk needs no
+    history. Chunks are vectors or matrices of samples x channels; all
+    channels are filtered in one pass. The default direct method gives
+    output bit-identical to filter(b, a, x) on the concatenated input.
+    
+    method='fft' filters FIR kernels (a = 1) by FFT overlap-add, which is
+    much faster for hundreds of taps or more; its output equals the
+    direct method to within rounding. The kernel spectrum and the work
+    buffers are kept between chunks of the same size.
+    
+    Examples:
+    ---------
+    >>> f = StreamingFilter(b, a)
+    >>> for chunk in chunks:   # chunk: samples x channels
+    ...     y = f.step(chunk)
+    >>> f.reset()
+    """
+    
+    def __init__(self, b: Any, a: Any = 1, zi: Any = None, method: str = 'direct'):
+        self.b, self.a = _filter_coefficients(b, a)
+        if method not in ('direct', 'fft'):
+            raise ValueError("method must be 'direct' or 'fft'")
+        if method == 'fft' and self.a.size > 1:
+            raise ValueError("method='fft' needs an FIR filter (a = 1)")
+        self.method = method
+        self._zi = zi
+        self.state = None
+        self._spectra = {}
+        self._work = None
+    
+    def reset(self) -> None:
+        """Forget the filter state (back to the initial conditions)"""
+        self.state = None
+    
+    def step(self, x: Any) -> np.ndarray:
+        """Filter the next chunk; returns an array of the chunk's shape"""
+        x = np.asarray(x)
+        if x.ndim not in (1, 2):
+            raise ValueError("Chunks must be vectors or samples x channels matrices")
+        if self.state is None:
+            self.state = _initial_conditions(self.b, self.a, x, [] if self._zi is None
+                                             else self._zi, 0)
+        if self.method == 'direct':
+            y, self.state = _lfilter(self.b, self.a, x, 0, self.state)
+            return y
+        return self._step_fft(x)
+    
+    def _step_fft(self, x: np.ndarray) -> np.ndarray:
+        """Overlap-add: blocks of L samples, each convolved in one FFT of nfft points"""
+        taps = self.b.size
+        n = x.shape[0]
+        channels = x.shape[1:]
+        if n == 0:
+            return np.zeros(x.shape, dtype=np.result_type(self.b, x, 1.0))
+        scale = 1 / self.a[0]
+        complex_data = np.iscomplexobj(x) or np.iscomplexobj(self.b)
+        
+        # Blocks of a few kernel lengths; L >= taps - 1 so block tails only
+        # reach into the next block
+        nfft = scipy.fft.next_fast_len(max(min(n, 8 * taps), taps - 1, 1) + taps - 1,
+                                       real=not complex_data)
+        L = nfft - taps + 1
+        blocks = -(-n // L)
+        key = (nfft, complex_data)
+        if key not in self._spectra:
+            transform = scipy.fft.fft if complex_data else scipy.fft.rfft
+            self._spectra[key] = transform(self.b * scale, nfft)
+        H = self._spectra[key].reshape((-1,) + (1,) * len(channels))
+        
+        # Work buffers, reused while the chunk size stays the same
+        dtype = np.result_type(self.b, x, 1.0)
+        shape = (blocks, L) + channels
+        if (self._work is None or self._work[0].shape != shape
+                or self._work[0].dtype != dtype):
+            self._work = (np.zeros(shape, dtype=dtype),
+                          np.zeros(((blocks + 1) * L,) + channels, dtype=dtype))
+        padded, out = self._work
+        padded.reshape((-1,) + channels)[:n] = x
+        padded.reshape((-1,) + channels)[n:] = 0
+        
+        if complex_data:
+            Y = scipy.fft.ifft(scipy.fft.fft(padded, nfft, axis=1) * H, axis=1)
+        else:
+            Y = scipy.fft.irfft(scipy.fft.rfft(padded, nfft, axis=1) * H, nfft, axis=1)
+        out[:blocks * L] = Y[:, :L].reshape((-1,) + channels)
+        out[blocks * L:] = 0
+        tails = Y[:, L:]
+        for i in range(blocks):
+            start = (i + 1) * L
+            out[start:start + taps - 1] += tails[i]
+        
+        # Overlap carried from the previous chunk
+        overlap = taps - 1
+        out[:overlap] += self.state
+        y = out[:n].copy()
+        self.state = out[n:n + overlap].copy()
+        return y
+
+
+def _window(name: str, n: int, sflag: str) -> np.ndarray:
+    """Window vector, computed once per (name, n, sflag) and shared read-only"""
+    if sflag not in ('symmetric', 'periodic'):
+        raise ValueError("sflag must be 'symmetric' or 'periodic'")
+    
+    def build():
+        w = scipy.signal.get_window(name, int(n), fftbins=sflag == 'periodic')
+        w.flags.writeable = False
+        return w
+    return _windows.get((name, int(n), sflag), build)
+
+
+def hann(n: int, sflag: str = 'symmetric') -> np.ndarray:
+    """
+    Hann (raised cosine) window
+    
+    Parameters:
+    -----------
+    n : int
+        Window length
+    sflag : str, optional
+        'symmetric' (default, for filter design) or 'periodic' (for
+        spectral analysis)
+    
+    Returns:
+    --------
+    ndarray
+        Window of n samples (cached and read-only; copy() to modify)
+    
+    Examples:
+    ---------
+    >>> w = hann(64)
+    >>> w = hann(256, 'periodic')
+    """
+    return _window('hann', n, sflag)
+
+
+def hamming(n: int, sflag: str = 'symmetric') -> np.ndarray:
+    """
+    Hamming window
+    
+    Parameters:
+    -----------
+    n : int
+        Window length
+    sflag : str, optional
+        'symmetric' (default) or 'periodic'
+    
+    Returns:
+    --------
+    ndarray
+        Window of n samples (cached and read-only; copy() to modify)
+    
+    Examples:
+    ---------
+    >>> w = hamming(64)
+    """
+    return _window('hamming', n, sflag)
+
+
+def buffer(x: Any, n: int, p: int = 0, opt: Any = None) -> np.ndarray:
+    """
+    Buffer a signal into a matrix of (overlapping) frames
+    
+    Frame k is column k of the result. When the frames fit in x exactly
+    (e.g. with 'nodelay'), the result is a read-only strided view of x
+    and no data is copied; otherwise x is copied once into a padded
+    buffer. Use .copy() before writing into the frames.
+    
+    Parameters:
+    -----------
+    x : array
+        Signal vector
+    n : int
+        Frame length
+    p : int, optional
+        Overlap between frames (negative: samples skipped between frames)
+    opt : str or array, optional
+        'nodelay' to start the first frame at x(1); by default the first
+        frame starts with p zeros, or with the p samples in opt
+    
+    Returns:
+    --------
+    ndarray
+        n x nframes matrix; the last frame is zero-padded
+    
+    Examples:
+    ---------
+    >>> Y = buffer(1:10, 4)  # 4 x 3
+    >>> Y = buffer(x, 256, 128, 'nodelay')  # 50% overlap, no copy
+    """
+    x = np.ravel(x)
+    if p >= n:
+        raise ValueError("The overlap p must be smaller than the frame length n")
+    step = n - p
+    if isinstance(opt, str):
+        if opt != 'nodelay':
+            raise ValueError("opt must be 'nodelay' or initial samples")
+        head = x[:0]
+    elif opt is None:
+        head = np.zeros(max(p, 0), dtype=x.dtype)
+    else:
+        head = np.ravel(opt)
+        if head.size != max(p, 0):
+            raise ValueError("opt must hold p initial samples")
+    length = head.size + x.size
+    frames = max(-(-(length - max(p, 0)) // step), 1)
+    needed = (frames - 1) * step + n
+    if head.size == 0 and needed <= x.size:
+        data = x
+    else:
+        data = np.zeros(needed, dtype=np.result_type(x, head))
+        data[:head.size] = head
+        data[head.size:length] = x[:needed - head.size]
+    return np.lib.stride_tricks.sliding_window_view(data[:needed], n)[::step].T
+
+
+# Frames are windowed and transformed in batches of about this many bytes,
+# which bounds the temporary memory for long signals
+_frame_batch_bytes = 64 * 1024 ** 2
+
+
+def _frame_setup(x: Any, window: Any, noverlap: Optional[int], nfft: Optional[int],
+                 default_window: Callable[[int], np.ndarray], default_overlap: float,
+                 default_nfft: Callable[[int], int]) -> Tuple[np.ndarray, int, int, np.dtype]:
+    """Window vector, hop size, FFT length and computation precision"""
+    if window is None:
+        window = default_window(x.shape[0])
+    elif np.ndim(window) == 0:
+        window = hamming(int(window))
+    window = np.asarray(window)
+    nwin = window.size
+    if nwin < 1 or nwin > x.shape[0]:
+        raise ValueError("The window must not be longer than the signal")
+    noverlap = int(default_overlap * nwin) if noverlap is None else int(noverlap)
+    if not 0 <= noverlap < nwin:
+        raise ValueError("noverlap must be smaller than the window length")
+    nfft = default_nfft(nwin) if nfft is None else int(nfft)
+    if nfft < nwin:
+        raise ValueError("nfft must be at least the window length")
+    # Single precision input is processed in single precision, as in MATLAB
+    single = getattr(x, 'dtype', None) in (np.float32, np.complex64)
+    dtype = np.dtype(np.float32 if single else np.float64)
+    return window.astype(dtype), nwin - noverlap, nfft, dtype
+
+
+def _frame_spectra(x: Any, window: np.ndarray, step: int, nfft: int, onesided: bool,
+                   dtype: np.dtype) -> Iterable[Tuple[int, np.ndarray]]:
+    """
+    Yield (first frame, spectra) for batches of frames of x
+    
+    Frames are strided views of x, so only the windowed batch is copied.
+    x is sliced one batch at a time, so memory maps and lazily loaded
+    variables are read piece by piece. Spectra run along the last axis.
+    """
+    nwin = window.size
+    frames = (x.shape[0] - nwin) // step + 1
+    batch = max(_frame_batch_bytes // (16 * nfft * int(np.prod(x.shape[1:], dtype=int))), 1)
+    transform = scipy.fft.rfft if onesided else scipy.fft.fft
+    for first in range(0, frames, batch):
+        count = min(batch, frames - first)
+        start = first * step
+        data = np.asarray(x[start:start + (count - 1) * step + nwin])
+        if data.dtype.kind not in 'fc':
+            data = data.astype(dtype)
+        views = np.lib.stride_tricks.sliding_window_view(data, nwin, axis=0)[::step]
+        yield first, transform(views * window, nfft, axis=-1)
+
+
+def _signal(x: Any) -> Any:
+    """Vectors as 1-D arrays; memory maps and lazy arrays are left unread"""
+    if not hasattr(x, 'shape') or not hasattr(x, '__getitem__'):
+        x = np.asarray(x)
+    if isinstance(x, np.ndarray) and x.ndim == 2 and 1 in x.shape:
+        x = x.ravel()
+    return x
+
+
+def _default_nfft(nwin: int) -> int:
+    return max(256, 2 ** nextpow2(nwin))
+
+
+def _eight_segments(length: int) -> np.ndarray:
+    # Eight segments with 50% overlap, MATLAB's default for spectrogram and pwelch
+    return hamming(max(int(np.floor(length / 4.5)), 1))
+
+
+def _frequencies(nfft: int, fs: Optional[float], count: int, first: int = 0) -> np.ndarray:
+    """Frequencies of FFT bins first..first+count-1 (rad/sample without fs)"""
+    scale = 2 * np.pi if fs is None else fs
+    return (first + np.arange(count)) * scale / nfft
+
+
+def _frame_times(frames: int, nwin: int, step: int, fs: Optional[float]) -> np.ndarray:
+    """Frame centers, in seconds (or samples without fs)"""
+    return (nwin / 2 + step * np.arange(frames)) / (1 if fs is None else fs)
+
+
+def spectrogram(x: Any, window: Any = None, noverlap: Optional[int] = None,
+                nfft: Optional[int] = None,
+                fs: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Spectrogram using a short-time Fourier transform
+    
+    Frames are strided views of x (no per-frame copies) and are
+    transformed in batches with one FFT call each. Long signals, memory
+    maps and lazily loaded variables are read one batch at a time; only
+    the result is held in memory. Single precision input gives a
+    complex64 result.
+    
+    Parameters:
+    -----------
+    x : array
+        Signal vector
+    window : int or array, optional
+        Window vector, or a length for a Hamming window (default: Hamming
+        window giving eight segments)
+    noverlap : int, optional
+        Samples of overlap between frames (default: 50%)
+    nfft : int, optional
+        FFT length (default: max(256, 2 ** nextpow2(len(window))))
+    fs : float, optional
+        Sampling frequency; without it f is in rad/sample and t in samples
+    
+    Returns:
+    --------
+    s : ndarray
+        STFT, frequencies x frames (one-sided for real x)
+    f : ndarray
+        Frequencies
+    t : ndarray
+        Frame centers
+    
+    Examples:
+    ---------
+    >>> s, f, t = spectrogram(x, 256, 128, 512, fs)
+    >>> imagesc(t, f, 20 * log10(abs(s)))
+    """
+    x = _signal(x)
+    if len(x.shape) != 1:
+        raise ValueError("spectrogram expects a vector")
+    window, step, nfft, dtype = _frame_setup(x, window, noverlap, nfft, _eight_segments,
+                                             0.5, _default_nfft)
+    onesided = not np.iscomplexobj(x[:1])
+    bins = nfft // 2 + 1 if onesided else nfft
+    frames = (x.shape[0] - window.size) // step + 1
+    s = np.empty((bins, frames), dtype=np.result_type(dtype, 1j))
+    for first, spectra in _frame_spectra(x, window, step, nfft, onesided, dtype):
+        s[:, first:first + spectra.shape[0]] = spectra.T
+    return s, _frequencies(nfft, fs, bins), _frame_times(frames, window.size, step, fs)
+
+
+def stft(x: Any, fs: Optional[float] = None, window: Any = None,
+         noverlap: Optional[int] = None,
+         nfft: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Short-time Fourier transform, two-sided and centered
+    
+    Computed like spectrogram (strided frames, batched FFTs, chunked
+    reading), with MATLAB's stft defaults and frequency layout.
+    
+    Parameters:
+    -----------
+    x : array
+        Signal vector
+    fs : float, optional
+        Sampling frequency; without it f is in rad/sample and t in samples
+    window : int or array, optional
+        Window vector, or a length for a Hamming window (default: periodic
+        Hann window of 128 samples)
+    noverlap : int, optional
+        Samples of overlap between frames (default: 75%)
+    nfft : int, optional
+        FFT length (default: window length)
+    
+    Returns:
+    --------
+    s : ndarray
+        STFT, frequencies x frames, frequencies centered on zero
+    f : ndarray
+        Frequencies, (-fs/2, fs/2]
+    t : ndarray
+        Frame centers
+    
+    Examples:
+    ---------
+    >>> s, f, t = stft(x, fs)
+    >>> s, f, t = stft(x, fs, hann(512, 'periodic'), 384)
+    """
+    x = _signal(x)
+    if len(x.shape) != 1:
+        raise ValueError("stft expects a vector")
+    window, step, nfft, dtype = _frame_setup(
+        x, window, noverlap, nfft, lambda length: hann(min(128, length), 'periodic'),
+        0.75, lambda nwin: nwin)
+    frames = (x.shape[0] - window.size) // step + 1
+    s = np.empty((nfft, frames), dtype=np.result_type(dtype, 1j))
+    for first, spectra in _frame_spectra(x, window, step, nfft, False, dtype):
+        s[:, first:first + spectra.shape[0]] = spectra.T
+    # Bins -ceil(nfft/2)+1 .. floor(nfft/2), i.e. (-pi, pi]
+    first_bin = -((nfft - 1) // 2)
+    order = np.arange(first_bin, first_bin + nfft) % nfft
+    return (s[order], _frequencies(nfft, fs, nfft, first_bin),
+            _frame_times(frames, window.size, step, fs))
+
+
+def pwelch(x: Any, window: Any = None, noverlap: Optional[int] = None,
+           nfft: Optional[int] = None,
+           fs: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch's power spectral density estimate
+    
+    Segment periodograms are computed in batches from strided views of x
+    and accumulated, so memory stays bounded however long x is (memory
+    maps and lazily loaded variables are read one batch at a time). The
+    columns of a matrix are separate channels.
+    
+    Parameters:
+    -----------
+    x : array
+        Signal vector, or samples x channels matrix
+    window : int or array, optional
+        Window vector, or a length for a Hamming window (default: Hamming
+        window giving eight segments)
+    noverlap : int, optional
+        Samples of overlap between segments (default: 50%)
+    nfft : int, optional
+        FFT length (default: max(256, 2 ** nextpow2(len(window))))
+    fs : float, optional
+        Sampling frequency; without it f is in rad/sample and the PSD per
+        rad/sample
+    
+    Returns:
+    --------
+    pxx : ndarray
+        PSD (one-sided for real x); a column per channel for matrices
+    f : ndarray
+        Frequencies
+    
+    Examples:
+    ---------
+    >>> pxx, f = pwelch(x, 1024, 512, 1024, fs)
+    >>> plot(f, 10 * log10(pxx))
+    """
+    x = _signal(x)
+    if len(x.shape) not in (1, 2):
+        raise ValueError("pwelch expects a vector or a matrix")
+    window, step, nfft, dtype = _frame_setup(x, window, noverlap, nfft, _eight_segments,
+                                             0.5, _default_nfft)
+    onesided = not np.iscomplexobj(x[:1])
+    total = 0.0
+    frames = 0
+    for _, spectra in _frame_spectra(x, window, step, nfft, onesided, dtype):
+        power = spectra.real ** 2 + spectra.imag ** 2
+        total = total + power.sum(axis=0, dtype=np.float64)
+        frames += spectra.shape[0]
+    
+    scale = 2 * np.pi if fs is None else fs
+    pxx = total / (frames * scale * np.sum(window.astype(np.float64) ** 2))
+    if onesided:
+        # Fold the negative frequencies onto the positive ones
+        pxx[..., 1:nfft - nfft // 2] *= 2
+    bins = pxx.shape[-1]
+    return pxx.T.astype(dtype, copy=False), _frequencies(nfft, fs, bins)
@@ -2,12 +2,224 @@
 MATLAB-style workspace management functions
 """
 
+import ast
+import copy
+import json
+import mmap
+import os
+import pickle
+import shutil
+import struct
 import sys
+import tempfile
+import types
+import weakref
+import zlib
 import numpy as np
-from typing import Optional
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
+from .core import Range, _repeats
 
-def who(pattern: Optional[str] = None) -> None:
+
+class VariableInfo(NamedTuple):
+    """Memory information about a single workspace variable"""
+    name: str
+    size: tuple
+    bytes: int
+    class_name: str
+    attributes: Tuple[str, ...]
+    buffer_id: int
+    buffer_bytes: int
+
+
+class WorkspaceInfo(list):
+    """
+    Structured result of whos(): a list of VariableInfo records
+    
+    Buffers shared between variables (views of the same base array, or one
+    object bound to several names) are counted once in the totals.
+    Memory-mapped buffers are reported separately, since they live in the
+    page cache rather than in process memory.
+    """
+    
+    # Filled in by whos() for interpreter workspaces
+    snapshot_count = 0
+    snapshot_bytes = 0
+    
+    @property
+    def total_bytes(self) -> int:
+        """Resident bytes, de-duplicated across shared buffers"""
+        return self._unique_bytes(mapped=False)
+    
+    @property
+    def mapped_bytes(self) -> int:
+        """Bytes backed by memory-mapped files, de-duplicated"""
+        return self._unique_bytes(mapped=True)
+    
+    def _unique_bytes(self, mapped: bool) -> int:
+        seen = {}
+        for info in self:
+            if ('memmap' in info.attributes) == mapped:
+                seen[info.buffer_id] = info.buffer_bytes
+        return sum(seen.values())
+    
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """Return the records as plain dicts (e.g. for logging or JSON)"""
+        return [info._asdict() for info in self]
+    
+    def __str__(self) -> str:
+        lines = [f"{'Name':<15} {'Size':<20} {'Bytes':>14}  {'Class':<22} {'Attributes'}",
+                 "-" * 85]
+        for info in self:
+            lines.append(f"{info.name:<15} {_format_size(info.size):<20} {info.bytes:>14}  "
+                         f"{info.class_name:<22} {', '.join(info.attributes)}")
+        lines.append("")
+        lines.append(f"Total: {len(self)} variables, {_format_bytes(self.total_bytes)} resident"
+                     + (f", {_format_bytes(self.mapped_bytes)} memory-mapped"
+                        if self.mapped_bytes else ""))
+        if self.snapshot_bytes or self.snapshot_count:
+            lines.append(f"Snapshots: {self.snapshot_count}, "
+                         f"{_format_bytes(self.snapshot_bytes)} held only by snapshots and undo history")
+        return "\n".join(lines)
+    
+    def __repr__(self) -> str:
+        return (f"<WorkspaceInfo: {len(self)} variables, "
+                f"{_format_bytes(self.total_bytes)} resident>")
+
+
+def _format_size(size: tuple) -> str:
+    return f"{size}" if size else "-"
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def _is_sparse(value: Any) -> bool:
+    # Avoid importing scipy just to answer "no"
+    return type(value).__module__.startswith('scipy.sparse')
+
+
+def _is_broadcast(value: np.ndarray) -> bool:
+    """Read-only view repeating its data (lazy meshgrid or repmat)"""
+    return not value.flags.writeable and _repeats(value)
+
+
+def _buffer_root(arr: np.ndarray) -> Any:
+    """Follow .base to the object that actually owns the memory"""
+    root = arr
+    while isinstance(root, np.ndarray) and root.base is not None:
+        root = root.base
+    return root
+
+
+def _buffer_nbytes(root: Any, fallback: int) -> int:
+    if isinstance(root, np.ndarray):
+        return root.nbytes
+    try:
+        return memoryview(root).nbytes
+    except TypeError:
+        return fallback
+
+
+def _sparse_nbytes(value: Any) -> int:
+    """Storage of a sparse matrix; O(1) except for LIL (O(rows))"""
+    if value.format == 'dok':
+        # A dict of (row, col) tuples to scalars
+        nnz = value.nnz
+        if not nnz:
+            return sys.getsizeof(value)
+        key, item = next(iter(value.items()))
+        return (sys.getsizeof(value)
+                + nnz * (sys.getsizeof(key) + sum(sys.getsizeof(k) for k in key)
+                         + sys.getsizeof(item)))
+    if value.format == 'lil':
+        # Object arrays holding one list of columns and one of values per row
+        nbytes = value.rows.nbytes + value.data.nbytes
+        nbytes += sum(sys.getsizeof(row) for row in value.rows)
+        nbytes += sum(sys.getsizeof(row) for row in value.data)
+        if value.nnz:
+            row = next(r for r in value.data if r)
+            nbytes += value.nnz * (sys.getsizeof(0) + sys.getsizeof(row[0]))
+        return nbytes
+    # Count the stored components; COO exposes row/col as views of coords
+    components = []
+    for group in (('indptr', 'indices'), ('coords',), ('row', 'col'), ('offsets',)):
+        if all(hasattr(value, attr) for attr in group):
+            components = [getattr(value, attr) for attr in group]
+            break
+    components.append(getattr(value, 'data', None))
+    nbytes = 0
+    for component in components:
+        for part in (component if isinstance(component, tuple) else (component,)):
+            if isinstance(part, np.ndarray):
+                nbytes += part.nbytes
+    return nbytes or sys.getsizeof(value)
+
+
+def _variable_info(name: str, value: Any) -> VariableInfo:
+    """Describe one variable; O(1) in the size of the array"""
+    if isinstance(value, np.ndarray):
+        root = _buffer_root(value)
+        attributes = []
+        if isinstance(root, mmap.mmap) or isinstance(value, np.memmap):
+            attributes.append('memmap')
+        elif value.base is not None:
+            attributes.append('view')
+        if np.iscomplexobj(value):
+            attributes.append('complex')
+        return VariableInfo(name, value.shape, value.nbytes,
+                            f"ndarray ({value.dtype})", tuple(attributes),
+                            id(root), _buffer_nbytes(root, value.nbytes))
+    
+    if _is_sparse(value):
+        nbytes = _sparse_nbytes(value)
+        attributes = ('sparse', 'complex') if np.iscomplexobj(value) else ('sparse',)
+        return VariableInfo(name, value.shape, nbytes,
+                            f"{type(value).__name__} ({value.dtype})", attributes,
+                            id(value), nbytes)
+    
+    if isinstance(value, _Deferred):
+        return value.info(name)
+    
+    if isinstance(value, Range):
+        nbytes = sys.getsizeof(value)
+        return VariableInfo(name, value.shape, nbytes, f"Range ({value.dtype})", ('lazy',),
+                            id(value), nbytes)
+    
+    if isinstance(value, (list, tuple)):
+        size = (len(value),)
+    else:
+        size = ()
+    try:
+        nbytes = sys.getsizeof(value)
+    except TypeError:
+        nbytes = 0
+    return VariableInfo(name, size, nbytes, type(value).__name__, (),
+                        id(value), nbytes)
+
+
+def _user_variables(variables: Dict[str, Any], pattern: Optional[str]) -> List[str]:
+    """Names of user variables, skipping private names, modules and functions"""
+    hidden = variables.hidden if isinstance(variables, Workspace) else ()
+    names = []
+    for name, value in variables.items():
+        if name.startswith('_') or name in hidden:
+            continue
+        if isinstance(value, (types.ModuleType, type)) or callable(value):
+            continue
+        if pattern is None or pattern in name:
+            names.append(name)
+    return sorted(names)
+
+
+def who(pattern: Optional[str] = None,
+        variables: Optional[Dict[str, Any]] = None) -> None:
     """
     Print list of variables in current workspace
     
@@ -15,6 +227,8 @@ def who(pattern: Optional[str] = None) -> None:
     -----------
     pattern : str, optional
         Pattern to filter
+    variables : dict, optional
+        Namespace to inspect (default: the caller's local variables)
     
     Examples:
     ---------
@@ -22,58 +236,80 @@ def who(pattern: Optional[str] = None) -> None:
     >>> B = ones(2, 2)
     >>> who()
     """
-    frame = sys._getframe(1)
-    variables = frame.f_locals
+    if variables is None:
+        variables = sys._getframe(1).f_locals
     
-    var_names = []
-    for name, value in variables.items():
-        if not name.startswith('_'):
-            if pattern is None or pattern in name:
-                var_names.append(name)
+    var_names = _user_variables(variables, pattern)
     
     if var_names:
         print("Variables in workspace:")
-        for name in sorted(var_names):
+        for name in var_names:
             print(f"  {name}")
     else:
         print("No variables.")
 
 
-def whos(pattern: Optional[str] = None) -> None:
+def whos(pattern: Optional[Union[str, 'MatFile']] = None,
+         variables: Optional[Dict[str, Any]] = None,
+         verbose: bool = True) -> WorkspaceInfo:
     """
     Print detailed information about variables
     
+    Reports the size, bytes, class and attributes of each variable. Arrays
+    that are views of another buffer are flagged 'view', memory-mapped
+    arrays 'memmap' and arrays spilled to disk by a memory budget 'spilled'.
+    The total counts each underlying buffer once. The scan
+    never touches array data, so it is cheap even for huge arrays.
+    
     Parameters:
     -----------
-    pattern : str, optional
-        Pattern to filter
+    pattern : str or MatFile, optional
+        Pattern to filter, or a matfile() object to list from its headers
+    variables : dict, optional
+        Namespace to inspect (default: the caller's local variables)
+    verbose : bool, optional
+        Print the table (default: True)
+    
+    Returns:
+    --------
+    WorkspaceInfo
+        List of VariableInfo records with total_bytes / mapped_bytes totals
     
     Examples:
     ---------
     >>> A = zeros(3, 4)
     >>> B = ones(2, 2)
     >>> whos()
+    >>> info = whos(verbose=False)
+    >>> info.total_bytes
+    >>> whos(matfile('results.mat'))
     """
-    frame = sys._getframe(1)
-    variables = frame.f_locals
+    if isinstance(pattern, MatFile):
+        info = pattern._whos_info()
+        if verbose:
+            print(info)
+        return info
     
-    print(f"{'Name':<15} {'Size':<20} {'Type':<15}")
-    print("-" * 50)
+    if variables is None:
+        variables = sys._getframe(1).f_locals
     
-    for name, value in sorted(variables.items()):
-        if not name.startswith('_'):
-            if pattern is None or pattern in name:
-                if isinstance(value, np.ndarray):
-                    size_str = f"{value.shape}"
-                    type_str = f"ndarray ({value.dtype})"
-                elif isinstance(value, (list, tuple)):
-                    size_str = f"({len(value)},)"
-                    type_str = type(value).__name__
-                else:
-                    size_str = "-"
-                    type_str = type(value).__name__
-                
-                print(f"{name:<15} {size_str:<20} {type_str:<15}")
+    spilled = variables.spilled if isinstance(variables, Workspace) else ()
+    info = WorkspaceInfo()
+    for name in _user_variables(variables, pattern):
+        record = _variable_info(name, _peek(variables, name))
+        if name in spilled:
+            record = record._replace(attributes=record.attributes + ('spilled',))
+        info.append(record)
+    if isinstance(variables, Workspace) and (variables.snapshots() or variables._history):
+        info.snapshot_count = len(variables.snapshots())
+        info.snapshot_bytes = variables.snapshot_bytes()
+    
+    if verbose:
+        if info:
+            print(info)
+        else:
+            print("No variables.")
+    return info
 
 
 def clear(*var_names) -> None:
@@ -96,7 +332,7 @@ def clear(*var_names) -> None:
     
     if not var_names:
         # Delete all user variables
-        to_delete = [name for name in variables.keys() if not name.startswith('_')]
+        to_delete = _user_variables(variables, None)
         for name in to_delete:
             del variables[name]
         print(f"{len(to_delete)} variables deleted.")
@@ -114,6 +350,1263 @@ def clear(*var_names) -> None:
             print(f"{deleted} variables deleted.")
 
 
+# Binary workspace file layout (all integers little-endian):
+#   [0:8]   magic
+#   [8:16]  offset of the JSON variable directory
+#   [16:24] length of the JSON variable directory
+#   data blocks, each starting on a _ALIGN boundary so they can be memory-mapped
+#   the directory itself (always the last thing written)
+# -append writes new blocks after the current end of file and then updates the
+# header, so blocks that earlier load() calls have mapped are never touched.
+_MAGIC = b'PLMWS\x01\x00\x00'
+_HEADER = struct.Struct('<8sQQ')
+_ALIGN = 64
+
+
+def _encode_variable(value: Any, compress: bool) -> Tuple[Dict[str, Any], Any]:
+    """Return (directory entry, buffer to write) for one variable"""
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject and value.dtype.fields is None:
+        if value.flags.f_contiguous and not value.flags.c_contiguous:
+            order, data = 'F', value.T
+        else:
+            order, data = 'C', np.ascontiguousarray(value)
+        entry = {'kind': 'array', 'dtype': np.lib.format.dtype_to_descr(value.dtype),
+                 'shape': list(value.shape), 'order': order}
+        # Bytes of the data (a uint8 view works for every dtype, e.g. datetime64)
+        buffer = data.reshape(-1).view(np.uint8) if data.size else b''
+    else:
+        entry = {'kind': 'pickle'}
+        buffer = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    entry['nbytes'] = len(buffer)
+    if compress:
+        buffer = zlib.compress(buffer, 1)
+        entry['codec'] = 'zlib'
+    entry['stored'] = len(buffer)
+    return entry, buffer
+
+
+def _write_block(f: Any, buffer: Any) -> int:
+    """Write buffer at the next aligned offset and return that offset"""
+    end = f.seek(0, os.SEEK_END)
+    offset = end + (-end % _ALIGN)
+    f.seek(offset)
+    f.write(buffer)
+    return offset
+
+
+def _block_unchanged(f: Any, old: Optional[Dict[str, Any]],
+                     entry: Dict[str, Any], buffer: Any) -> bool:
+    """Compare a variable with the block already stored in the file"""
+    if old is None or {k: v for k, v in old.items() if k != 'offset'} != entry:
+        return False
+    if not entry['stored']:
+        return True
+    stored = np.memmap(f, dtype=np.uint8, mode='r', offset=old['offset'],
+                       shape=(entry['stored'],))
+    return np.array_equal(stored, np.frombuffer(buffer, dtype=np.uint8))
+
+
+def _write_directory(f: Any, directory: Dict[str, Dict[str, Any]]) -> None:
+    payload = json.dumps(directory).encode('utf-8')
+    offset = _write_block(f, payload)
+    f.truncate()
+    f.seek(0)
+    f.write(_HEADER.pack(_MAGIC, offset, len(payload)))
+
+
+def _read_directory(filename: str) -> Dict[str, Dict[str, Any]]:
+    with open(filename, 'rb') as f:
+        magic, offset, length = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"'{filename}' is not a workspace file written by save()")
+        f.seek(offset)
+        return json.loads(f.read(length).decode('utf-8'))
+
+
+def _decode_variable(filename: str, entry: Dict[str, Any], mmap_mode: Optional[str]) -> Any:
+    if entry['kind'] == 'array':
+        dtype = np.lib.format.descr_to_dtype(entry['dtype'])
+        shape = tuple(entry['shape'])
+        # Stored data is C-ordered; Fortran arrays were written transposed
+        stored_shape = shape[::-1] if entry['order'] == 'F' else shape
+        if entry.get('codec') is None and mmap_mode is not None and entry['nbytes']:
+            data = np.memmap(filename, dtype=dtype, mode=mmap_mode,
+                             offset=entry['offset'], shape=stored_shape)
+        else:
+            data = np.frombuffer(bytearray(_read_block(filename, entry)),
+                                 dtype=dtype).reshape(stored_shape)
+        return data.T if entry['order'] == 'F' else data
+    return pickle.loads(_read_block(filename, entry))
+
+
+def _read_block(filename: str, entry: Dict[str, Any]) -> bytes:
+    with open(filename, 'rb') as f:
+        f.seek(entry['offset'])
+        raw = f.read(entry['stored'])
+    return zlib.decompress(raw) if entry.get('codec') == 'zlib' else raw
+
+
+class LoadedWorkspace(Mapping):
+    """
+    Read-only mapping over the variables of a file written by save()
+    
+    Variables are decoded on first access and cached; uncompressed arrays
+    are memory-mapped, so pages are read from disk only when touched.
+    """
+    
+    def __init__(self, filename: str, names: Optional[List[str]] = None,
+                 mmap_mode: Optional[str] = 'c'):
+        self.filename = filename
+        self.mmap_mode = mmap_mode
+        directory = _read_directory(filename)
+        if names:
+            missing = [name for name in names if name not in directory]
+            if missing:
+                raise KeyError(f"variables not found in '{filename}': {', '.join(missing)}")
+            directory = {name: directory[name] for name in names}
+        self._directory = directory
+        self._cache: Dict[str, Any] = {}
+    
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._cache:
+            self._cache[name] = _decode_variable(self.filename, self._directory[name],
+                                                 self.mmap_mode)
+        return self._cache[name]
+    
+    def __iter__(self):
+        return iter(self._directory)
+    
+    def __len__(self) -> int:
+        return len(self._directory)
+    
+    def __repr__(self) -> str:
+        return f"<LoadedWorkspace '{self.filename}': {', '.join(self._directory)}>"
+
+
+class _Deferred:
+    """Workspace placeholder for a variable load() reads on first use"""
+    
+    __slots__ = ('source', 'name')
+    
+    def __init__(self, source: LoadedWorkspace, name: str):
+        self.source = source
+        self.name = name
+    
+    def resolve(self) -> Any:
+        return self.source[self.name]
+    
+    def info(self, name: str) -> VariableInfo:
+        """whos record from the file's directory, without reading the data"""
+        entry = self.source._directory[self.name]
+        if entry['kind'] == 'array':
+            size = tuple(entry['shape'])
+            class_name = f"ndarray ({np.lib.format.descr_to_dtype(entry['dtype'])})"
+        else:
+            size, class_name = (), 'pickled'
+        return VariableInfo(name, size, entry['nbytes'], class_name, ('deferred',), id(self), 0)
+    
+    def __repr__(self) -> str:
+        return f"<'{self.name}' in '{self.source.filename}', not read yet>"
+
+
+def save(filename: str, *args: str, compress: Union[bool, List[str]] = False,
+         variables: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Save workspace variables to a binary file
+    
+    Arrays are written uncompressed and 64-byte aligned so that load() can
+    memory-map them. Other values are pickled.
+    
+    Parameters:
+    -----------
+    filename : str
+        File to write
+    *args : str
+        Variable names to save (if omitted, all variables). Pass '-append'
+        to update an existing file: only variables whose contents changed
+        are rewritten, everything else stays in place. Replaced data is left
+        as dead space until the next save without '-append'.
+    compress : bool or list of str, optional
+        Compress all variables (True) or only the named ones with zlib
+    variables : dict, optional
+        Namespace to save from (default: the caller's local variables)
+    
+    Examples:
+    ---------
+    >>> save('session.ws')
+    >>> save('session.ws', 'A', 'B')
+    >>> save('session.ws', '-append', 'C')
+    >>> save('session.ws', compress=['labels'])
+    """
+    if variables is None:
+        variables = sys._getframe(1).f_locals
+    
+    append = '-append' in args
+    names = [name for name in args if not name.startswith('-')]
+    if not names:
+        names = _user_variables(variables, None)
+    
+    to_save = {}
+    for name in names:
+        if name in variables:
+            value = _peek(variables, name)
+            to_save[name] = value.resolve() if isinstance(value, _Deferred) else value
+        else:
+            print(f"Warning: variable '{name}' not found.")
+    
+    def should_compress(name: str) -> bool:
+        return compress is True or (not isinstance(compress, bool) and name in compress)
+    
+    if append and os.path.exists(filename):
+        directory = _read_directory(filename)
+        with open(filename, 'r+b') as f:
+            changed = False
+            for name, value in to_save.items():
+                entry, buffer = _encode_variable(value, should_compress(name))
+                if _block_unchanged(f, directory.get(name), entry, buffer):
+                    continue
+                entry['offset'] = _write_block(f, buffer)
+                directory[name] = entry
+                changed = True
+            if changed:
+                _write_directory(f, directory)
+        return
+    
+    # Write to a temporary file so a failed save never clobbers the old one
+    tmp = f"{filename}.tmp{os.getpid()}"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, 0, 0))
+            directory = {}
+            for name, value in to_save.items():
+                entry, buffer = _encode_variable(value, should_compress(name))
+                entry['offset'] = _write_block(f, buffer)
+                directory[name] = entry
+            _write_directory(f, directory)
+        os.replace(tmp, filename)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load(filename: str, *names: str, variables: Optional[Dict[str, Any]] = None,
+         mmap_mode: Optional[str] = 'c') -> LoadedWorkspace:
+    """
+    Load variables saved with save() into the workspace
+    
+    Uncompressed arrays are memory-mapped copy-on-write: loading is
+    instant, data is read on first access, and modifying a loaded array
+    never changes the file. In an interpreter workspace no variable is
+    even decoded (or unpickled) until a command first uses it; whos()
+    lists such variables as 'deferred'.
+    
+    Parameters:
+    -----------
+    filename : str
+        File to read
+    *names : str
+        Variables to load (if omitted, all variables)
+    variables : dict, optional
+        Namespace to load into (default: the caller's local variables)
+    mmap_mode : str, optional
+        np.memmap mode for arrays ('c', 'r', 'r+'), or None to read into memory
+    
+    Returns:
+    --------
+    LoadedWorkspace
+        Lazy mapping of the loaded variables
+    
+    Examples:
+    ---------
+    >>> load('session.ws')
+    >>> load('session.ws', 'A')
+    >>> S = load('session.ws'); S['A']
+    """
+    if variables is None:
+        variables = sys._getframe(1).f_locals
+    
+    loaded = LoadedWorkspace(filename, list(names), mmap_mode)
+    for name in loaded:
+        if isinstance(variables, Workspace):
+            variables.defer(name, _Deferred(loaded, name))
+        else:
+            variables[name] = loaded[name]
+    return loaded
+
+
+# MAT-file (level 5) constants: array classes and on-disk data types
+_MX_CLASSES = {1: 'cell', 2: 'struct', 3: 'object', 4: 'char', 5: 'sparse',
+               6: 'double', 7: 'single', 8: 'int8', 9: 'uint8', 10: 'int16',
+               11: 'uint16', 12: 'int32', 13: 'uint32', 14: 'int64', 15: 'uint64'}
+_MX_DTYPES = {6: 'f8', 7: 'f4', 8: 'i1', 9: 'u1', 10: 'i2', 11: 'u2',
+              12: 'i4', 13: 'u4', 14: 'i8', 15: 'u8'}
+_MX_DTYPES_BY_NAME = {_MX_CLASSES[c]: dtype for c, dtype in _MX_DTYPES.items()}
+_MX_DTYPES_BY_NAME['logical'] = '?'
+# v7.3 classes read through h5py: numeric arrays by slice, the rest whole
+_H5_NUMERIC = set(_MX_DTYPES_BY_NAME) - {'logical'}
+_H5_DECODED = {'cell', 'struct', 'char', 'sparse'}
+_MI_DTYPES = {1: 'i1', 2: 'u1', 3: 'i2', 4: 'u2', 5: 'i4', 6: 'u4',
+              7: 'f4', 9: 'f8', 12: 'i8', 13: 'u8'}
+_MI_MATRIX = 14
+_MI_COMPRESSED = 15
+
+
+def _read_tag(buf: Any, pos: int, endian: str) -> Tuple[int, int, int, int]:
+    """Return (type, nbytes, data position, next element position)"""
+    word, = struct.unpack_from(endian + 'I', buf, pos)
+    if word >> 16:
+        # Small data element: type and size packed into one word
+        return word & 0xFFFF, word >> 16, pos + 4, pos + 8
+    mtype, nbytes = struct.unpack_from(endian + 'II', buf, pos)
+    return mtype, nbytes, pos + 8, pos + 8 + nbytes + (-nbytes % 8)
+
+
+def _parse_matrix_header(buf: Any, endian: str) -> Dict[str, Any]:
+    """Parse flags, dimensions, name and data tags of a miMATRIX payload"""
+    _, _, pos, nxt = _read_tag(buf, 0, endian)
+    flags, = struct.unpack_from(endian + 'I', buf, pos)
+    _, nbytes, pos, nxt = _read_tag(buf, nxt, endian)
+    shape = struct.unpack_from(endian + f'{nbytes // 4}i', buf, pos)
+    _, nbytes, pos, nxt = _read_tag(buf, nxt, endian)
+    header = {'name': bytes(buf[pos:pos + nbytes]).decode('ascii'),
+              'class': flags & 0xFF, 'shape': list(shape),
+              'complex': bool(flags & 0x800), 'logical': bool(flags & 0x200)}
+    if header['class'] in _MX_DTYPES:
+        parts = ['real', 'imag'] if header['complex'] else ['real']
+        for part in parts:
+            mtype, nbytes, pos, nxt = _read_tag(buf, nxt, endian)
+            header[part] = [mtype, nbytes, pos]
+    return header
+
+
+def _index_mat5(filename: str) -> Tuple[bytes, str, Dict[str, Dict[str, Any]]]:
+    """Read the file header and the header of every variable, skipping data"""
+    entries = {}
+    with open(filename, 'rb') as f:
+        file_header = f.read(128)
+        endian = '<' if file_header[126:128] == b'IM' else '>'
+        size = os.fstat(f.fileno()).st_size
+        pos = 128
+        while pos + 8 <= size:
+            f.seek(pos)
+            mtype, nbytes = struct.unpack(endian + 'II', f.read(8))
+            if mtype == _MI_MATRIX:
+                header = _parse_matrix_header(f.read(min(nbytes, 4096)), endian)
+                for part in ('real', 'imag'):
+                    if part in header:
+                        header[part][2] += pos + 8
+                header['compressed'] = False
+                length = 8 + nbytes + (-nbytes % 8)
+            elif mtype == _MI_COMPRESSED:
+                header = _parse_compressed_header(f, nbytes, endian)
+                header['compressed'] = True
+                length = 8 + nbytes
+            else:
+                pos += 8 + nbytes
+                continue
+            header['element'] = [pos, length]
+            entries[header['name']] = header
+            pos += length
+    return file_header, endian, entries
+
+
+def _parse_compressed_header(f: Any, nbytes: int, endian: str) -> Dict[str, Any]:
+    """Decompress just enough of a miCOMPRESSED element to parse its header"""
+    decompressor = zlib.decompressobj()
+    buf = b''
+    remaining = nbytes
+    while True:
+        chunk = f.read(min(remaining, 512))
+        remaining -= len(chunk)
+        buf += decompressor.decompress(chunk)
+        try:
+            _, _, _, _ = _read_tag(buf, 0, endian)
+            header = _parse_matrix_header(buf[8:], endian)
+        except struct.error:
+            if not remaining:
+                raise
+            continue
+        # Data offsets inside a compressed stream cannot be mapped
+        for part in ('real', 'imag'):
+            header.pop(part, None)
+        return header
+
+
+class MatVariable:
+    """
+    Lazy handle to one variable of a MAT-file
+    
+    Indexing reads only what is needed: for uncompressed numeric data the
+    result is a view of a memory map of the file.
+    """
+    
+    def __init__(self, matfile: 'MatFile', name: str):
+        self._matfile = matfile
+        self.name = name
+        self._entry = matfile._entries[name]
+        self.shape = tuple(self._entry['shape'])
+        self.class_name = self._entry['class_name']
+    
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+    
+    @property
+    def dtype(self) -> Optional[np.dtype]:
+        return self._entry.get('dtype')
+    
+    def __len__(self) -> int:
+        return self.shape[0] if self.shape else 0
+    
+    def __getitem__(self, key: Any) -> Any:
+        return self._matfile._read(self.name, key)
+    
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        arr = np.asarray(self._matfile._read(self.name, None))
+        return arr.astype(dtype) if dtype is not None else arr
+    
+    def __repr__(self) -> str:
+        return f"<MatVariable '{self.name}': {_format_size(self.shape)} {self.class_name}>"
+
+
+class MatFile(Mapping):
+    """
+    Lazy reader for MATLAB .mat files, created by matfile()
+    
+    The variable directory is indexed once when the file is opened;
+    variables are read on access. Level 5 files are parsed directly,
+    v7.3 (HDF5) files need h5py: numeric variables are read by slice, while
+    cells, structs, chars and sparse matrices are decoded whole. MATLAB
+    objects such as strings and tables are listed but cannot be read.
+    """
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            text = f.read(116)
+        self._h5 = None
+        if text.startswith(b'MATLAB 7.3'):
+            self._entries = self._index_h5()
+        else:
+            self._file_header, self._endian, self._entries = _index_mat5(filename)
+            for entry in self._entries.values():
+                entry['class_name'] = _MX_CLASSES.get(entry['class'], 'unknown')
+                if entry['logical']:
+                    entry['class_name'] = 'logical'
+                    entry['dtype'] = np.dtype(bool)
+                elif entry['class'] in _MX_DTYPES:
+                    entry['dtype'] = np.dtype(self._endian + _MX_DTYPES[entry['class']])
+                    if entry['complex']:
+                        entry['dtype'] = np.result_type(entry['dtype'], np.complex64)
+    
+    def _index_h5(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("Reading MATLAB v7.3 files requires h5py (pip install h5py)")
+        self._h5 = h5py.File(self.filename, 'r')
+        entries = {}
+        for name, obj in self._h5.items():
+            if name.startswith('#'):
+                continue
+            class_name = _h5_class(obj)
+            entry = {'class_name': class_name, 'compressed': False,
+                     'complex': False, 'shape': [], 'nbytes': 0}
+            if isinstance(obj, h5py.Dataset):
+                # HDF5 stores MATLAB's column-major data with dimensions reversed
+                entry['shape'] = list(obj.shape[::-1])
+                entry['compressed'] = obj.compression is not None
+                entry['nbytes'] = obj.size * obj.dtype.itemsize
+                if obj.attrs.get('MATLAB_empty', 0):
+                    # Empty arrays store their dimensions as the data
+                    entry['shape'] = [int(n) for n in np.ravel(obj[()])]
+                    entry['empty'] = True
+                if obj.dtype.names == ('real', 'imag'):
+                    entry['complex'] = True
+                    entry['dtype'] = np.result_type(obj.dtype['real'], np.complex64)
+                elif class_name == 'logical':
+                    entry['dtype'] = np.dtype(bool)
+                elif class_name in _H5_NUMERIC:
+                    entry['dtype'] = obj.dtype
+            elif 'MATLAB_sparse' in obj.attrs:
+                entry['class_name'] = 'sparse'
+                entry['shape'] = [int(obj.attrs['MATLAB_sparse']), obj['jc'].size - 1]
+                entry['nbytes'] = sum(obj[part].size * obj[part].dtype.itemsize
+                                      for part in ('data', 'ir', 'jc') if part in obj)
+            elif class_name == 'struct':
+                entry['shape'] = [1, 1]
+            if 'dtype' not in entry and entry['class_name'] not in _H5_DECODED:
+                # MATLAB objects (string, table, classdef) are opaque in HDF5
+                entry['unsupported'] = True
+            entries[name] = entry
+        return entries
+    
+    def __getitem__(self, name: str) -> MatVariable:
+        if name not in self._entries:
+            raise KeyError(f"variable '{name}' not found in '{self.filename}'")
+        return MatVariable(self, name)
+    
+    def __getattr__(self, name: str) -> MatVariable:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError as e:
+            raise AttributeError(str(e))
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __repr__(self) -> str:
+        return f"<MatFile '{self.filename}': {', '.join(self._entries)}>"
+    
+    def close(self) -> None:
+        """Release the underlying HDF5 handle, if any"""
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+    
+    def _whos_info(self) -> WorkspaceInfo:
+        """whos()-style listing built from the variable headers alone"""
+        info = WorkspaceInfo()
+        for i, (name, entry) in enumerate(self._entries.items()):
+            dtype = entry.get('dtype')
+            # Without a numeric type the best cheap estimate is the size on disk
+            nbytes = entry['nbytes'] if 'nbytes' in entry else entry['element'][1] - 8
+            if dtype is not None:
+                nbytes = int(np.prod(entry['shape'], dtype=np.int64)) * dtype.itemsize
+            attributes = []
+            if entry['compressed']:
+                attributes.append('compressed')
+            elif dtype is not None and not entry['complex'] and not entry.get('empty'):
+                attributes.append('memmap')
+            if entry['complex']:
+                attributes.append('complex')
+            if entry['class_name'] == 'sparse':
+                attributes.append('sparse')
+            if entry.get('unsupported'):
+                attributes.append('unsupported')
+            info.append(VariableInfo(name, tuple(entry['shape']), nbytes,
+                                     entry['class_name'], tuple(attributes), i, nbytes))
+        return info
+    
+    def _read(self, name: str, key: Any) -> Any:
+        entry = self._entries[name]
+        if self._h5 is not None:
+            return self._read_h5(name, entry, key)
+        if entry.get('dtype') is None:
+            value = self._read_element(entry)
+        elif entry['compressed']:
+            value = self._read_compressed(entry)
+        else:
+            value = self._map_part(entry, 'real', key)
+            if entry['complex']:
+                value = value + 1j * self._map_part(entry, 'imag', key)
+            return value
+        return value if key is None else value[key]
+    
+    def _map_part(self, entry: Dict[str, Any], part: str, key: Any) -> np.ndarray:
+        mtype, nbytes, offset = entry[part]
+        stored = np.dtype(self._endian + _MI_DTYPES[mtype])
+        if not nbytes:
+            data = np.zeros(entry['shape'], dtype=stored)
+        else:
+            data = np.memmap(self.filename, dtype=stored, mode='r', offset=offset,
+                             shape=tuple(entry['shape']), order='F')
+        if key is not None:
+            data = data[key]
+        # MATLAB may store values in a narrower type than their class
+        target = entry['dtype'] if not entry['complex'] else np.dtype(
+            self._endian + _MX_DTYPES[entry['class']])
+        return data if data.dtype == target else np.asarray(data).astype(target)
+    
+    def _read_raw_element(self, entry: Dict[str, Any]) -> bytes:
+        offset, length = entry['element']
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+    
+    def _read_compressed(self, entry: Dict[str, Any]) -> np.ndarray:
+        raw = zlib.decompress(self._read_raw_element(entry)[8:])
+        header = _parse_matrix_header(raw[8:], self._endian)
+        parts = []
+        for part in ('real', 'imag') if entry['complex'] else ('real',):
+            mtype, nbytes, pos = header[part]
+            data = np.frombuffer(raw, dtype=self._endian + _MI_DTYPES[mtype],
+                                 count=nbytes // np.dtype(_MI_DTYPES[mtype]).itemsize,
+                                 offset=pos + 8)
+            parts.append(data.reshape(entry['shape'], order='F'))
+        value = parts[0] + 1j * parts[1] if entry['complex'] else parts[0]
+        return value.astype(entry['dtype'], copy=False)
+    
+    def _read_element(self, entry: Dict[str, Any]) -> Any:
+        # Splice the file header and this one element into a single-variable
+        # MAT-file and let scipy decode cells, structs, chars and sparse data
+        import io
+        import scipy.io
+        stream = io.BytesIO(self._file_header + self._read_raw_element(entry))
+        return scipy.io.loadmat(stream)[entry['name']]
+    
+    def _read_h5(self, name: str, entry: Dict[str, Any], key: Any) -> Any:
+        if entry.get('unsupported'):
+            raise TypeError(
+                f"'{name}' is a MATLAB {entry['class_name']} object, which cannot be read "
+                "from v7.3 files; convert it to a struct or numeric array before saving")
+        dataset = self._h5[name]
+        if 'dtype' not in entry or entry.get('empty'):
+            value = self._decode_h5(dataset)
+            return value if key is None else value[key]
+        offset = None
+        if dataset.chunks is None and not entry['complex'] and dataset.size:
+            offset = dataset.id.get_offset()
+        if offset is not None:
+            # Contiguous, uncompressed dataset: map it straight from the file
+            data = np.memmap(self.filename, dtype=dataset.dtype, mode='r',
+                             offset=offset, shape=dataset.shape).T
+            if key is not None:
+                data = data[key]
+        elif key is None:
+            data = np.asarray(dataset[()]).T
+        else:
+            # Reverse the index to match HDF5's reversed dimension order
+            if not isinstance(key, tuple):
+                key = (key,)
+            key = key + (slice(None),) * (dataset.ndim - len(key))
+            data = np.asarray(dataset[key[::-1]]).T
+        if entry['complex']:
+            data = data['real'] + 1j * data['imag']
+        return data if data.dtype == entry['dtype'] else data.astype(entry['dtype'])
+    
+    def _decode_h5(self, obj: Any) -> Any:
+        """Decode a whole v7.3 value the way scipy.io.loadmat returns it"""
+        class_name = _h5_class(obj)
+        if 'MATLAB_sparse' in obj.attrs:
+            import scipy.sparse
+            shape = (int(obj.attrs['MATLAB_sparse']), obj['jc'].size - 1)
+            if 'data' not in obj:
+                return scipy.sparse.csc_matrix(shape)
+            data = self._decode_h5(obj['data']).ravel()
+            return scipy.sparse.csc_matrix((data, obj['ir'][()], obj['jc'][()]), shape=shape)
+        if class_name == 'struct':
+            # Scalar structs keep their fields as datasets; struct arrays
+            # store each field as an array of references
+            fields = [_h5_field_name(field) for field in obj.attrs.get('MATLAB_fields', list(obj))]
+            first = obj[fields[0]] if fields else None
+            if first is not None and first.dtype == object and 'MATLAB_class' not in first.attrs:
+                shape = first.shape[::-1]
+                value = np.empty(shape, dtype=[(field, object) for field in fields])
+                for field in fields:
+                    refs = obj[field][()].T
+                    for index in np.ndindex(shape):
+                        value[field][index] = self._decode_h5(self._h5[refs[index]])
+                return value
+            value = np.empty((1, 1), dtype=[(field, object) for field in fields])
+            for field in fields:
+                value[field][0, 0] = self._decode_h5(obj[field])
+            return value
+        data = obj[()]
+        if obj.attrs.get('MATLAB_empty', 0):
+            shape = tuple(int(n) for n in np.ravel(data))
+            if class_name == 'char':
+                return np.array([''])
+            return np.zeros(shape, dtype=_MX_DTYPES_BY_NAME.get(class_name, 'f8'))
+        data = np.asarray(data).T
+        if class_name == 'cell':
+            value = np.empty(data.shape, dtype=object)
+            for index in np.ndindex(data.shape):
+                value[index] = self._decode_h5(self._h5[data[index]])
+            return value
+        if class_name == 'char':
+            return np.array([''.join(map(chr, row)) for row in np.atleast_2d(data)])
+        if data.dtype.names == ('real', 'imag'):
+            data = data['real'] + 1j * data['imag']
+        if class_name == 'logical':
+            return data.astype(bool)
+        return data
+
+
+def _h5_class(obj: Any) -> str:
+    class_name = obj.attrs.get('MATLAB_class', b'unknown')
+    return class_name.decode() if isinstance(class_name, bytes) else str(class_name)
+
+
+def _h5_field_name(field: Any) -> str:
+    # MATLAB writes each struct field name as an array of single characters
+    if isinstance(field, np.ndarray):
+        field = b''.join(field.tolist())
+    return field.decode() if isinstance(field, bytes) else str(field)
+
+
+def matfile(filename: str) -> MatFile:
+    """
+    Open a MATLAB .mat file for lazy, partial reading
+    
+    Only the variable headers are read when the file is opened. Reading a
+    slice of a variable reads just that slice; uncompressed numeric data
+    is memory-mapped without copying.
+    
+    Parameters:
+    -----------
+    filename : str
+        MAT-file to open
+    
+    Returns:
+    --------
+    MatFile
+        Mapping of variable names to lazy MatVariable handles
+    
+    Examples:
+    ---------
+    >>> m = matfile('results.mat')
+    >>> whos(m)
+    >>> block = m.X[1000:2000, :]
+    >>> X = np.asarray(m.X)  # Whole variable
+    """
+    return MatFile(filename)
+
+
+def _parse_bytes(limit: Union[int, float, str]) -> int:
+    """Convert 1e9, '512MB' or '8GB' to a byte count"""
+    if isinstance(limit, str):
+        text = limit.strip().upper().rstrip('B')
+        units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(float(text))
+    return int(limit)
+
+
+class Workspace(dict):
+    """
+    Interpreter namespace with an optional memory budget and snapshots
+    
+    Array sizes are tracked as variables are assigned. When the arrays held
+    in memory exceed the budget, the least recently used large arrays are
+    spilled to memory-mapped temporary files; they are read back into
+    memory the next time the variable is used. Deleting a variable (e.g.
+    with clear) removes its backing file.
+    
+    Snapshots record variable bindings rather than copying data: arrays are
+    shared with the workspace and marked read-only, and before_execute()
+    gives a statement that writes into a shared array its own copy first
+    (copy-on-write; views of the array are moved to the copy with it). The
+    interpreters call before_execute() for every command, which with
+    undo_limit > 0 also keeps the last undo_limit states for undo(). Undo
+    is off by default: it shares every array with the history, so each
+    command that writes into an array copies it.
+    """
+    
+    def __init__(self, *args: Any, budget: Optional[Union[int, str]] = None,
+                 min_spill_bytes: int = 1024 ** 2, max_snapshots: int = 5,
+                 undo_limit: int = 0, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.budget = None if budget is None else _parse_bytes(budget)
+        self.min_spill_bytes = min_spill_bytes
+        self.max_snapshots = max_snapshots
+        self.undo_limit = undo_limit
+        self._snapshots: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._history: List[Dict[str, Any]] = []
+        self._frozen: Dict[int, int] = {}
+        self._snapshot_count = 0
+        # Names owned by the interpreter itself (e.g. IPython's In/Out)
+        self.hidden: set = set()
+        self._lru: 'OrderedDict[str, None]' = OrderedDict()
+        self._spilled: Dict[str, str] = {}
+        self._spill_dir: Optional[str] = None
+        self._spill_count = 0
+        for name, value in dict.items(self):
+            if isinstance(value, np.ndarray):
+                self._lru[name] = None
+    
+    @property
+    def spilled(self) -> List[str]:
+        """Names of variables currently spilled to disk"""
+        return list(self._spilled)
+    
+    def resident_bytes(self) -> int:
+        """Bytes of array data held in memory, counting shared buffers once"""
+        buffers = {}
+        for name in self._lru:
+            if name not in self._spilled:
+                root = _buffer_root(dict.__getitem__(self, name))
+                if not isinstance(root, mmap.mmap):
+                    buffers[id(root)] = _buffer_nbytes(root, 0)
+        return sum(buffers.values())
+    
+    def peek(self, name: str) -> Any:
+        """Return a variable without reading it back or marking it used"""
+        return dict.__getitem__(self, name)
+    
+    def __getitem__(self, name: str) -> Any:
+        value = dict.__getitem__(self, name)
+        if isinstance(value, _Deferred):
+            # First use of a variable from load()
+            value = value.resolve()
+            self[name] = value
+            return value
+        if name in self._lru:
+            self._lru.move_to_end(name)
+            if name in self._spilled:
+                value = np.array(value)
+                self._release(name)
+                dict.__setitem__(self, name, value)
+                self._enforce_budget(keep=name)
+        return value
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        value = dict.get(self, name, default)
+        return self[name] if isinstance(value, _Deferred) else value
+    
+    def defer(self, name: str, value: '_Deferred') -> None:
+        """Bind name to a variable that is read when first used"""
+        self._release(name)
+        self._lru.pop(name, None)
+        dict.__setitem__(self, name, value)
+    
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._release(name)
+        dict.__setitem__(self, name, value)
+        if isinstance(value, np.ndarray):
+            self._lru[name] = None
+            self._lru.move_to_end(name)
+            self._enforce_budget(keep=name)
+        else:
+            self._lru.pop(name, None)
+    
+    def __delitem__(self, name: str) -> None:
+        dict.__delitem__(self, name)
+        self._lru.pop(name, None)
+        self._release(name)
+    
+    def pop(self, name: str, *default: Any) -> Any:
+        if name in self:
+            value = self[name]
+            del self[name]
+            return value
+        return dict.pop(self, name, *default)
+    
+    def clear(self) -> None:
+        for name in list(self._spilled):
+            self._release(name)
+        self._lru.clear()
+        dict.clear(self)
+    
+    def before_execute(self, source: str) -> None:
+        """
+        Prepare for running a command: record an undo state and copy any
+        shared or broadcast array the command assigns into
+        """
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            return
+        if self.undo_limit:
+            state = self._capture()
+            if self._history and self._same_state(self._history[-1], state):
+                self._drop(state)
+            else:
+                # One extra state: the one recorded for the command running now
+                self._history.append(state)
+                while len(self._history) > self.undo_limit + 1:
+                    self._drop(self._history.pop(0))
+        for name in _inplace_targets(tree):
+            if dict.__contains__(self, name):
+                value = dict.__getitem__(self, name)
+                if not isinstance(value, np.ndarray) or value.flags.writeable:
+                    continue
+                shared = self._shared_with(value)
+                if shared is not None:
+                    self._copy_on_write(shared)
+                elif _is_broadcast(value):
+                    self[name] = np.array(value, order='K')
+    
+    def snapshot(self, label: Optional[str] = None) -> str:
+        """Record the current variables; O(number of variables)"""
+        self._snapshot_count += 1
+        label = label or f"s{self._snapshot_count}"
+        if label in self._snapshots:
+            self._drop(self._snapshots.pop(label))
+        self._snapshots[label] = self._capture()
+        while len(self._snapshots) > self.max_snapshots:
+            self._drop(self._snapshots.popitem(last=False)[1])
+        return label
+    
+    def restore(self, label: Optional[str] = None) -> str:
+        """Return the variables to a snapshot (default: the latest)"""
+        if not self._snapshots:
+            raise KeyError("no snapshots to restore")
+        if label is None:
+            label = next(reversed(self._snapshots))
+        if label not in self._snapshots:
+            raise KeyError(f"snapshot '{label}' not found")
+        self._apply(self._snapshots[label])
+        return label
+    
+    def undo(self) -> bool:
+        """Return the variables to their state before the previous command"""
+        current = {name: dict.__getitem__(self, name)
+                   for name in _user_variables(self, None)}
+        # The state recorded for the command calling undo() is the current one
+        while self._history and self._same_state(self._history[-1], current):
+            self._drop(self._history.pop())
+        if not self._history:
+            return False
+        state = self._history.pop()
+        self._apply(state)
+        self._drop(state)
+        return True
+    
+    def snapshots(self) -> List[str]:
+        """Labels of the retained snapshots, oldest first"""
+        return list(self._snapshots)
+    
+    def snapshot_bytes(self) -> int:
+        """Bytes of array data kept alive only by snapshots and undo history"""
+        live = set()
+        for name in self._lru:
+            live.add(id(_buffer_root(dict.__getitem__(self, name))))
+        held = {}
+        for state in list(self._snapshots.values()) + self._history:
+            for value in state.values():
+                if isinstance(value, np.ndarray):
+                    root = _buffer_root(value)
+                    if id(root) not in live and not isinstance(root, mmap.mmap):
+                        held[id(root)] = _buffer_nbytes(root, value.nbytes)
+        return sum(held.values())
+    
+    def _capture(self) -> Dict[str, Any]:
+        state = {}
+        for name in _user_variables(self, None):
+            value = dict.__getitem__(self, name)
+            if isinstance(value, np.ndarray):
+                self._freeze(value)
+            elif isinstance(value, (list, dict, set)):
+                value = copy.copy(value)
+            state[name] = value
+        return state
+    
+    def _apply(self, state: Dict[str, Any]) -> None:
+        for name in _user_variables(self, None):
+            if name not in state:
+                del self[name]
+        for name, value in state.items():
+            if isinstance(value, (list, dict, set)):
+                value = copy.copy(value)
+            self[name] = value
+    
+    @staticmethod
+    def _same_state(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        if a.keys() != b.keys():
+            return False
+        for name, value in a.items():
+            other = b[name]
+            if isinstance(value, (list, dict, set)):
+                if type(value) is not type(other) or value != other:
+                    return False
+            elif value is not other:
+                return False
+        return True
+    
+    def _freeze(self, value: np.ndarray) -> None:
+        key = id(value)
+        if key in self._frozen:
+            self._frozen[key] += 1
+        elif value.flags.writeable:
+            value.flags.writeable = False
+            self._frozen[key] = 1
+    
+    def _shared_with(self, value: np.ndarray) -> Optional[np.ndarray]:
+        """The snapshot-shared (frozen) array whose memory value uses, if any"""
+        for state in list(self._snapshots.values()) + self._history:
+            for item in state.values():
+                if (isinstance(item, np.ndarray) and id(item) in self._frozen
+                        and (item is value or np.may_share_memory(item, value))):
+                    return item
+        return None
+    
+    def _copy_on_write(self, shared: np.ndarray) -> None:
+        """
+        Give the workspace its own copy of a snapshot-shared array: every
+        variable viewing it (B = A[:2]) becomes the same view of the copy,
+        so writes through a view still reach the other variables
+        """
+        copied = np.array(shared, order='K')
+        start = shared.__array_interface__['data'][0]
+        for name in _user_variables(self, None):
+            value = dict.__getitem__(self, name)
+            if not isinstance(value, np.ndarray) or value.flags.writeable:
+                continue
+            if value is shared:
+                self[name] = copied
+            elif np.may_share_memory(value, shared):
+                try:
+                    view = np.ndarray(value.shape, value.dtype, buffer=copied,
+                                      offset=value.__array_interface__['data'][0] - start,
+                                      strides=value.strides)
+                    if copied.strides != shared.strides:
+                        raise ValueError("layout changed")
+                except (TypeError, ValueError):
+                    # Not a view inside the array (or no matching layout): copy it alone
+                    view = np.array(value, order='K')
+                self[name] = view
+    
+    def _drop(self, state: Dict[str, Any]) -> None:
+        """Forget a state; arrays no state shares become writable again"""
+        for value in state.values():
+            key = id(value)
+            if isinstance(value, np.ndarray) and key in self._frozen:
+                self._frozen[key] -= 1
+                if not self._frozen[key]:
+                    del self._frozen[key]
+                    try:
+                        value.flags.writeable = True
+                    except ValueError:
+                        pass
+    
+    def _enforce_budget(self, keep: str) -> None:
+        if self.budget is None:
+            return
+        resident = self.resident_bytes()
+        for name in list(self._lru):
+            if resident <= self.budget:
+                break
+            if name == keep or name in self._spilled:
+                continue
+            value = dict.__getitem__(self, name)
+            # Only spill arrays that own their memory and that nothing but
+            # this workspace and its snapshots references (plus the local
+            # and getrefcount's own argument)
+            if (value.base is None and value.nbytes >= self.min_spill_bytes
+                    and not value.dtype.hasobject
+                    and sys.getrefcount(value) <= 3 + len(self._state_refs(value))):
+                resident -= value.nbytes
+                del value
+                self._spill(name)
+    
+    def _spill(self, name: str) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='matlab_spill_')
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+        self._spill_count += 1
+        path = os.path.join(self._spill_dir, f"{self._spill_count}_{name}.npy")
+        value = dict.__getitem__(self, name)
+        mapped = np.lib.format.open_memmap(
+            path, mode='w+', dtype=value.dtype, shape=value.shape,
+            fortran_order=value.flags.f_contiguous and not value.flags.c_contiguous)
+        mapped[...] = value
+        mapped.flush()
+        dict.__setitem__(self, name, mapped)
+        self._spilled[name] = path
+        # Snapshots sharing the array share the spilled copy instead
+        for state, key in self._state_refs(value):
+            state[key] = mapped
+        if id(value) in self._frozen:
+            mapped.flags.writeable = False
+            self._frozen[id(mapped)] = self._frozen.pop(id(value))
+    
+    def _state_refs(self, value: Any) -> List[Tuple[Dict[str, Any], str]]:
+        return [(state, key)
+                for state in list(self._snapshots.values()) + self._history
+                for key, item in state.items() if item is value]
+    
+    def _release(self, name: str) -> None:
+        path = self._spilled.pop(name, None)
+        if path is not None:
+            if dict.__contains__(self, name):
+                # Drop our reference to the map before deleting its file
+                dict.__setitem__(self, name, None)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Array methods that modify the array they are called on
+_INPLACE_METHODS = {'fill', 'sort', 'put', 'partition', 'resize', 'itemset',
+                    'setfield', 'byteswap'}
+
+
+def _inplace_targets(tree: ast.AST) -> List[str]:
+    """Names whose value a statement modifies in place rather than rebinds"""
+    targets = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AugAssign):
+            targets.append(node.target)
+        elif isinstance(node, (ast.Assign, ast.Delete)):
+            targets.extend(t for t in node.targets if not isinstance(t, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and not isinstance(node.target, ast.Name):
+            targets.append(node.target)
+        elif isinstance(node, ast.Call):
+            targets.extend(kw.value for kw in node.keywords if kw.arg == 'out')
+            if isinstance(node.func, ast.Attribute) and node.func.attr in _INPLACE_METHODS:
+                targets.append(node.func.value)
+    names = []
+    while targets:
+        target = targets.pop()
+        if isinstance(target, (ast.Tuple, ast.List)):
+            targets.extend(target.elts)
+        elif isinstance(target, ast.Starred):
+            targets.append(target.value)
+        else:
+            # A[i] = ..., A.x[i] = ..., A += ...: the root name is modified
+            while isinstance(target, (ast.Subscript, ast.Attribute)):
+                target = target.value
+            if isinstance(target, ast.Name):
+                names.append(target.id)
+    return names
+
+
+
+def _peek(variables: Dict[str, Any], name: str) -> Any:
+    """Read a variable without side effects such as un-spilling it"""
+    return variables.peek(name) if isinstance(variables, Workspace) else variables[name]
+
+
+def membudget(limit: Optional[Union[int, float, str]] = None,
+              variables: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    """
+    Show or set the workspace memory budget
+    
+    Only interpreter workspaces (matlab_interpreter.py, matlab_repl.py)
+    support a budget. When arrays in memory exceed it, the least recently
+    used large arrays are spilled to disk until they are used again.
+    
+    Parameters:
+    -----------
+    limit : int or str, optional
+        Budget in bytes or with a unit ('512MB', '8GB'); 'off' disables it.
+        If omitted, print the current usage.
+    variables : dict, optional
+        Workspace to configure (default: the caller's workspace)
+    
+    Returns:
+    --------
+    int or None
+        Budget in bytes (None: unlimited)
+    
+    Examples:
+    ---------
+    >>> membudget('8GB')
+    >>> membudget()
+    >>> membudget('off')
+    """
+    variables = _caller_workspace(variables, 'membudget')
+    
+    if limit is None:
+        budget = _format_bytes(variables.budget) if variables.budget is not None else 'off'
+        print(f"Memory budget: {budget}")
+        print(f"In memory: {_format_bytes(variables.resident_bytes())}")
+        if variables.spilled:
+            print(f"Spilled to disk: {', '.join(variables.spilled)}")
+    elif isinstance(limit, str) and limit.lower() == 'off':
+        variables.budget = None
+    else:
+        variables.budget = _parse_bytes(limit)
+        variables._enforce_budget(keep='')
+    return variables.budget
+
+
+def _caller_workspace(variables: Optional[Dict[str, Any]], func: str) -> 'Workspace':
+    if variables is None:
+        variables = sys._getframe(2).f_locals
+    if not isinstance(variables, Workspace):
+        raise TypeError(f"{func}() is only available in an interpreter workspace")
+    return variables
+
+
+def snapshot(label: Optional[str] = None, limit: Optional[int] = None,
+             undo_limit: Optional[int] = None,
+             variables: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Take a snapshot of the workspace variables
+    
+    Snapshots share array data with the workspace instead of copying it;
+    an array is copied only when a later command assigns into it.
+    
+    Parameters:
+    -----------
+    label : str, optional
+        Snapshot name (default: s1, s2, ...)
+    limit : int, optional
+        Set how many snapshots are kept (oldest are dropped) instead of
+        taking a snapshot
+    undo_limit : int, optional
+        Set how many commands undo() can revert instead of taking a
+        snapshot (0, the default, disables undo; while enabled, each
+        command that writes into an array copies it first)
+    variables : dict, optional
+        Workspace to snapshot (default: the caller's workspace)
+    
+    Returns:
+    --------
+    str or None
+        Label of the new snapshot
+    
+    Examples:
+    ---------
+    >>> snapshot('before_fit')
+    >>> restore('before_fit')
+    >>> snapshot(limit=10)
+    >>> snapshot(undo_limit=1)  # Enable undo()
+    """
+    variables = _caller_workspace(variables, 'snapshot')
+    if limit is None and undo_limit is None:
+        return variables.snapshot(label)
+    if limit is not None:
+        variables.max_snapshots = limit
+        while len(variables._snapshots) > limit:
+            variables._drop(variables._snapshots.popitem(last=False)[1])
+    if undo_limit is not None:
+        variables.undo_limit = undo_limit
+        while len(variables._history) > (undo_limit + 1 if undo_limit else 0):
+            variables._drop(variables._history.pop(0))
+    return None
+
+
+def restore(label: Optional[str] = None,
+            variables: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Restore the workspace variables from a snapshot
+    
+    Parameters:
+    -----------
+    label : str, optional
+        Snapshot to restore (default: the most recent one)
+    variables : dict, optional
+        Workspace to restore (default: the caller's workspace)
+    
+    Examples:
+    ---------
+    >>> restore()
+    >>> restore('before_fit')
+    """
+    variables = _caller_workspace(variables, 'restore')
+    print(f"Restored snapshot '{variables.restore(label)}'.")
+
+
+def undo(variables: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Revert the variables changed by the previous command
+    
+    Parameters:
+    -----------
+    variables : dict, optional
+        Workspace to revert (default: the caller's workspace)
+    
+    Examples:
+    ---------
+    >>> X = X * 0  # Oops
+    >>> undo()
+    """
+    variables = _caller_workspace(variables, 'undo')
+    if not variables.undo():
+        print("Nothing to undo." if variables.undo_limit else
+              "Undo is off; enable it with snapshot(undo_limit=1).")
+
+
 def clc() -> None:
     """
     Clear console screen
@@ -21,13 +21,19 @@ def print_banner():
     print("Use Python in MATLAB style!")
     print()
     print("Available functions:")
-    print("  Arrays: zeros, ones, eye, rand, randn, linspace, meshgrid")
+    print("  Arrays: zeros, ones, eye, rand, randn, linspace, colon, meshgrid, ndgrid, gridfun")
     print("  Math: sin, cos, tan, exp, log, sqrt, abs")
     print("  Plotting: figure, plot, subplot, xlabel, ylabel, title, legend, grid, show")
-    print("  Matrix: inv, det, eig, svd, transpose, dot, cross")
+    print("  Matrix: inv, det, eig, svd, transpose, dot, cross, repmat, kron, bsxfun")
     print("  Statistics: mean, std, sum, max, min")
-    print("  Workspace: who(), whos(), clear()")
+    print("  Signal: fft, ifft, fftshift, nextpow2, fftcache, conv, conv2, filter, StreamingFilter")
+    print("          hann, hamming, buffer, spectrogram, stft, pwelch")
+    print("  Interpolation: interp1, griddedInterpolant")
+    print("  Fused evaluation: evaluate")
+    print("  Workspace: who(), whos(), clear(), save(), load(), membudget()")
+    print("  Snapshots: snapshot(), restore(), undo()")
     print()
+    print("Start with --render-server to draw figures in a separate process.")
     print("To exit, enter 'exit' or press Ctrl+D.")
     print("=" * 70)
     print()
@@ -36,14 +42,22 @@ def main():
     """Main interpreter loop"""
     print_banner()
     
-    # Prepare global namespace
-    global_namespace = globals().copy()
+    # Prepare global namespace; MATLAB_MEMORY_BUDGET (e.g. '8GB') enables
+    # spilling least recently used large arrays to disk
+    global_namespace = Workspace(globals(), budget=os.environ.get('MATLAB_MEMORY_BUDGET'))
     local_namespace = {}
     
+    # --render-server (or MATLAB_RENDER_SERVER=1) draws figures in a separate
+    # process, so plotting commands and show() return immediately
+    if '--render-server' in sys.argv[1:] or os.environ.get('MATLAB_RENDER_SERVER') == '1':
+        from matlab.render_server import RenderClient
+        global_namespace.update(RenderClient().functions())
+        print("Figures are drawn by a render server process.")
+        print()
+    
     try:
         # Use IPython if installed
         try:
-            from IPython import embed
             from IPython.terminal.prompts import Prompts, Token
             
             # MATLAB-style prompt
@@ -64,14 +78,28 @@ def main():
             c.TerminalInteractiveShell.prompts_class = MatlabPrompt
             c.TerminalInteractiveShell.confirm_exit = False
             
-            # Start IPython session
-            embed(config=c, user_ns=global_namespace)
+            # Start IPython session; every cell first copies the
+            # snapshot-shared arrays it writes to (and records an undo state
+            # once snapshot(undo_limit=n) enables undo)
+            from IPython.terminal.embed import InteractiveShellEmbed
+            shell = InteractiveShellEmbed(config=c, user_ns=global_namespace)
+            global_namespace.hidden.update(shell.user_ns_hidden)
+            shell.events.register(
+                'pre_run_cell',
+                lambda info: global_namespace.before_execute(shell.transform_cell(info.raw_cell)))
+            shell()
             
         except ImportError:
             # Use basic Python interpreter if IPython is not available
             import code
             
-            console = code.InteractiveConsole(global_namespace)
+            class MatlabConsole(code.InteractiveConsole):
+                def runsource(self, source, filename="<input>", symbol="single"):
+                    # Incomplete input does not parse and is ignored
+                    self.locals.before_execute(source)
+                    return super().runsource(source, filename, symbol)
+            
+            console = MatlabConsole(global_namespace)
             console.interact()
             
     except (EOFError, KeyboardInterrupt):
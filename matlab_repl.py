@@ -8,16 +8,35 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from matlab import *
+from matlab.indexing import translate
+from matlab.expression import fuse
 import numpy as np
 import re
 
-def preprocess_matlab_syntax(command):
+def preprocess_matlab_syntax(command, variables=None, fused=False):
     """
     Preprocess MATLAB-style syntax to Python syntax
     
     - Convert ' (transpose) to .T
     - Convert [1,2,3] to np.array([1,2,3])
+    - With the variables, convert A(2:end, k) indexing to A[1:, k-1] and
+      a:b ranges to colon(a, b)
+    - With fused, run elementwise expressions over large arrays through
+      evaluate() (no full-size temporaries)
     """
+    # Hide string literals so their contents are left alone. A quote right
+    # after a name, ), ] or . is a transpose; anything else starts a string,
+    # with an optional f/r/b/u prefix unless the prefix is a variable (b').
+    strings = []
+    def hide_string(match):
+        prefix = match.group(2)
+        if prefix and variables is not None and prefix in variables:
+            return match.group(0)
+        strings.append(prefix + match.group(3))
+        return f'{match.group(1)}__str{len(strings) - 1}__'
+    command = re.sub(r'''(^|[^\w)\].'])([rRbBuUfF]{0,2})("[^"]*"|'[^']*')''', hide_string,
+                     command)
+    
     # Handle transpose operator: convert a' to a.T
     # Use regex to find variable names followed by '
     command = re.sub(r'(\w+)\'', r'\1.T', command)
@@ -32,8 +51,24 @@ def preprocess_matlab_syntax(command):
     # Match [...] that are not preceded by a letter/underscore (to avoid matching func[...])
     command = re.sub(r'(?<![a-zA-Z_])\[([^\[\]]+)\]', replace_brackets, command)
     
+    # MATLAB indexing of the variables; constant ranges become views
+    if variables is not None:
+        command = translate(command, variables)
+    
+    command = re.sub(r'__str(\d+)__', lambda m: strings[int(m.group(1))], command)
+    
+    if fused and variables is not None:
+        command = fuse(command, variables)
+    
     return command
 
+def print_error(e):
+    """Print an error, explaining writes to arrays shared with snapshots"""
+    print(f"Error: {e}")
+    if isinstance(e, ValueError) and 'read-only' in str(e):
+        print("  The array is shared with a snapshot or undo history; "
+              "assign a copy first (A = A.copy()).")
+
 def main():
     print("=" * 60)
     print("MATLAB Style Python REPL")
@@ -41,8 +76,20 @@ def main():
     print("Enter commands (exit: exit, help: help)")
     print()
     
-    # Local variable storage
-    local_vars = {}
+    # Workspace holding the matlab functions and the user's variables;
+    # MATLAB_MEMORY_BUDGET (e.g. '8GB') enables spilling large arrays to disk
+    local_vars = Workspace(globals(), budget=os.environ.get('MATLAB_MEMORY_BUDGET'))
+    
+    # --render-server (or MATLAB_RENDER_SERVER=1) draws figures in a separate
+    # process, so plotting commands and show() return immediately
+    if '--render-server' in sys.argv[1:] or os.environ.get('MATLAB_RENDER_SERVER') == '1':
+        from matlab.render_server import RenderClient
+        local_vars.update(RenderClient().functions())
+        print("Figures are drawn by a render server process.\n")
+    
+    # --fused (or MATLAB_FUSED=1) evaluates elementwise expressions over large
+    # arrays block by block, without full-size temporaries
+    fused = '--fused' in sys.argv[1:] or os.environ.get('MATLAB_FUSED') == '1'
     
     while True:
         try:
@@ -61,55 +108,43 @@ def main():
             # help
             if command.strip().lower() == 'help':
                 print("\nAvailable functions:")
-                print("  zeros, ones, eye, rand, randn, linspace, meshgrid")
+                print("  zeros, ones, eye, rand, randn, linspace, colon, meshgrid, ndgrid, gridfun")
                 print("  sin, cos, tan, exp, log, sqrt, abs")
                 print("  figure, plot, subplot, xlabel, ylabel, title, legend, grid, show")
-                print("  inv, det, eig, svd, transpose, dot, cross")
+                print("  scatter, spy, imagesc, surf, mesh, contour, hold, maxfigures, figmemory")
+                print("  animatedline, addpoints, drawnow")
+                print("  (start with --render-server to draw figures in a separate process)")
+                print("  inv, det, eig, svd, transpose, dot, cross, repmat, kron, bsxfun")
                 print("  mean, std, sum, max, min")
-                print("  who(), whos(), clear()\n")
+                print("  fft, ifft, fftshift, nextpow2, fftcache, conv, conv2, filter, StreamingFilter")
+                print("  hann, hamming, buffer, spectrogram, stft, pwelch")
+                print("  interp1, griddedInterpolant")
+                print("  evaluate (start with --fused to use it for large elementwise expressions)")
+                print("  who(), whos(), clear(), save(), load(), membudget()")
+                print("  snapshot(), restore(), undo()")
+                print("  MATLAB indexing: A(2:end, 1), A(:, k) = v, v(v > 0), x = 0:0.1:1\n")
                 continue
             
             # Special handling for who command
             if command.strip() in ['who', 'who()']:
-                if local_vars:
-                    print("Variables in workspace:")
-                    for name in sorted(local_vars.keys()):
-                        print(f"  {name}")
-                else:
-                    print("No variables.")
+                who(variables=local_vars)
                 continue
             
             # Special handling for whos command
             if command.strip() in ['whos', 'whos()']:
-                if local_vars:
-                    print(f"{'Name':<15} {'Size':<20} {'Type':<15}")
-                    print("-" * 50)
-                    for name, value in sorted(local_vars.items()):
-                        if isinstance(value, np.ndarray):
-                            size_str = f"{value.shape}"
-                            type_str = f"ndarray ({value.dtype})"
-                        elif isinstance(value, (list, tuple)):
-                            size_str = f"({len(value)},)"
-                            type_str = type(value).__name__
-                        else:
-                            size_str = "-"
-                            type_str = type(value).__name__
-                        print(f"{name:<15} {size_str:<20} {type_str:<15}")
-                else:
-                    print("No variables.")
+                whos(variables=local_vars)
                 continue
             
             # Execute command
             try:
                 # Preprocess MATLAB-style syntax
-                processed_command = preprocess_matlab_syntax(command)
+                processed_command = preprocess_matlab_syntax(command, local_vars, fused)
                 
-                # Include both matlab functions and local variables in global namespace
-                namespace = globals().copy()
-                namespace.update(local_vars)
+                # Record undo state and copy snapshot-shared arrays written to
+                local_vars.before_execute(processed_command)
                 
                 # Execute
-                result = eval(processed_command, namespace, local_vars)
+                result = eval(processed_command, local_vars)
                 
                 # Convert lists to numpy arrays if needed
                 if isinstance(result, list):
@@ -128,19 +163,17 @@ def main():
             except SyntaxError:
                 # If eval fails, try exec (for assignments, etc.)
                 try:
-                    processed_command = preprocess_matlab_syntax(command)
-                    namespace = globals().copy()
-                    namespace.update(local_vars)
-                    exec(processed_command, namespace, local_vars)
+                    processed_command = preprocess_matlab_syntax(command, local_vars, fused)
+                    exec(processed_command, local_vars)
                     
                     # Convert any newly created list variables to numpy arrays
                     for key, value in local_vars.items():
                         if isinstance(value, list):
                             local_vars[key] = np.array(value)
                 except Exception as e:
-                    print(f"Error: {e}")
+                    print_error(e)
             except Exception as e:
-                print(f"Error: {e}")
+                print_error(e)
                 
         except EOFError:
             print("\nExiting.")
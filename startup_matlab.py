@@ -25,7 +25,7 @@ try:
     print("  Plotting: figure, plot, subplot, xlabel, ylabel, title, legend, grid, show")
     print("  Matrix: inv, det, eig, svd, transpose, dot, cross")
     print("  Statistics: mean, std, sum, max, min")
-    print("  Workspace: who(), whos(), clear()")
+    print("  Workspace: who(), whos(), clear(), save(), load()")
     print()
     print("Example:")
     print("  x = linspace(0, 10, 100)")
@@ -116,6 +116,114 @@ def test_math_functions():
     print("✓ Math function tests passed!")
 
 
+def test_ranges():
+    """Test lazy colon/linspace ranges"""
+    print("Testing ranges...")
+    
+    r = linspace(0, 1, 11, lazy=True)
+    assert np.array_equal(np.asarray(r), np.linspace(0, 1, 11))
+    assert len(r) == 11 and r[-1] == 1.0 and r.shape == (11,)
+    assert np.array_equal(np.asarray(r[2:9:3]), np.linspace(0, 1, 11)[2:9:3])
+    assert np.allclose(r[::-1], np.linspace(0, 1, 11)[::-1])
+    
+    # MATLAB colon: integer ranges index arrays, float ranges end on stop
+    assert colon(1, 5).tolist() == [1, 2, 3, 4, 5]
+    assert colon(5, -2, 0).tolist() == [5, 3, 1]
+    assert len(colon(1, 0)) == 0
+    assert len(colon(np.uint8(5), np.uint8(1))) == 0  # No unsigned wrap-around
+    assert len(colon(0, 0.1, 0.99999999999)) == 10  # Tolerance of a few eps only
+    assert len(colon(0, 0.1, 0.3)) == 4 and colon(0, 0.1, 0.3)[3] == 0.3
+    t = colon(0, 0.1, 1)
+    assert len(t) == 11 and t[-1] == 1.0
+    A = np.arange(10)
+    assert np.array_equal(A[colon(2, 5)], [2, 3, 4, 5])
+    
+    # Scalar arithmetic and reductions stay O(1); the rest materializes
+    s = 2 * r + 1
+    assert type(s) is type(r)
+    assert np.allclose(s, 2 * np.linspace(0, 1, 11) + 1)
+    assert np.allclose(1 - r, 1 - np.linspace(0, 1, 11))
+    assert isinstance(sin(r), np.ndarray)
+    assert np.sum(colon(1, 100)) == 5050
+    assert np.isclose(mean(r), 0.5) and np.max(-r) == 0
+    assert np.asarray(r, dtype=np.float32).dtype == np.float32
+    
+    total = 0
+    for k in colon(1, 1000):
+        total += k
+    assert total == 500500
+    print("✓ Range tests passed!")
+
+
+def test_grids():
+    """Test meshgrid/ndgrid layouts and lazy broadcast grids"""
+    print("Testing grids...")
+    
+    x, y, z = linspace(0, 1, 4), linspace(0, 2, 5), linspace(0, 3, 6)
+    for ours, theirs in zip(meshgrid(x, y, z), np.meshgrid(x, y, z)):
+        assert np.array_equal(ours, theirs)
+    for ours, theirs in zip(ndgrid(x, y, z), np.meshgrid(x, y, z, indexing='ij')):
+        assert np.array_equal(ours, theirs)
+    X, Y = meshgrid(x)
+    assert X.shape == (4, 4) and np.array_equal(X, Y.T)
+    
+    # Lazy grids hold only the vectors and stay lazy through gridfun
+    X, Y = meshgrid(x, y, lazy=True)
+    assert X.shape == (5, 4) and not X.flags.writeable
+    assert X.strides[0] == 0 and Y.strides[1] == 0
+    Z = gridfun(sin, X) + gridfun(cos, Y)
+    assert np.allclose(Z, np.sin(x)[None, :] + np.cos(y)[:, None])
+    assert gridfun(sin, X).strides[0] == 0 and not gridfun(sin, X).flags.writeable
+    # A size-1 axis (zero stride) is not a repeated one
+    col = np.arange(3.0)[:, None]
+    assert 0 in col.strides and gridfun(sin, col).flags.writeable
+    assert np.array_equal(gridfun(sin, col), np.sin(col))
+    
+    # The math functions stay NumPy ufuncs with writable results
+    S = sin(X)
+    S[0, 0] = 0
+    assert S[0, 0] == 0 and S[1, 0] == np.sin(x[0])
+    assert sin is np.sin and sin.reduce and np.allclose(exp(X) * Y, np.exp(x)[None, :] * y[:, None])
+    print("✓ Grid tests passed!")
+
+
+def test_repmat_kron_bsxfun():
+    """Test repmat views, kron and bsxfun implicit expansion"""
+    print("Testing repmat, kron, bsxfun...")
+    
+    A = np.arange(6.0).reshape(2, 3)
+    assert np.array_equal(repmat(A, 2, 3), np.tile(A, (2, 3)))
+    assert np.array_equal(repmat(A, [2, 2]), np.tile(A, (2, 2)))
+    assert repmat(A, 3).shape == (6, 9)
+    assert repmat(A, 1, 1, 2).shape == (2, 3, 2)
+    
+    # Repeating a row down or a column across is a view of one copy
+    row = np.array([1.0, 2.0, 3.0])
+    R = repmat(row, 1000, 1)
+    assert R.shape == (1000, 3) and R.strides[0] == 0 and not R.flags.writeable
+    assert np.array_equal(R, np.tile(row, (1000, 1)))
+    row[0] = 99
+    assert R[0, 0] == 1
+    C = repmat(row[:, None], 2, 4)
+    assert np.array_equal(C, np.tile(row[:, None], (2, 4)))
+    
+    B = rand(3, 4)
+    assert np.allclose(kron(A, B), np.kron(A, B))
+    assert kron(eye(2), B).shape == (6, 8)
+    
+    M = rand(5, 3)
+    assert np.allclose(bsxfun('minus', M, mean(M, 0)), M - M.mean(axis=0))
+    assert np.allclose(bsxfun(np.multiply, M, row[:, None][:3].T), M * row[:3])
+    # Missing trailing dimensions count as 1, as in MATLAB
+    assert bsxfun('plus', ones(3, 4), np.ones((3, 4, 2))).shape == (3, 4, 2)
+    try:
+        bsxfun('plus', ones(3, 4), ones(4, 3))
+        assert False, "Mismatched sizes should be rejected"
+    except ValueError:
+        pass
+    print("✓ repmat/kron/bsxfun tests passed!")
+
+
 def test_linear_algebra():
     """Test linear algebra functions"""
     print("Testing linear algebra functions...")
@@ -153,6 +261,9 @@ if __name__ == '__main__':
         test_matrix_operations()
         test_statistics()
         test_math_functions()
+        test_ranges()
+        test_grids()
+        test_repmat_kron_bsxfun()
         test_linear_algebra()
         
         print()
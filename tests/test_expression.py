@@ -0,0 +1,133 @@
+"""
+Fused Expression Evaluation Tests
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matlab import *
+from matlab.expression import fuse
+import numpy as np
+import matlab.expression
+
+
+def test_evaluate():
+    """Test evaluate against NumPy on vectors, matrices and broadcasting"""
+    print("Testing evaluate...")
+    
+    # Small blocks so every case runs through many of them
+    block_elements = matlab.expression._block_elements
+    matlab.expression._block_elements = 1000
+    try:
+        # Caller's variables, and the example signal
+        f1, f2 = 50, 120
+        t = np.linspace(0, 1, 10001)
+        expected = np.sin(2 * np.pi * f1 * t) + 0.5 * np.sin(2 * np.pi * f2 * t)
+        assert np.array_equal(evaluate('sin(2*pi*f1*t) + 0.5*sin(2*pi*f2*t)'), expected)
+        
+        # Lazy ranges are generated block by block
+        lazy = {'t': linspace(0, 1, 10001, lazy=True), 'f1': f1, 'f2': f2}
+        assert np.array_equal(evaluate('sin(2*pi*f1*t) + 0.5*sin(2*pi*f2*t)', lazy), expected)
+        assert np.array_equal(evaluate('k * 2 + t', {'k': colon(1, 10001), 't': t}),
+                              np.arange(1, 10002) * 2 + t)
+        
+        # Matrices, broadcasting and lazy meshgrids
+        A = np.random.rand(300, 200)
+        b = np.random.rand(200)
+        c = np.random.rand(300, 1)
+        assert np.allclose(evaluate('exp(-A) * b + c**2'), np.exp(-A) * b + c ** 2)
+        assert np.allclose(evaluate('sqrt(B) + 1', {'B': A.T}), np.sqrt(A.T) + 1)
+        X, Y = meshgrid(np.arange(250.0), np.arange(120.0), lazy=True)
+        assert np.allclose(evaluate('cos(X / 10) * sin(Y / 10) + hypot(X, Y)'),
+                           np.cos(X / 10) * np.sin(Y / 10) + np.hypot(X, Y))
+        
+        # Comparisons, logic and integer arithmetic keep NumPy's types
+        mask = evaluate('0.2 < A < 0.8 and not A > 0.5 or A == 1')
+        assert mask.dtype == bool
+        assert np.array_equal(mask, ((A > 0.2) & (A < 0.8) & ~(A > 0.5)) | (A == 1))
+        i = np.arange(5000)
+        assert np.array_equal(evaluate('i % 7 + i // 3 - abs(i - 100)'),
+                              i % 7 + i // 3 - np.abs(i - 100))
+        assert evaluate('i * 2').dtype == i.dtype
+        
+        # Real and imaginary parts and the phase of complex data
+        z = A + 1j * c
+        assert np.array_equal(evaluate('real(z) * 2 + imag(z)'), z.real * 2 + z.imag)
+        assert np.allclose(evaluate('angle(z) + abs(conj(z))'), np.angle(z) + np.abs(z))
+        assert np.allclose(evaluate('angle(A - 0.5)'), np.angle(A - 0.5))
+        
+        # out= and threads
+        out = np.empty_like(A)
+        assert evaluate('A ** 2 + 1', out=out) is out
+        assert np.array_equal(out, A ** 2 + 1)
+        assert np.array_equal(evaluate('np.arctan2(A, c) - pi', threads=4),
+                              np.arctan2(A, c) - np.pi)
+        
+        # Scalars and plain names
+        assert evaluate('x * 2 + 1', {'x': 3}) == 7
+        assert np.array_equal(evaluate('A'), A)
+    finally:
+        matlab.expression._block_elements = block_elements
+    
+    # Anything but elementwise math is rejected
+    for expression in ['A @ A.T', 'sum(A)', 'A[0] + 1', 'f(A)', 'A if A else 0']:
+        try:
+            evaluate(expression, {'A': A, 'f': np.sin})
+            assert False, f"{expression} should be rejected"
+        except ValueError:
+            pass
+    try:
+        evaluate('undefined_name + 1', {})
+        assert False, "Undefined names should raise"
+    except NameError:
+        pass
+    print("✓ evaluate tests passed!")
+
+
+def test_fuse():
+    """Test the REPL rewrite to evaluate"""
+    print("Testing fuse...")
+    
+    variables = {'t': np.zeros(1 << 17), 'small': np.zeros(10), 'f': 3}
+    assert fuse('y = sin(2*pi*f*t) + 1', variables) == "y = evaluate('sin(2 * pi * f * t) + 1')"
+    assert fuse('sin(t) * t', variables) == "evaluate('sin(t) * t')"
+    
+    # Small arrays, single operations and other statements are left alone
+    # ... and so are Python's and/or/not and chained comparisons, which
+    # would mean something else (or raise) without the flag
+    for source in ['y = sin(small) + 1', 'y = t + 1', 'y = sum(t) + 1', 'y = t[0] * 2 + 1',
+                   'a, b = t + 1, t * 2 + 1', 'for k in t: pass',
+                   'z = t > 0.5 and t < 0.7', 'z = not t * 2 > 1', 'z = 0 < t * 2 < 1']:
+        assert fuse(source, variables) == source
+    
+    # Deciding whether to fuse leaves spilled variables on disk
+    ws = Workspace({'rand': rand}, budget='3MB')
+    exec("A = rand(500, 500)\nB = rand(500, 500)", ws)
+    assert ws.spilled == ['A']
+    assert fuse('C = sin(A) * 2 + B', ws) == "C = evaluate('sin(A) * 2 + B')"
+    assert ws.spilled == ['A'] and isinstance(ws.peek('A'), np.memmap)
+    print("✓ fuse tests passed!")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Fused Expression Evaluation Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_evaluate()
+        test_fuse()
+        
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print("✗ Test failed!")
+        print(f"Error: {e}")
+        print("=" * 60)
+        sys.exit(1)
@@ -0,0 +1,150 @@
+"""
+MATLAB Indexing Translation Tests
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matlab import *
+from matlab.indexing import translate
+import numpy as np
+
+
+def run(command, namespace):
+    """Translate and run one command, returning the value of an expression"""
+    source = translate(command, namespace)
+    try:
+        return eval(source, namespace)
+    except SyntaxError:
+        exec(source, namespace)
+
+
+def test_translate_views():
+    """Test that constant subscripts and ranges become slices (views)"""
+    print("Testing indexing translation...")
+    
+    A = np.arange(12.0).reshape(3, 4)
+    v = np.arange(1.0, 11.0)
+    ns = {'A': A, 'v': v, 'k': 2, 'colon': colon}
+    
+    assert translate("B = A(2:end, 1)", ns) == "B = A[1:, 0]"
+    assert translate("A(end, end)", ns) == "A[-1, -1]"
+    assert translate("A(1:2:end, :)", ns) == "A[::2, :]"
+    assert translate("v(end:-1:1)", ns) == "v[::-1]"
+    assert translate("x = 0:0.5:2", ns) == "x = colon(0, 0.5, 2)"
+    # Names that are not arrays are calls; Python slices are left alone
+    assert translate("y = sin(v(1:3))", ns) == "y = sin(v[:3])"
+    assert translate("w = v[1:3]", ns) == "w = v[1:3]"
+    
+    assert np.shares_memory(run("A(2:end, :)", ns), A)
+    assert np.array_equal(run("A(2:end, 1)", ns), [4, 8])
+    assert np.array_equal(run("v(end-2:end)", ns), [8, 9, 10])
+    assert run("A(2, k)", ns) == 5
+    # One subscript on a matrix is a column-major linear index
+    assert run("A(2)", ns) == 4
+    assert np.array_equal(run("A(:)", ns).ravel(), A.T.ravel())
+    
+    # A range variable indexes as a slice
+    run("r = 2:2:6", ns)
+    assert np.shares_memory(run("v(r)", ns), v)
+    assert np.array_equal(run("v(r)", ns), [2, 4, 6])
+    
+    # Ranges with variable bounds become run-time colon() ranges (slices)
+    ns.update(j=1, n=1)
+    assert translate("B = A(1:k, :)", ns) == "B = A[_mlindex(colon(1, k)), :]"
+    assert np.shares_memory(run("A(1:k, :)", ns), A)
+    assert np.array_equal(run("A(1:k, :)", ns), A[:2])
+    assert np.array_equal(run("v(2:k)", ns), [2])
+    assert np.array_equal(run("A(j:j+n, :)", ns), A[:2])
+    assert np.array_equal(run("v(k:end)", ns), v[1:])
+    assert np.array_equal(run("v(end:-1:k)", ns), v[:0:-1])
+    assert np.array_equal(run("A(1:k, k:end)", ns), A[:2, 1:])
+    assert np.array_equal(run("A(1:k, [1, 3])", ns), A[:2][:, [0, 2]])
+    assert np.array_equal(run("A(1:k+1)", ns), [0, 4, 8])
+    run("v(1:k) = 0", ns)
+    assert np.array_equal(v[:3], [0, 0, 3])
+    print("✓ Indexing translation tests passed!")
+
+
+def test_translate_masks_and_assignment():
+    """Test masks, index arrays and in-place indexed assignment"""
+    print("Testing masks and indexed assignment...")
+    
+    A = np.arange(12.0).reshape(3, 4)
+    v = np.arange(1.0, 11.0)
+    ns = {'A': A, 'v': v, 'idx': np.array([1, 3]), 'sum': np.sum}
+    
+    assert np.array_equal(run("v(v > 8)", ns), [9, 10])
+    assert np.array_equal(run("A(A > 8)", ns), A.T[A.T > 8])
+    assert np.array_equal(run("A(idx, idx)", ns), [[0, 2], [8, 10]])
+    assert np.array_equal(run("A(idx, 2:end)", ns), A[[0, 2], 1:])
+    
+    # Assignments write into the existing array
+    run("A(1, :) = 0", ns)
+    run("A(A ~= 0) = -1", ns)
+    assert ns['A'] is A
+    assert np.array_equal(A[0], [0, 0, 0, 0]) and np.all(A[1:] == -1)
+    run("for j in range(1, 5): v(j + 1) = v(j) * 2", ns)
+    assert ns['v'] is v
+    assert np.array_equal(v[:5], [1, 2, 4, 8, 16])
+    assert run("s = sum(v(1:3))", ns) is None and ns['s'] == 7
+    
+    for bad in ["v(0)", "v(1.5)"]:
+        try:
+            run(bad, ns)
+            assert False, f"{bad} should raise IndexError"
+        except IndexError:
+            pass
+    print("✓ Mask and assignment tests passed!")
+
+
+def test_translate_strings_and_lambdas():
+    """Test that prefixed strings and lambda parameters are left alone"""
+    print("Testing strings and lambdas...")
+    
+    from matlab_repl import preprocess_matlab_syntax
+    
+    x = np.arange(1.0, 4.0)
+    t = np.arange(5.0)
+    ns = {'x': x, 't': t, 'b': np.eye(2)}
+    
+    # Strings with an f/r/b prefix keep their contents
+    assert preprocess_matlab_syntax('print(f"a: {x}")', ns) == 'print(f"a: {x}")'
+    assert preprocess_matlab_syntax("s = r'1:2'", ns) == "s = r'1:2'"
+    assert preprocess_matlab_syntax("s = x(2) + len(rb'a:b')", ns) == "s = x[1] + len(rb'a:b')"
+    # A variable named like a prefix is still transposed
+    assert preprocess_matlab_syntax("c = b' * b'", ns) == "c = b.T * b.T"
+    
+    # Lambda parameters shadow workspace arrays inside the lambda only
+    assert translate("g = lambda t: t(1)", ns) == "g = lambda t: t(1)"
+    assert translate("y = t(2) + (lambda t: t(2))(f)", ns) == "y = t[1] + (lambda t: t(2))(f)"
+    assert translate("h = lambda u, t=3: t(1) + x(1)", ns) == "h = lambda u, t=3: t(1) + x[0]"
+    assert translate("z = [lambda t: t(1), t(2)]", ns) == "z = [lambda t: t(1), t[1]]"
+    run("g = lambda t: t(1)", ns)
+    assert ns['g'](lambda k: k * 10) == 10
+    print("✓ String and lambda tests passed!")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("MATLAB Indexing Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_translate_views()
+        test_translate_masks_and_assignment()
+        test_translate_strings_and_lambdas()
+        
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print("✗ Test failed!")
+        print(f"Error: {e}")
+        print("=" * 60)
+        sys.exit(1)
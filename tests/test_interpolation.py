@@ -0,0 +1,132 @@
+"""
+Interpolation Tests
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matlab import *
+import numpy as np
+import scipy.interpolate
+
+
+def test_interp1():
+    """Test interp1 methods, extrapolation and column-wise data"""
+    print("Testing interp1...")
+    
+    x = np.linspace(0, 10, 101)
+    v = np.sin(x)
+    xq = np.random.uniform(-1, 11, 500)
+    inside = (xq >= 0) & (xq <= 10)
+    
+    # Linear: NaN outside x unless extrapolating
+    vq = interp1(x, v, xq)
+    assert np.allclose(vq[inside], np.interp(xq[inside], x, v))
+    assert np.all(np.isnan(vq[~inside]))
+    assert np.allclose(interp1(x, v, xq, 'linear', 'extrap'),
+                       scipy.interpolate.interp1d(x, v, fill_value='extrapolate')(xq))
+    assert np.all(interp1(x, v, xq, 'linear', 0)[~inside] == 0)
+    assert np.isnan(interp1(x, v, np.array([np.nan, 1.0]))[0])
+    
+    # Cubic methods extrapolate by default
+    assert np.allclose(interp1(x, v, xq, 'spline'), scipy.interpolate.CubicSpline(x, v)(xq))
+    assert np.allclose(interp1(x, v, xq, 'pchip'), scipy.interpolate.PchipInterpolator(x, v)(xq))
+    for method in ['nearest', 'previous', 'next']:
+        expected = scipy.interpolate.interp1d(x, v, method)(xq[inside])
+        assert np.allclose(interp1(x, v, xq[inside], method), expected)
+    
+    # Unsorted and non-uniform sample points
+    order = np.random.permutation(len(x))
+    assert np.allclose(interp1(x[order], v[order], xq, 'spline'), interp1(x, v, xq, 'spline'))
+    xn = np.sort(np.random.uniform(0, 10, 50))
+    assert np.allclose(interp1(xn, xn ** 2, [2.5, 7.5]), np.interp([2.5, 7.5], xn, xn ** 2))
+    
+    # Nearly uniform steps whose small errors add up to several steps of drift
+    n = 4_000_000
+    steps = np.where(np.arange(n - 1) < n // 2, 1 + 9e-7, 1 - 9e-7)
+    xd = np.concatenate([[0.0], np.cumsum(steps)])
+    vd = np.sin(np.arange(n) * 1.3)
+    qd = xd[n // 2] + np.array([0.0, 0.3, 0.7])
+    assert np.allclose(interp1(xd, vd, qd), np.interp(qd, xd, vd))
+    assert np.array_equal(interp1(xd, vd, qd, 'nearest'), vd[[n // 2, n // 2, n // 2 + 1]])
+    
+    # interp1(v, xq) and one column per data set
+    assert np.allclose(interp1([10, 20, 30], [1.5, 2.5]), [15, 25])
+    V = np.column_stack([v, 2 * v])
+    VQ = interp1(x, V, xq[inside])
+    assert VQ.shape == (inside.sum(), 2)
+    assert np.allclose(VQ[:, 1], 2 * VQ[:, 0])
+    print("✓ interp1 tests passed!")
+
+
+def test_gridded_interpolant():
+    """Test griddedInterpolant reuse and N-D grids from grid vectors or meshgrid"""
+    print("Testing griddedInterpolant...")
+    
+    x = np.linspace(0, 10, 101)
+    F = griddedInterpolant(x, np.sin(x), 'spline')
+    xq = np.random.uniform(0, 10, 200)
+    assert np.allclose(F(xq), scipy.interpolate.CubicSpline(x, np.sin(x))(xq))
+    # Replacing the values recomputes the coefficients
+    F.values = np.cos(x)
+    assert np.allclose(F(xq), scipy.interpolate.CubicSpline(x, np.cos(x))(xq))
+    
+    xg = np.linspace(0, 1, 11)
+    yg = np.linspace(0, 2, 21) ** 2
+    V = np.sin(xg)[:, None] * np.cos(yg)[None, :]
+    reference = scipy.interpolate.RegularGridInterpolator((xg, yg), V)
+    points = np.column_stack([np.random.uniform(0, 1, 300), np.random.uniform(0, 4, 300)])
+    
+    # Grid vectors, or coordinate arrays in either layout
+    F = griddedInterpolant((xg, yg), V)
+    assert np.allclose(F(points), reference(points))
+    assert np.allclose(F(points[:, 0], points[:, 1]), reference(points))
+    X, Y = meshgrid(xg, yg)
+    assert np.allclose(griddedInterpolant(X, Y, V.T)(points), reference(points))
+    
+    # Evaluate on the grid spanned by query vectors
+    qx, qy = np.linspace(0, 1, 7), np.linspace(0, 4, 9)
+    QX, QY = np.meshgrid(qx, qy, indexing='ij')
+    assert np.allclose(F((qx, qy)), reference((QX, QY)))
+    
+    # Outside the grid: extrapolate by default, or NaN with 'none'
+    assert not np.isnan(F(np.array([[2.0, 1.0]]))[0])
+    assert np.isnan(griddedInterpolant((xg, yg), V, 'linear', 'none')(np.array([[2.0, 1.0]]))[0])
+    
+    # 3-D nearest neighbour
+    zg = np.linspace(-1, 1, 5)
+    V3 = np.random.randn(11, 21, 5)
+    points3 = np.column_stack([points, np.random.uniform(-1, 1, 300)])
+    expected = scipy.interpolate.RegularGridInterpolator((xg, yg, zg), V3, 'nearest')(points3)
+    assert np.allclose(griddedInterpolant((xg, yg, zg), V3, 'nearest')(points3), expected)
+    
+    try:
+        griddedInterpolant((xg, yg), V, 'spline')
+        assert False, "N-D spline should be rejected"
+    except ValueError:
+        pass
+    print("✓ griddedInterpolant tests passed!")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Interpolation Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_interp1()
+        test_gridded_interpolant()
+        
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print("✗ Test failed!")
+        print(f"Error: {e}")
+        print("=" * 60)
+        sys.exit(1)
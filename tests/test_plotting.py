@@ -0,0 +1,468 @@
+"""
+Plotting Tests
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matplotlib
+matplotlib.use('Agg')
+
+from matlab import *
+from matlab.plotting import _decimated_lines
+import numpy as np
+
+
+def test_plot_decimation():
+    """Test min/max decimation of long lines and re-decimation on zoom"""
+    print("Testing plot decimation...")
+    
+    n = 200000
+    t = linspace(0, 100, n)
+    y = sin(t)
+    y[12345] = 10  # A single spike must survive decimation
+    
+    figure()
+    line = plot(t, y)[0]
+    assert line in _decimated_lines
+    assert len(line.get_xdata()) < 10000
+    assert line.get_ydata().max() == 10
+    assert line.get_ydata().min() == y.min()
+    
+    # Zooming in re-decimates from the full data
+    xlim(10, 11)
+    xdata = line.get_xdata()
+    assert xdata[0] <= 10 and xdata[-1] >= 11
+    assert np.all(np.diff(xdata) > 0)
+    
+    # Markers and decimate=False keep every point
+    assert len(plot(t, y, 'o')[0].get_xdata()) == n
+    assert len(plot(t, y, decimate=False)[0].get_xdata()) == n
+    close('all')
+    
+    print("✓ Plot decimation tests passed!")
+
+
+def test_plot_matrix_collection():
+    """Test wide matrices are drawn as a single LineCollection"""
+    print("Testing matrix line collections...")
+    
+    from matplotlib.collections import LineCollection
+    
+    t = linspace(0, 1, 50)
+    Y = randn(50, 300).cumsum(axis=0)
+    
+    figure()
+    artists = plot(t, Y, 'r--', label='paths')
+    assert len(artists) == 1 and isinstance(artists[0], LineCollection)
+    assert len(artists[0].get_segments()) == 300
+    assert np.allclose(artists[0].get_segments()[7][:, 1], Y[:, 7])
+    bottom, top = ylim()
+    assert bottom <= Y.min() and top >= Y.max()
+    assert legend().get_texts()[0].get_text() == 'paths'
+    
+    # Narrow matrices still produce one line per column
+    assert len(plot(t, Y[:, :3])) == 3
+    close('all')
+    
+    print("✓ Matrix line collection tests passed!")
+
+
+def test_animatedline():
+    """Test ring-buffered animated lines and blitted drawnow"""
+    print("Testing animatedline...")
+    
+    figure()
+    h = animatedline('r-', maxpoints=1000)
+    for k in range(0, 3000, 100):
+        t = linspace(k, k + 99, 100)
+        addpoints(h, t, sin(t))
+        drawnow()
+    
+    # Only the newest maxpoints points are kept, oldest first
+    x, y = getpoints(h)
+    assert len(x) == 1000 and x[0] == 2000 and x[-1] == 2999
+    assert np.allclose(y, sin(x))
+    assert xlim()[1] >= 2999
+    
+    # A blitted frame matches a full redraw
+    fig = h.line.figure
+    addpoints(h, 3000, 0.5)
+    drawnow()
+    blitted = np.asarray(fig.canvas.buffer_rgba()).copy()
+    fig.canvas.draw()
+    assert np.array_equal(blitted, np.asarray(fig.canvas.buffer_rgba()))
+    
+    # limitrate skips updates that come too quickly
+    addpoints(h, 3001, 0.0)
+    drawnow()
+    addpoints(h, 3002, 0.0)
+    drawnow('limitrate')
+    assert len(h.line.get_xdata()) == 1000 and h.line.get_xdata()[-1] == 3001
+    
+    clearpoints(h)
+    assert len(getpoints(h)[0]) == 0
+    close('all')
+    
+    print("✓ Animatedline tests passed!")
+
+
+def _draw_report(seed, title_text='Run'):
+    """Figure job for test_batchrender (module level so workers can import it)"""
+    plot(np.random.default_rng(seed).standard_normal(100).cumsum(), 'b-')
+    title(f'{title_text} {seed}')
+
+
+def test_batchrender():
+    """Test rendering independent figures serially and on a process pool"""
+    print("Testing batchrender...")
+    
+    import tempfile
+    import matplotlib.pyplot as plt
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        figure()
+        before = plt.get_fignums()
+        names = batchrender(_draw_report, range(3), os.path.join(tmp, 'run_{}.png'), workers=0)
+        assert names == [os.path.join(tmp, f'run_{i}.png') for i in range(3)]
+        assert all(os.path.getsize(name) > 0 for name in names)
+        assert plt.get_fignums() == before  # The caller's figures are untouched
+        
+        # workers=0 draws on Agg canvases and accepts closures
+        current = plt.gcf()
+        canvases = []
+        def draw(seed):
+            canvases.append(type(plt.gcf().canvas).__name__)
+            _draw_report(seed)
+        names = batchrender(draw, range(2), os.path.join(tmp, 'closure_{}.png'), workers=0)
+        assert all(os.path.getsize(name) > 0 for name in names)
+        assert canvases == ['FigureCanvasAgg'] * 2
+        assert plt.get_fignums() == before and plt.gcf() is current
+        
+        jobs = [(1,), {'seed': 2, 'title_text': 'Case'}, 3]
+        files = [os.path.join(tmp, f'{name}.png') for name in 'abc']
+        assert batchrender(_draw_report, jobs, files, workers=2, dpi=50) == files
+        assert plt.imread(files[1]).shape[:2] == (240, 320)
+    close('all')
+    
+    print("✓ Batchrender tests passed!")
+
+
+def test_savefig_background():
+    """Test background savefig output, waitforsaves and error propagation"""
+    print("Testing background savefig...")
+    
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        figure()
+        plot(randn(500).cumsum(), 'b-')
+        title('Background')
+        for ext in ('png', 'pdf'):
+            savefig(os.path.join(tmp, f'sync.{ext}'))
+            savefig(os.path.join(tmp, f'async.{ext}'), background=True)
+        waitforsaves()
+        
+        # The background PNG is byte-identical to a synchronous save
+        with open(os.path.join(tmp, 'sync.png'), 'rb') as f:
+            expected = f.read()
+        with open(os.path.join(tmp, 'async.png'), 'rb') as f:
+            assert f.read() == expected
+        assert os.path.getsize(os.path.join(tmp, 'async.pdf')) > 0
+        
+        # Errors surface at the next waitforsaves() and only once
+        savefig(os.path.join(tmp, 'missing', 'plot.png'), background=True)
+        try:
+            waitforsaves()
+            assert False, "Expected FileNotFoundError"
+        except FileNotFoundError:
+            pass
+        waitforsaves()
+        
+        # Errors still pending at exit are reported as a warning
+        import warnings
+        import matlab.plotting
+        savefig(os.path.join(tmp, 'missing', 'plot.png'), background=True)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            matlab.plotting._finish_saves()
+        assert len(caught) == 1 and 'FileNotFoundError' in str(caught[0].message)
+        waitforsaves()
+    close('all')
+    
+    print("✓ Background savefig tests passed!")
+
+
+def test_figure_pool():
+    """Test figure numbering, LRU closing, hold and figmemory"""
+    print("Testing figure pool...")
+    
+    import matplotlib.pyplot as plt
+    
+    close('all')
+    limit = maxfigures()
+    try:
+        maxfigures(3)
+        for _ in range(10):
+            figure()
+            plot(linspace(0, 1, 100))
+        assert len(plt.get_fignums()) == 3
+        
+        # figure(n) reuses an open figure; clear=True empties it
+        num = plt.get_fignums()[0]
+        assert figure(num) is plt.gcf() and len(plt.gca().lines) == 1
+        figure(num, clear=True)
+        assert len(plt.gcf().axes) == 0
+        
+        # The least recently used figure is the one closed
+        first, second, third = plt.get_fignums()
+        figure(third)
+        figure(first)
+        figure()
+        assert second not in plt.get_fignums()
+        assert first in plt.get_fignums() and third in plt.get_fignums()
+        
+        # Making a figure current through pyplot counts as using it
+        plt.figure(third)
+        figure()
+        assert first not in plt.get_fignums()
+        assert second in plt.get_fignums() and third in plt.get_fignums()
+        
+        # hold off replaces plots but keeps the axes and its title
+        ax = plt.gca()
+        plot(np.ones(10))
+        title('Kept')
+        assert ishold()
+        hold('off')
+        line = plot(np.zeros(5))[0]
+        assert plt.gca() is ax and list(ax.lines) == [line]
+        assert ax.get_title() == 'Kept' and ylim()[1] < 1
+        hold('on')
+        plot(np.ones(5))
+        assert len(ax.lines) == 2
+        
+        info = figmemory(verbose=False)
+        assert len(info) == 3
+        assert info[-1].data_bytes > 0 and info.total_bytes >= info[-1].data_bytes
+    finally:
+        maxfigures(limit)
+        close('all')
+    
+    print("✓ Figure pool tests passed!")
+
+
+def test_grid_plots():
+    """Test imagesc/surf/mesh/contour downsampling of large grids"""
+    print("Testing grid plots...")
+    
+    import matplotlib.pyplot as plt
+    
+    x = linspace(-2, 2, 3000)
+    X, Y = meshgrid(x, x)
+    Z = exp(-X**2 - Y**2) * sin(4 * X)
+    
+    figure()
+    image = imagesc(x, x, Z)
+    width, height = plt.gca().get_window_extent().size
+    rows, cols = image.get_array().shape
+    assert rows <= height + 1 and cols <= width + 1
+    assert image.get_clim() == (Z.min(), Z.max())
+    assert abs(image.get_extent()[0] - (x[0] - (x[1] - x[0]) / 2)) < 1e-12
+    
+    # Zooming in re-samples the visible part from the full data
+    xlim(0, 0.01)
+    assert image.get_array().shape[1] < 40
+    assert image.get_extent()[0] <= 0 and image.get_extent()[1] >= 0.01
+    
+    # Small matrices are shown as they are
+    C = np.arange(12.).reshape(3, 4)
+    assert imagesc(C).get_array().shape == C.shape
+    
+    # Contour levels come from the full data range, as matplotlib picks them
+    figure()
+    extremes = np.array([[Z.min(), Z.max()], [Z.min(), Z.max()]])
+    assert np.array_equal(contour(X, Y, Z, 10).levels, plt.contour(extremes, 10).levels)
+    assert np.array_equal(contour(Z, [0, 0.5]).levels, [0, 0.5])
+    
+    figure()
+    surface = surf(X, Y, Z)
+    assert plt.gca().name == '3d'
+    assert len(surface.get_paths()) < 200 * 200
+    assert len(mesh(Z).get_segments()) < 2 * 200
+    close('all')
+    
+    print("✓ Grid plot tests passed!")
+
+
+def test_scatter_density():
+    """Test density rendering of huge scatter plots and marker rasterization"""
+    print("Testing scatter density...")
+    
+    import matplotlib.pyplot as plt
+    from matplotlib.image import AxesImage
+    
+    n = 300000
+    x = randn(n, 1).ravel()
+    y = 0.5 * x + randn(n, 1).ravel()
+    
+    # Same limits as markers would get
+    figure()
+    plt.plot(x, y, '.')
+    expected = (xlim(), ylim())
+    figure()
+    image = scatter(x, y)
+    assert isinstance(image, AxesImage)
+    assert (xlim(), ylim()) == expected
+    assert image.get_array().sum() == n  # Every point lands in a bin
+    
+    figure()
+    artist = plot(x, y, 'r.')[0]
+    assert isinstance(artist, AxesImage) and (xlim(), ylim()) == expected
+    
+    # Per-point colors are averaged per bin within their full range
+    figure()
+    image = scatter(x, y, 5, x, cmap='jet')
+    assert image.get_clim() == (x.min(), x.max())
+    xlim(0, 0.5)
+    assert image.get_extent()[0] >= 0 and image.get_extent()[1] <= 0.5
+    
+    # Below the threshold markers are kept and rasterized for vector files
+    figure()
+    markers = scatter(x[:20000], y[:20000], 10, 'r', 'filled')
+    assert not isinstance(markers, AxesImage) and markers.get_rasterized()
+    assert not scatter(x[:100], y[:100]).get_rasterized()
+    assert plot(x[:20000], y[:20000], '.', density=False)[0].get_rasterized()
+    close('all')
+    
+    print("✓ Scatter density tests passed!")
+
+
+def test_spy():
+    """Test spy markers and binned images for dense and sparse matrices"""
+    print("Testing spy...")
+    import matplotlib.pyplot as plt
+    import scipy.sparse
+    
+    # Few nonzeros: one marker per nonzero at its 1-based position
+    B = np.zeros((50, 60))
+    B[3, 7] = 1
+    B[10, 2] = -2
+    for A in (B, scipy.sparse.csr_matrix(B), scipy.sparse.coo_matrix(B),
+              scipy.sparse.csc_matrix(B), scipy.sparse.lil_matrix(B)):
+        figure()
+        line = spy(A)
+        assert sorted(zip(line.get_xdata(), line.get_ydata())) == [(3, 11), (8, 4)]
+        assert plt.gca().get_xlabel() == 'nz = 2'
+        assert plt.gca().get_ylim() == (51, 0)
+    
+    # Many nonzeros: counts per pixel bin, covering every nonzero
+    rng = np.random.default_rng(0)
+    n, k = 10 ** 6, 300000
+    rows, cols = rng.integers(0, n, k), rng.integers(0, n, k)
+    S = scipy.sparse.coo_matrix((np.ones(k), (rows, cols)), shape=(n, n)).tocsr()
+    S.data[:10] = 0  # Explicit zeros are not nonzeros
+    figure()
+    image = spy(S)
+    assert image.get_array().sum() == np.count_nonzero(S.data) == S.nnz - 10
+    assert max(image.get_array().shape) <= 1000
+    
+    # Zooming re-bins the visible rows and columns only
+    xlim(0.5, 100000.5)
+    ylim(100000.5, 0.5)
+    visible = S[:100000, :100000]
+    assert image.get_array().filled(0).sum() == np.count_nonzero(visible.data) > 0
+    
+    # Dense arrays are binned the same way
+    D = rng.random((2000, 3000)) < 0.05
+    figure()
+    assert spy(D).get_array().sum() == D.sum()
+    close('all')
+    print("✓ spy tests passed!")
+
+
+def test_render_server():
+    """Test plotting calls sent to a render server process"""
+    print("Testing render server...")
+    import pickle
+    from matlab.render_server import RenderClient, RemoteHandle, _pack, _unpack
+    
+    # Large arrays go through shared memory and arrive intact
+    x = linspace(0, 1, 100000)
+    data, segments = _pack(((x,), {}))
+    assert len(segments) == 1 and len(data) < 1000
+    (received,), _ = _unpack(data, segments)
+    assert np.array_equal(received, x)
+    
+    # Blocks of a call that fails to pickle are freed again
+    if os.path.isdir('/dev/shm'):
+        before = set(os.listdir('/dev/shm'))
+        try:
+            _pack(((x, lambda: 0), {}))
+            assert False, "a lambda should not pickle"
+        except (pickle.PicklingError, AttributeError):
+            pass
+        assert set(os.listdir('/dev/shm')) == before
+    
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    client = RenderClient()
+    try:
+        remote = client.functions()
+        assert 'plot' in remote and 'batchrender' not in remote
+        
+        # Drawing calls return at once; queries wait for the server
+        assert remote['figure']() is None
+        assert remote['plot'](x, sin(x)) is None
+        xmin, xmax = remote['xlim']()
+        assert xmin < 0 and xmax > 1
+        assert len(remote['figmemory'](verbose=False)) == 1
+        
+        # Animated lines are referred to by handle
+        h = remote['animatedline'](maxpoints=5)
+        assert isinstance(h, RemoteHandle)
+        remote['addpoints'](h, np.arange(8.0), np.arange(8.0))
+        px, py = remote['getpoints'](h)
+        assert list(px) == [3, 4, 5, 6, 7]
+        
+        # Errors of queries are raised; the server keeps running
+        try:
+            remote['xlim']('bad')
+            assert False, "expected an error"
+        except ValueError:
+            pass
+        assert remote['ishold']()
+    finally:
+        client.close()
+    assert not client.alive
+    print("✓ Render server tests passed!")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Running Plotting Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_plot_decimation()
+        test_plot_matrix_collection()
+        test_animatedline()
+        test_batchrender()
+        test_savefig_background()
+        test_figure_pool()
+        test_grid_plots()
+        test_scatter_density()
+        test_spy()
+        test_render_server()
+        
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print("✗ Test failed!")
+        print(f"Error: {e}")
+        print("=" * 60)
+        sys.exit(1)
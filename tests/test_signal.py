@@ -0,0 +1,287 @@
+"""
+Signal Processing Tests
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matlab import *
+import numpy as np
+
+
+def test_fft():
+    """Test fft/ifft along MATLAB's default dimension and nextpow2 padding"""
+    print("Testing fft...")
+    
+    assert nextpow2(1000) == 10
+    assert nextpow2(1024) == 10
+    assert nextpow2(1025) == 11
+    assert nextpow2(0.5) == 0
+    
+    x = np.random.randn(1000)
+    Y = fft(x, 2 ** nextpow2(len(x)))
+    assert Y.shape == (1024,)
+    assert np.allclose(Y, np.fft.fft(x, 1024))
+    assert np.allclose(ifft(fft(x)), x)
+    assert np.allclose(ifft(fft(x), symmetric=True), x)
+    assert np.isrealobj(ifft(fft(x), symmetric=True))
+    
+    # Columns of a matrix; a row vector along its length
+    A = np.random.randn(64, 3)
+    assert np.allclose(fft(A), np.fft.fft(A, axis=0))
+    row = x[None, :]
+    assert np.allclose(fft(row), np.fft.fft(row, axis=1))
+    
+    assert np.array_equal(fftshift(np.arange(6)), [3, 4, 5, 0, 1, 2])
+    assert np.array_equal(ifftshift(fftshift(np.arange(7))), np.arange(7))
+    print("✓ fft tests passed!")
+
+
+def test_conv():
+    """Test conv/conv2 shapes against MATLAB results and the FFT path against the direct sum"""
+    print("Testing conv...")
+    
+    assert np.allclose(conv([1, 2], [1, 3]), [1, 5, 6])
+    # MATLAB: conv([1 2 3 4 5], [1 1 1 1], 'same') = [6 10 14 12 9]
+    assert np.allclose(conv([1, 2, 3, 4, 5], [1, 1, 1, 1], 'same'), [6, 10, 14, 12, 9])
+    assert np.allclose(conv([1, 2, 3, 4, 5], [1, 1, 1], 'valid'), [6, 9, 12])
+    assert conv([1, 2], [1, 2, 3], 'valid').size == 0
+    
+    u = np.random.randn(20000)
+    v = np.random.randn(1000)
+    for shape in ('full', 'same', 'valid'):
+        expected = np.convolve(u, v)
+        w = conv(u, v, shape)
+        if shape == 'same':
+            expected = expected[500:500 + 20000]
+        elif shape == 'valid':
+            expected = expected[999:20000]
+        assert w.shape == expected.shape
+        assert np.allclose(w, expected)
+    
+    # 'same' keeps rows/columns from floor(size(B) / 2) + 1 of the full result
+    M = np.array([[8, 1, 6], [3, 5, 7], [4, 9, 2]])
+    assert np.allclose(conv2(M, [[1, 2], [3, 4]]),
+                       [[8, 17, 8, 12], [27, 46, 39, 38], [13, 44, 61, 32], [12, 43, 42, 8]])
+    assert np.allclose(conv2(M, [[1, 2], [3, 4]], 'same'),
+                       [[46, 39, 38], [44, 61, 32], [43, 42, 8]])
+    
+    A = np.random.randn(200, 300)
+    B = np.random.randn(9, 9)
+    direct = conv2(A, B[:2, :2])
+    assert direct.shape == (201, 301)
+    full = conv2(A, B)
+    assert full.shape == (208, 308)
+    assert conv2(A, B, 'valid').shape == (192, 292)
+    
+    # Separable kernels give the same result as their outer product
+    g = np.exp(-np.linspace(-2, 2, 7) ** 2)
+    assert np.allclose(conv2(g, g, A, 'same'), conv2(A, np.outer(g, g), 'same'))
+    print("✓ conv tests passed!")
+
+
+def test_filter():
+    """Test filter against the difference equation, along columns"""
+    print("Testing filter...")
+    
+    x = np.random.randn(500)
+    b, a = [0.2, 0.3], [2.0, -0.5]
+    y = filter(b, a, x)
+    expected = np.zeros_like(x)
+    for n in range(len(x)):
+        acc = b[0] * x[n] + (b[1] * x[n - 1] if n else 0)
+        acc -= a[1] * expected[n - 1] if n else 0
+        expected[n] = acc / a[0]
+    assert np.allclose(y, expected)
+    
+    # Moving average is conv truncated to the input length
+    assert np.allclose(filter(ones(1, 5) / 5, 1, x), conv(x, ones(1, 5) / 5)[:500])
+    
+    # Each column of a matrix, or each row with axis=1
+    X = np.random.randn(300, 4)
+    Y = filter(b, a, X)
+    for k in range(4):
+        assert np.allclose(Y[:, k], filter(b, a, X[:, k]))
+    assert np.allclose(filter(b, a, X.T, axis=1), Y.T)
+    
+    try:
+        filter([1], [0, 1], x)
+        assert False, "expected an error"
+    except ValueError:
+        pass
+    print("✓ filter tests passed!")
+
+
+def test_streaming_filter():
+    """Test that chunked filtering matches the one-shot filter call"""
+    print("Testing streaming filter...")
+    
+    b, a = [0.0675, 0.1349, 0.0675], [2.0, -1.1430, 0.4128]
+    X = np.random.randn(10007, 4)
+    
+    # [y, zf] = filter(b, a, x, zi) in two pieces
+    y1, z = filter(b, a, X[:500, 0], [])
+    assert z.shape == (2,)
+    y2, z = filter(b, a, X[500:, 0], z)
+    assert np.array_equal(np.concatenate([y1, y2]), filter(b, a, X[:, 0]))
+    
+    # Uneven chunks of several channels, bit-identical to one call
+    f = StreamingFilter(b, a)
+    Y = np.concatenate([f.step(chunk) for chunk in np.array_split(X, 13)])
+    assert np.array_equal(Y, filter(b, a, X))
+    f.reset()
+    assert np.array_equal(f.step(X[:100]), filter(b, a, X[:100]))
+    
+    # FIR filters too, including scalar and a(1) != 1 denominators
+    for taps, denominator in ((3, 1), (16, 1), (31, 2.0)):
+        h = np.random.randn(taps)
+        f = StreamingFilter(h, denominator)
+        Y = np.concatenate([f.step(chunk) for chunk in np.array_split(X, 13)])
+        assert np.array_equal(Y, filter(h, denominator, X))
+        y1, z = filter(h, denominator, X[:777, 1], [])
+        y2, z = filter(h, denominator, X[777:, 1], z)
+        assert np.array_equal(np.concatenate([y1, y2]), filter(h, denominator, X[:, 1]))
+    
+    # FFT overlap-add for a long FIR kernel, including chunks shorter than it
+    h = np.random.randn(300)
+    for pieces in (1, 9, 200):
+        f = StreamingFilter(h, 2.0, method='fft')
+        Y = np.concatenate([f.step(chunk) for chunk in np.array_split(X, pieces)])
+        assert np.allclose(Y, filter(h, 2.0, X))
+    f = StreamingFilter(h, zi=np.ones(299), method='fft')
+    assert np.allclose(f.step(X[:1000, 0]), filter(h, 1, X[:1000, 0], np.ones(299))[0])
+    
+    try:
+        StreamingFilter(b, a, method='fft')
+        assert False, "expected an error"
+    except ValueError:
+        pass
+    print("✓ Streaming filter tests passed!")
+
+
+def test_framed_spectra():
+    """Test buffer, spectrogram, stft and pwelch, including batched and memory-mapped input"""
+    print("Testing framed spectral analysis...")
+    import tempfile
+    import scipy.signal
+    import matlab.signal
+    
+    # MATLAB: buffer(1:10, 4, 1) and buffer(1:10, 4, 1, 'nodelay')
+    x = np.arange(1, 11)
+    assert np.array_equal(buffer(x, 4, 1), [[0, 3, 6, 9], [1, 4, 7, 10], [2, 5, 8, 0], [3, 6, 9, 0]])
+    assert np.array_equal(buffer(x, 4, 1, 'nodelay'), [[1, 4, 7], [2, 5, 8], [3, 6, 9], [4, 7, 10]])
+    assert np.array_equal(buffer(x, 4), [[1, 5, 9], [2, 6, 10], [3, 7, 0], [4, 8, 0]])
+    # Exact fit: a view of x, no copy
+    assert np.shares_memory(buffer(x, 4, 2, 'nodelay'), x)
+    
+    fs = 1000.0
+    x = np.random.randn(100000)
+    w = hamming(256)
+    s, f, t = spectrogram(x, 256, 128, 512, fs)
+    f2, t2, s2 = scipy.signal.spectrogram(x, fs, window=w, noverlap=128, nfft=512, detrend=False,
+                                          mode='complex', scaling='spectrum')
+    assert s.shape == (257, 780)
+    assert np.allclose(s, s2 * w.sum()) and np.allclose(f, f2) and np.allclose(t, t2)
+    
+    pxx, f = pwelch(x, 1024, 512, 1024, fs)
+    f3, p3 = scipy.signal.welch(x, fs, window=hamming(1024), noverlap=512, nfft=1024, detrend=False)
+    assert np.allclose(pxx, p3) and np.allclose(f, f3)
+    # Without fs: rad/sample up to pi
+    assert np.isclose(pwelch(x)[1][-1], np.pi)
+    
+    # Channels are columns
+    X = np.random.randn(20000, 3)
+    P, _ = pwelch(X, 512, fs=fs)
+    assert P.shape == (257, 3)
+    assert np.allclose(P[:, 2], pwelch(X[:, 2], 512, fs=fs)[0])
+    
+    S, f, t = stft(x, fs)
+    assert S.shape == (128, 3122)
+    assert f[-1] == fs / 2 and f[0] > -fs / 2
+    assert np.allclose(S[list(f).index(0), 0], np.sum(x[:128] * hann(128, 'periodic')))
+    
+    # Single precision in, single precision out
+    assert spectrogram(x.astype(np.float32), 256)[0].dtype == np.complex64
+    assert pwelch(x.astype(np.float32))[0].dtype == np.float32
+    
+    # Small batches and memory-mapped input give the same results
+    batch_bytes = matlab.signal._frame_batch_bytes
+    matlab.signal._frame_batch_bytes = 100000
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            mapped = np.lib.format.open_memmap(os.path.join(tmp, 'x.npy'), mode='w+',
+                                               shape=x.shape)
+            mapped[:] = x
+            assert np.allclose(spectrogram(mapped, 256, 128, 512, fs)[0], s)
+            assert np.allclose(pwelch(mapped, 1024, 512, 1024, fs)[0], pxx)
+            del mapped
+    finally:
+        matlab.signal._frame_batch_bytes = batch_bytes
+    print("✓ Framed spectral analysis tests passed!")
+
+
+def test_fft_cache():
+    """Test fft/ifft against scipy, cached windows and the cache bounds"""
+    print("Testing FFT and window cache...")
+    import scipy.fft
+    import scipy.signal
+    
+    rng = np.random.default_rng(0)
+    for X in (rng.standard_normal(64), rng.standard_normal((8, 5)), np.arange(10),
+              rng.standard_normal(7).astype(np.float32),
+              (rng.standard_normal(16) + 1j).astype(np.complex64)):
+        for n in (None, 4, 32):
+            for axis in (0, -1):
+                Y = fft(X, n, axis)
+                expected = scipy.fft.fft(X, n=n, axis=axis)
+                assert Y.dtype == expected.dtype and np.allclose(Y, expected)
+                assert np.allclose(ifft(Y, n, axis), scipy.fft.ifft(expected, n=n, axis=axis))
+    
+    # Windows are computed once and shared read-only
+    fftcache('clear')
+    w = hann(256, 'periodic')
+    assert np.allclose(w, scipy.signal.get_window('hann', 256))
+    assert hann(256, 'periodic') is w
+    assert not w.flags.writeable
+    assert fftcache().window_hits == 1 and fftcache().window_misses == 1
+    
+    # Least recently used entries are dropped beyond the limit
+    limit = fftcache().maxsize
+    try:
+        fftcache(8)
+        for n in range(1, 20):
+            hamming(n)
+        assert fftcache().windows == 8
+    finally:
+        fftcache(limit)
+    fftcache('clear')
+    assert fftcache().windows == 0 and fftcache().window_hits == 0
+    print("✓ FFT cache tests passed!")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Running Signal Processing Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_fft()
+        test_conv()
+        test_filter()
+        test_streaming_filter()
+        test_framed_spectra()
+        test_fft_cache()
+        
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print("✗ Test failed!")
+        print(f"Error: {e}")
+        print("=" * 60)
+        sys.exit(1)
@@ -0,0 +1,373 @@
+"""
+Workspace Management Tests
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matlab import *
+import numpy as np
+
+
+def test_whos_bytes_and_views():
+    """Test whos byte counts, view detection and de-duplicated totals"""
+    print("Testing whos memory report...")
+    
+    A = zeros(100, 100)
+    B = A[:10]
+    C = A
+    info = whos(variables={'A': A, 'B': B, 'C': C}, verbose=False)
+    
+    records = {v.name: v for v in info}
+    assert records['A'].bytes == A.nbytes
+    assert records['B'].bytes == B.nbytes
+    assert 'view' in records['B'].attributes
+    assert 'view' not in records['A'].attributes
+    # A, B and C all share one buffer
+    assert info.total_bytes == A.nbytes
+    assert info.as_dicts()[0]['name'] == 'A'
+    
+    print("✓ whos memory report tests passed!")
+
+
+def test_whos_memmap_and_sparse():
+    """Test whos on memory-mapped and sparse variables"""
+    print("Testing whos memmap/sparse...")
+    
+    import tempfile
+    import scipy.sparse
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        M = np.memmap(os.path.join(tmp, 'm.dat'), dtype='float32', mode='w+', shape=(50, 50))
+        S = scipy.sparse.eye(1000, format='csr')
+        info = whos(variables={'M': M, 'S': S}, verbose=False)
+        records = {v.name: v for v in info}
+        
+        assert 'memmap' in records['M'].attributes
+        assert info.mapped_bytes == M.nbytes
+        assert 'sparse' in records['S'].attributes
+        assert records['S'].bytes == S.data.nbytes + S.indices.nbytes + S.indptr.nbytes
+        assert info.total_bytes == records['S'].bytes
+        
+        # dok and lil store Python objects rather than arrays
+        D = scipy.sparse.dok_matrix((100, 100))
+        D[1, 2] = 1.0
+        L = scipy.sparse.lil_matrix(S)
+        Z = scipy.sparse.csr_matrix(np.array([[0, 1j]]))
+        records = {v.name: v for v in whos(variables={'D': D, 'L': L, 'Z': Z}, verbose=False)}
+        assert records['D'].bytes > 0 and 'sparse' in records['D'].attributes
+        assert records['L'].bytes > S.data.nbytes + S.indices.nbytes
+        assert 'complex' in records['Z'].attributes
+        del M
+    
+    print("✓ whos memmap/sparse tests passed!")
+
+
+def test_save_load():
+    """Test binary save/load round trip, lazy memmap load and -append"""
+    print("Testing save/load...")
+    
+    import tempfile
+    
+    A = rand(20, 30)
+    F = np.asfortranarray(A)
+    labels = ['a', 'b']
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'session.ws')
+        save(filename, variables={'A': A, 'F': F, 'labels': labels}, compress=['labels'])
+        
+        ns = {}
+        loaded = load(filename, variables=ns)
+        assert sorted(loaded) == ['A', 'F', 'labels']
+        assert isinstance(ns['A'], np.memmap)
+        assert np.array_equal(ns['A'], A)
+        assert np.array_equal(ns['F'], F) and ns['F'].flags.f_contiguous
+        assert ns['labels'] == labels
+        
+        # Copy-on-write: modifying the loaded array leaves the file alone
+        ns['A'][0, 0] = -1
+        assert load(filename, 'A', variables={})['A'][0, 0] == A[0, 0]
+        
+        # -append with unchanged data writes no new blocks
+        size = os.path.getsize(filename)
+        save(filename, '-append', variables={'A': A})
+        assert os.path.getsize(filename) == size
+        
+        save(filename, '-append', variables={'A': A + 1, 'B': ones(2)})
+        ns = {}
+        load(filename, variables=ns)
+        assert np.array_equal(ns['A'], A + 1)
+        assert np.array_equal(ns['B'], ones(2))
+        assert ns['labels'] == labels
+        
+        # Any dtype NumPy can describe, e.g. dates
+        dates = np.arange('2024-01-01', '2024-03-01', dtype='datetime64[D]')
+        save(filename, variables={'dates': dates, 'gaps': np.diff(dates)})
+        ns = {}
+        load(filename, variables=ns)
+        assert np.array_equal(ns['dates'], dates) and ns['gaps'].dtype == np.dtype('timedelta64[D]')
+        
+        # In a workspace, variables are read on first use
+        save(filename, variables={'A': A, 'labels': labels})
+        ws = Workspace()
+        load(filename, variables=ws)
+        assert type(ws.peek('A')).__name__ == '_Deferred'
+        records = {v.name: v for v in whos(variables=ws, verbose=False)}
+        assert records['A'].size == A.shape and 'deferred' in records['A'].attributes
+        assert np.array_equal(ws['A'], A) and isinstance(ws.peek('A'), np.memmap)
+        assert ws.get('labels') == labels
+        del ns, loaded, ws
+    
+    print("✓ save/load tests passed!")
+
+
+def test_matfile():
+    """Test lazy MAT-file reading and partial-variable access"""
+    print("Testing matfile...")
+    
+    import tempfile
+    import scipy.io
+    
+    X = rand(300, 40)
+    C = rand(5, 3) + 1j * rand(5, 3)
+    with tempfile.TemporaryDirectory() as tmp:
+        for compressed in (False, True):
+            filename = os.path.join(tmp, 'data.mat')
+            scipy.io.savemat(filename, {'X': X, 'C': C, 'name': 'run1'},
+                             do_compression=compressed)
+            m = matfile(filename)
+            assert sorted(m) == ['C', 'X', 'name']
+            assert m.X.shape == (300, 40)
+            
+            block = m.X[100:200, :]
+            assert np.array_equal(block, X[100:200, :])
+            if not compressed:
+                assert isinstance(block, np.memmap)
+            assert np.allclose(m.C[:, 1], C[:, 1])
+            assert np.array_equal(np.asarray(m.X), X)
+            assert m.name[0] == 'run1'
+            
+            info = whos(m, verbose=False)
+            records = {v.name: v for v in info}
+            assert records['X'].bytes == X.nbytes
+            assert records['X'].class_name == 'double'
+            assert ('compressed' in records['X'].attributes) == compressed
+            del m, block
+    
+    print("✓ matfile tests passed!")
+
+
+def _write_v73(filename):
+    """Write a small MATLAB v7.3 (HDF5) file the way MATLAB lays it out"""
+    import h5py
+    
+    def tag(obj, class_name, **attrs):
+        obj.attrs['MATLAB_class'] = np.bytes_(class_name)
+        for key, value in attrs.items():
+            obj.attrs[key] = value
+        return obj
+    
+    def text(value):
+        return np.array([ord(c) for c in value], dtype='u2').reshape(-1, 1)
+    
+    with h5py.File(filename, 'w', userblock_size=512) as f:
+        # Datasets hold MATLAB's column-major data with the dimensions reversed
+        tag(f.create_dataset('X', data=np.arange(12.0).reshape(3, 4).T), 'double')
+        tag(f.create_dataset('name', data=text('run1')), 'char')
+        refs = f.create_group('#refs#')
+        a = tag(refs.create_dataset('a', data=np.array([[1.0], [2.0]])), 'double')
+        b = tag(refs.create_dataset('b', data=text('hi')), 'char')
+        tag(f.create_dataset('C', data=np.array([[a.ref], [b.ref]]), dtype=h5py.ref_dtype), 'cell')
+        fields = np.array([np.array(list(field), dtype='S1') for field in ('alpha', 'ok')],
+                          dtype=h5py.vlen_dtype(np.dtype('S1')))
+        S = tag(f.create_group('S'), 'struct', MATLAB_fields=fields)
+        tag(S.create_dataset('alpha', data=np.array([[3.0]])), 'double')
+        tag(S.create_dataset('ok', data=np.array([[1]], dtype='u1')), 'logical')
+        P = tag(f.create_group('P'), 'double', MATLAB_sparse=np.uint64(3))
+        P['data'] = np.array([5.0, 6.0])
+        P['ir'] = np.array([0, 2], dtype='u8')
+        P['jc'] = np.array([0, 1, 1, 2], dtype='u8')
+        tag(f.create_dataset('E', data=np.array([0, 3], dtype='u8')), 'double',
+            MATLAB_empty=np.uint8(1))
+        tag(f.create_dataset('T', data=np.array([[1]], dtype='u4')), 'string')
+    with open(filename, 'r+b') as f:
+        f.write(b'MATLAB 7.3 MAT-file'.ljust(116) + bytes(8) + b'\x00\x02IM')
+
+
+def test_matfile_v73():
+    """Test reading cells, structs, chars and sparse data from v7.3 files"""
+    print("Testing matfile v7.3...")
+    
+    import tempfile
+    try:
+        import h5py  # noqa: F401
+    except ImportError:
+        print("- h5py not installed, skipping")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'data73.mat')
+        _write_v73(filename)
+        m = matfile(filename)
+        assert sorted(m) == ['C', 'E', 'P', 'S', 'T', 'X', 'name']
+        
+        assert np.array_equal(m.X[1, :], [4, 5, 6, 7])
+        assert m.name[0] == 'run1'
+        C = np.asarray(m.C)
+        assert C.shape == (1, 2) and C.dtype == object
+        assert np.array_equal(C[0, 0], [[1, 2]]) and C[0, 1][0] == 'hi'
+        S = np.asarray(m.S)
+        assert S['alpha'][0, 0] == 3 and S['ok'][0, 0].dtype == bool
+        assert m.P.shape == (3, 3)
+        assert np.array_equal(m._read('P', None).toarray(), [[5, 0, 0], [0, 0, 0], [0, 0, 6]])
+        assert np.asarray(m.E).shape == (0, 3)
+        
+        # MATLAB objects are listed up front and refused with a clear error
+        records = {v.name: v for v in whos(m, verbose=False)}
+        assert 'unsupported' in records['T'].attributes
+        assert records['P'].class_name == 'sparse'
+        try:
+            m.T[0]
+            assert False, "reading a MATLAB string object should raise TypeError"
+        except TypeError as e:
+            assert 'string' in str(e)
+        m.close()
+    
+    print("✓ matfile v7.3 tests passed!")
+
+
+def test_workspace_spill():
+    """Test memory budget spilling, re-materialization and clear"""
+    print("Testing workspace memory budget...")
+    
+    ws = Workspace({'rand': rand, 'clear': clear, 'whos': whos}, budget='3MB')
+    exec("A = rand(500, 500)\nB = rand(500, 500)", ws)
+    
+    # A is least recently used, so it goes to disk once B is assigned
+    assert ws.spilled == ['A']
+    assert isinstance(ws.peek('A'), np.memmap)
+    assert ws.resident_bytes() <= ws.budget
+    path = ws._spilled['A']
+    assert os.path.exists(path)
+    
+    info = whos(variables=ws, verbose=False)
+    assert 'spilled' in {v.name: v for v in info}['A'].attributes
+    
+    # Using A reads it back into memory and spills B instead
+    exec("s = A.sum()", ws)
+    assert ws.spilled == ['B']
+    assert not isinstance(ws.peek('A'), np.memmap)
+    assert not os.path.exists(path)
+    
+    path = ws._spilled['B']
+    exec("clear('B')", ws)
+    assert not os.path.exists(path)
+    assert ws.spilled == []
+    
+    print("✓ Workspace memory budget tests passed!")
+
+
+def test_workspace_snapshots():
+    """Test copy-on-write snapshots, restore and undo"""
+    print("Testing workspace snapshots...")
+    
+    ws = Workspace({'rand': rand, 'zeros': zeros, 'np': np})
+    
+    def run(source):
+        ws.before_execute(source)
+        exec(source, ws)
+    
+    # Undo is off by default: commands leave arrays writable
+    run("A = rand(100, 100)")
+    run("np.add(A, 1, A)")
+    assert ws['A'].flags.writeable and not ws._history
+    run("A = rand(100, 100)")
+    original = ws['A']
+    
+    # Snapshots share the array instead of copying it
+    label = ws.snapshot()
+    assert ws._snapshots[label]['A'] is original
+    assert not original.flags.writeable
+    
+    # Writing into A gives the workspace its own copy
+    run("A[0, 0] = -1")
+    assert ws['A'] is not original
+    assert ws['A'][0, 0] == -1
+    assert original[0, 0] != -1
+    
+    ws.restore(label)
+    assert ws['A'] is original
+    
+    # Views move to the copy with their array, so writes through them still show
+    run("B = A[:2]")
+    run("B[0] = 1")
+    assert np.all(ws['A'][0] == 1) and np.shares_memory(ws['A'], ws['B'])
+    assert not np.any(original[0] == 1)
+    ws.restore(label)
+    
+    # undo reverts the previous command, including rebinding a variable
+    ws.undo_limit = 1
+    run("A = zeros(2)")
+    run("undo_marker = 1")
+    ws.undo()
+    assert ws['A'].shape == (2, 2)
+    assert 'undo_marker' not in ws
+    
+    info = whos(variables=ws, verbose=False)
+    assert info.snapshot_count == 1
+    assert info.snapshot_bytes == original.nbytes
+    
+    print("✓ Workspace snapshot tests passed!")
+
+
+def test_workspace_broadcast_writes():
+    """Test that writing into a lazy grid or repmat view materializes it"""
+    print("Testing writes to broadcast views...")
+    
+    ws = Workspace({'repmat': repmat, 'meshgrid': meshgrid, 'np': np})
+    
+    def run(source):
+        ws.before_execute(source)
+        exec(source, ws)
+    
+    run("R = repmat(np.array([1.0, 2.0, 3.0]), 1000, 1)")
+    assert ws['R'].strides[0] == 0
+    assert whos(variables=ws, verbose=False).total_bytes == 24
+    run("R[0, 0] = -1")
+    assert ws['R'].flags.writeable
+    assert ws['R'][0, 0] == -1 and ws['R'][1, 0] == 1
+    
+    run("X, Y = meshgrid(np.arange(3.0), np.arange(4.0), lazy=True)")
+    run("X += 1")
+    assert np.array_equal(ws['X'][0], [1, 2, 3])
+    print("✓ Broadcast write tests passed!")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Running Workspace Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_whos_bytes_and_views()
+        test_whos_memmap_and_sparse()
+        test_save_load()
+        test_matfile()
+        test_matfile_v73()
+        test_workspace_spill()
+        test_workspace_snapshots()
+        test_workspace_broadcast_writes()
+        
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print("✗ Test failed!")
+        print(f"Error: {e}")
+        print("=" * 60)
+        sys.exit(1)